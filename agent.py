@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - agent
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Resident mode. The agent keeps the last inventory in memory and re-runs every
+# collector on its own schedule, so cheap and fast-changing artifacts (sockets,
+# addresses, containers) are refreshed often and lshw or the package database
+# rarely. Queries are answered from the serialized document over a unix socket
+# or a local TCP port. There is no authentication, so a TCP address that is not
+# loopback is refused unless allow_remote is given:
+#
+#   GET  /                     the full inventory
+#   GET  /inventory/<section>  one top-level section
+#   GET  /status               last run and next run of every collector
+#   POST /refresh[?collector=<name>[,<name>...]]  run collectors now
+
+import os
+import sys
+import json
+import time
+import fcntl
+import socket
+import signal
+import ipaddress
+import threading
+import socketserver
+import http.server
+import urllib.parse
+
+import collectors
+
+DEFAULT_LISTEN = 'inventory2.sock'
+DEFAULT_REFRESH_INTERVAL = 60 * 60
+
+# Collector -> seconds between two runs, DEFAULT_REFRESH_INTERVAL otherwise.
+REFRESH_INTERVALS = {
+    'date_of_inventory': 60,
+    'os': 15 * 60,
+    'listen_ports': 60,
+    'netstat': 60,
+    'network': 60,
+    'netns': 5 * 60,
+    'ip_link': 60,
+    'ip_addr': 60,
+    'ip_route': 60,
+    'containers': 60,
+    'docker': 60,
+    'volumes': 5 * 60,
+    'lsblk': 5 * 60,
+    'packages': 15 * 60,
+    'packages_apt': 15 * 60,
+    'packages_yum': 15 * 60,
+    'hardware': collectors.DAY,
+    'lshw': collectors.DAY,
+    'megacli_controllers': collectors.DAY,
+    'megacli_disks': collectors.DAY,
+    'storcli_controllers': collectors.DAY,
+    'storcli_disks': collectors.DAY,
+    'smart': 6 * 60 * 60,
+}
+
+# Request bodies are not used, larger ones are not read but end the
+# connection.
+MAX_DISCARDED_BODY = 2 ** 20
+
+# ----------------------------------------------------------------------
+
+def encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('UTF-8')
+
+# ----------------------------------------------------------------------
+
+class Agent(object):
+
+    # build(collector_results) parses the artifacts of the work directory
+    # and returns the inventory, like inventory() does. names limits the
+    # agent to the collectors of the selected sections.
+
+    def __init__(self, build, options=None, workers=collectors.DEFAULT_WORKERS, intervals=None, names=None):
+        self.build = build
+        self.options = options or {}
+        self.workers = workers
+        self.intervals = dict(REFRESH_INTERVALS, **(intervals or {}))
+        self.results = {}
+        self.next_run = dict((name, 0) for name in collectors.COLLECTORS if names is None or name in names)
+        self.snapshot = None
+        self.updated = None
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+
+    def interval(self, name):
+        return self.intervals.get(name, DEFAULT_REFRESH_INTERVAL)
+
+    def request_refresh(self, names=None):
+        with self.lock:
+            for name in names or list(self.next_run):
+                self.next_run[name] = 0
+        self.wakeup.set()
+
+    def refresh(self):
+        now = time.time()
+        with self.lock:
+            due = [name for name, next_run in self.next_run.items() if next_run <= now]
+            for name in due:
+                self.next_run[name] = now + self.interval(name)
+        if len(due) == 0:
+            return False
+        results = collectors.run_collectors(names=due, workers=self.workers, options=self.options)
+        for name, result in results.items():
+            if result['status'] == 'skipped' and name in self.results:
+                continue
+            result['finished'] = round(time.time(), 3)
+            self.results[name] = result
+            # Fallbacks that stood in for a due collector follow its schedule.
+            if name not in due:
+                with self.lock:
+                    self.next_run[name] = now + self.interval(name)
+
+        inventory = self.build(self.results)
+        sections = dict((section, encode(value)) for section, value in inventory.items())
+        document = b'{' + b','.join(encode(section) + b':' + value for section, value in sections.items()) + b'}'
+        # Readers take the snapshot without the lock, so the document and
+        # its sections are replaced by a single assignment.
+        self.snapshot = (document, sections)
+        self.updated = time.time()
+        self.generation += 1
+        return True
+
+    def status(self):
+        with self.lock:
+            next_run = dict(self.next_run)
+        return {
+            'generation': self.generation,
+            'updated': self.updated,
+            'collectors': dict((name, {
+                'status': self.results.get(name, {}).get('status'),
+                'elapsed': self.results.get(name, {}).get('elapsed'),
+                'finished': self.results.get(name, {}).get('finished'),
+                'next_run': next_run[name],
+            }) for name in sorted(next_run)),
+        }
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.wakeup.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                sys.stderr.write('agent: refresh failed: {}: {}\n'.format(type(e).__name__, e))
+            with self.lock:
+                sleep = min(self.next_run.values()) - time.time()
+            self.wakeup.wait(max(1.0, sleep))
+
+    def stop(self):
+        self.stopping.set()
+        self.wakeup.set()
+
+# ----------------------------------------------------------------------
+
+class RequestHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'inventory2-agent'
+
+    def send_json(self, code, body):
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def send_error_json(self, code, message):
+        self.send_json(code, encode({'error': message}))
+
+    def do_GET(self):
+        agent = self.server.agent
+        url = urllib.parse.urlsplit(self.path)
+        path = url.path.rstrip('/')
+        if path == '/status':
+            return self.send_json(200, encode(agent.status()))
+        snapshot = agent.snapshot
+        if snapshot is None:
+            return self.send_error_json(503, 'the first refresh has not finished yet')
+        document, sections = snapshot
+        if path in ('', '/inventory'):
+            return self.send_json(200, document)
+        if path.startswith('/inventory/'):
+            section = urllib.parse.unquote(path[len('/inventory/'):])
+            if section in sections:
+                return self.send_json(200, sections[section])
+            return self.send_error_json(404, 'no section {}'.format(section))
+        self.send_error_json(404, 'no such path')
+
+    do_HEAD = do_GET
+
+    def discard_body(self):
+        # A body left unread would be taken for the next request on a
+        # keep-alive connection.
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            self.close_connection = True
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_DISCARDED_BODY:
+            self.close_connection = True
+            return
+        while length > 0:
+            chunk = self.rfile.read(min(length, 2 ** 16))
+            if not chunk:
+                break
+            length -= len(chunk)
+
+    def do_POST(self):
+        self.discard_body()
+        agent = self.server.agent
+        url = urllib.parse.urlsplit(self.path)
+        if url.path.rstrip('/') != '/refresh':
+            return self.send_error_json(404, 'no such path')
+        names = None
+        query = urllib.parse.parse_qs(url.query)
+        if 'collector' in query:
+            names = [name for value in query['collector'] for name in value.split(',')]
+            unknown = [name for name in names if name not in collectors.COLLECTORS]
+            if unknown:
+                return self.send_error_json(400, 'unknown collector {}'.format(', '.join(unknown)))
+        agent.request_refresh(names)
+        self.send_json(202, encode({'generation': agent.generation}))
+
+    def address_string(self):
+        # Unix socket clients have no address.
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+# ----------------------------------------------------------------------
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            # A socket left behind by an agent that is gone.
+            os.remove(self.server_address)
+        socketserver.UnixStreamServer.server_bind(self)
+        os.chmod(self.server_address, 0o660)
+
+# ----------------------------------------------------------------------
+
+def is_unix_listen(listen):
+    return '/' in listen or ':' not in listen
+
+# ----------------------------------------------------------------------
+
+def check_listen(listen, allow_remote=False):
+    # Raises ValueError for a TCP address other hosts could reach. An empty
+    # host is every address, and a name is checked for every address it
+    # resolves to.
+    if is_unix_listen(listen) or allow_remote:
+        return
+    host, _, port = listen.rpartition(':')
+    host = host.strip('[]')
+    try:
+        addresses = set(info[4][0] for info in socket.getaddrinfo(host or None, int(port), 0, socket.SOCK_STREAM,
+                                                                  0, socket.AI_PASSIVE))
+    except (socket.gaierror, ValueError) as e:
+        raise ValueError('{}: {}'.format(listen, e))
+    for address in addresses:
+        if not ipaddress.ip_address(address.partition('%')[0]).is_loopback:
+            raise ValueError('{} is not a loopback address, the agent has no authentication'.format(listen))
+
+# ----------------------------------------------------------------------
+
+def make_server(listen, agent, allow_remote=False):
+    # listen is a socket path, or host:port for local HTTP.
+    check_listen(listen, allow_remote)
+    if is_unix_listen(listen):
+        server = UnixHTTPServer(listen, RequestHandler)
+    else:
+        host, _, port = listen.rpartition(':')
+        server = http.server.ThreadingHTTPServer((host.strip('[]'), int(port)), RequestHandler)
+        server.daemon_threads = True
+    server.agent = agent
+    return server
+
+# ----------------------------------------------------------------------
+
+def run_agent(build, options=None, workers=collectors.DEFAULT_WORKERS, listen=DEFAULT_LISTEN, intervals=None,
+              names=None, allow_remote=False):
+    lock = open('agent.lock', 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        raise SystemExit('agent is already running in {}'.format(os.getcwd()))
+
+    agent = Agent(build, options, workers, intervals, names)
+    server = make_server(listen, agent, allow_remote)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: agent.stop())
+    signal.signal(signal.SIGHUP, lambda signum, frame: agent.request_refresh())
+    try:
+        agent.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        if isinstance(server, UnixHTTPServer) and os.path.exists(listen):
+            os.remove(listen)
+        lock.close()
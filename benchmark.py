@@ -0,0 +1,507 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - benchmark
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Benchmarks the parsing stages of inventory2.py on synthetic artifacts of a
+# large host: a deep lshw tree, a full routing table, big package lists, many
+# sockets, containers and RAID disks. Every stage is timed and its peak Python
+# memory is measured with tracemalloc, then compared against a stored baseline.
+#
+#   python3 benchmark.py --save-baseline     # record the baseline
+#   python3 benchmark.py                     # exit 1 on a regression
+#   python3 benchmark.py --scale 0.01        # quick run on small fixtures
+#
+# A run without a baseline of its scale can not be compared and exits with 2.
+#
+# Stage times are stored relative to a calibration loop timed in the same
+# run, so a baseline recorded on one machine still holds on a faster or
+# slower one. It does not cancel out everything (cache sizes, a loaded CI
+# runner), record your own baseline where a comparison keeps failing. Peak
+# memory is compared as it is, it only depends on the Python version.
+
+import json, sys, os
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+import inventory2
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+# Scale and seed of a fixtures directory, written when it is complete.
+FIXTURES_INFO = 'fixtures.json'
+
+# Fixture sizes at --scale 1.
+FIXTURE_SIZES = {
+    'lshw_disks': 20000,
+    'routes': 1000000,
+    'packages': 50000,
+    'netstat': 20000,
+    'containers': 5000,
+    'storcli_disks': 10000,
+}
+
+# A stage is slower than the baseline when it takes more than TIME_TOLERANCE
+# times the baseline plus TIME_SLACK seconds, same for memory.
+TIME_TOLERANCE = 1.5
+TIME_SLACK = 0.05
+MEMORY_TOLERANCE = 1.25
+MEMORY_SLACK = 2 ** 20
+
+# Lines of the calibration loop.
+CALIBRATION_LINES = 200000
+
+OS_ARTIFACTS = {
+    'VERSION': 'benchmark\n',
+    'date_of_inventory.txt': '2024-08-31 | 00:00\n',
+    'os_hostname.txt': 'benchmark\n',
+    'os_version.txt': 'Debian GNU/Linux 12 (bookworm)\n',
+    'os_core.txt': '6.1.0-18-amd64\n',
+    'os_users.txt': 'root\ndaemon\nbin\nsys\n',
+    'os_users_sudo.txt': 'admin\n',
+    'os_users_wheel.txt': '\n',
+    'os_ssh_port.txt': '22\n',
+    'os_users_ssh.txt': 'admin\n',
+    'os_ssl_version.txt': 'OpenSSL 3.0.11 19 Sep 2023\n',
+    'os_ssh_version.txt': 'OpenSSH_9.2p1 Debian-2+deb12u2, OpenSSL 3.0.11 19 Sep 2023\n',
+    'volumes.txt': 'NAME=/dev/sda FSTYPE= MOUNTPOINT= SIZE=1.8T TYPE=disk\n',
+}
+
+# ----------------------------------------------------------------------
+# FIXTURES
+
+def size(name, scale):
+    return max(1, int(FIXTURE_SIZES[name] * scale))
+
+# ----------------------------------------------------------------------
+
+def write_text(directory, filename, lines):
+    with open(os.path.join(directory, filename), 'w', encoding='UTF-8') as f:
+        for line in lines:
+            f.write(line)
+            f.write('\n')
+
+# ----------------------------------------------------------------------
+
+def write_json(directory, filename, data):
+    with open(os.path.join(directory, filename), 'w', encoding='UTF-8') as f:
+        json.dump(data, f, indent=4)
+
+# ----------------------------------------------------------------------
+
+def generate_lshw(count, rnd):
+    # Disks hang below chains of PCI bridges, so the tree is deep as well
+    # as wide, like on hosts with many HBAs and expanders.
+    banks = [{'id': 'bank:{}'.format(i), 'class': 'memory', 'description': 'DIMM DDR4 Synchronous 3200 MHz (0.3 ns)',
+              'product': 'M393A4K40DB3-CWE', 'vendor': 'Samsung', 'serial': '{:08X}'.format(rnd.getrandbits(32)),
+              'slot': 'DIMM_{}'.format(i), 'size': 32 * 2 ** 30, 'clock': 3200000000} for i in range(24)]
+    core = [
+        {'id': 'firmware', 'class': 'memory', 'description': 'BIOS', 'vendor': 'Dell Inc.',
+         'version': '2.19.1', 'date': '01/01/2024'},
+        {'id': 'memory', 'class': 'memory', 'description': 'System Memory', 'size': 24 * 32 * 2 ** 30,
+         'children': banks},
+    ]
+    for cpu in range(2):
+        core.append({'id': 'cpu:{}'.format(cpu), 'class': 'processor', 'description': 'CPU',
+                     'product': 'Intel(R) Xeon(R) Gold 6338 CPU @ 2.00GHz',
+                     'configuration': {'cores': '32', 'threads': '64'},
+                     'children': [{'id': 'cache:{}'.format(i), 'class': 'memory', 'description': 'L{} cache'.format(i + 1),
+                                   'size': 2 ** 20} for i in range(3)]})
+    for psu in range(2):
+        core.append({'id': 'power:{}'.format(psu), 'class': 'power', 'description': 'Power Supply',
+                     'vendor': 'DELL', 'product': 'PWR SPLY,1400W', 'serial': 'PSU{}'.format(psu),
+                     'units': 'mWh', 'capacity': 1400000})
+    for nic in range(4):
+        core.append({'id': 'network:{}'.format(nic), 'class': 'network', 'description': 'Ethernet interface',
+                     'vendor': 'Intel Corporation', 'product': 'Ethernet Controller E810-C',
+                     'logicalname': 'eth{}'.format(nic), 'configuration': {'driver': 'ice'}})
+    for nvme in range(8):
+        core.append({'id': 'nvme', 'class': 'storage', 'description': 'NVMe device', 'product': 'Dell Ent NVMe P5600',
+                     'serial': 'NVME{:06d}'.format(nvme), 'version': '1.0', 'logicalname': '/dev/nvme{}'.format(nvme),
+                     'children': [{'id': 'namespace', 'class': 'disk', 'description': 'NVMe disk',
+                                   'logicalname': '/dev/nvme{}n1'.format(nvme), 'size': 3200631791616}]})
+
+    controllers = 16
+    per_controller = max(1, count // controllers)
+    disk = 0
+    for controller in range(controllers):
+        node = {'id': 'storage', 'class': 'storage', 'description': 'Serial Attached SCSI controller',
+                'vendor': 'Broadcom / LSI', 'product': 'SAS3416 Fusion-MPT', 'children': []}
+        for i in range(per_controller):
+            if disk >= count:
+                break
+            node['children'].append({'id': 'disk:{}'.format(i), 'class': 'disk', 'description': 'ATA Disk',
+                                     'product': 'ST4000NM0035', 'vendor': 'Seagate', 'serial': 'ZC{:08d}'.format(disk),
+                                     'version': 'TN05', 'logicalname': '/dev/sd{}'.format(disk), 'size': 4000787030016})
+            disk += 1
+        for depth in range(8):
+            node = {'id': 'pci:{}'.format(depth), 'class': 'bridge', 'description': 'PCI bridge', 'children': [node]}
+        core.append(node)
+
+    return {'id': 'host', 'class': 'system', 'description': 'Computer', 'product': 'PowerEdge R750',
+            'vendor': 'Dell Inc.', 'serial': 'ABC1234',
+            'children': [{'id': 'core', 'class': 'bus', 'description': 'Motherboard', 'vendor': 'Dell Inc.',
+                          'product': '0PJ0X9', 'serial': 'CNFCP0012345', 'children': core}]}
+
+# ----------------------------------------------------------------------
+
+def generate_ip(directory, count, rnd):
+    write_text(directory, 'ip_link.txt', [
+        '1: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN mode DEFAULT group default qlen 1000',
+        '    link/loopback 00:00:00:00:00:00 brd 00:00:00:00:00:00',
+        '2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq state UP mode DEFAULT group default qlen 1000',
+        '    link/ether 52:54:00:12:34:56 brd ff:ff:ff:ff:ff:ff',
+        '    altname enp1s0',
+        '3: eth1: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq state UP mode DEFAULT group default qlen 1000',
+        '    link/ether 52:54:00:12:34:57 brd ff:ff:ff:ff:ff:ff',
+    ])
+    write_text(directory, 'ip_addr.txt', [
+        '1: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN group default qlen 1000',
+        '    inet 127.0.0.1/8 scope host lo',
+        '2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq state UP group default qlen 1000',
+        '    inet 192.0.2.10/24 brd 192.0.2.255 scope global eth0',
+        '3: eth1: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq state UP group default qlen 1000',
+        '    inet 198.51.100.10/24 brd 198.51.100.255 scope global eth1',
+    ])
+
+    def routes():
+        yield 'default via 192.0.2.1 dev eth0 metric 100'
+        yield '192.0.2.0/24 dev eth0 src 192.0.2.10'
+        yield '198.51.100.0/24 dev eth1 src 198.51.100.10'
+        # A full table in kernel order: sorted prefixes behind two peers.
+        prefixes = set()
+        for i in range(count):
+            length = rnd.choice([20, 22, 24])
+            prefixes.add(((rnd.getrandbits(24) << 8) & (((1 << length) - 1) << (32 - length)), length))
+        for key, length in sorted(prefixes):
+            address = '{}.{}.{}.{}'.format(key >> 24, (key >> 16) & 255, (key >> 8) & 255, key & 255)
+            if key & 7 == 0:
+                yield '{}/{} metric 20'.format(address, length)
+                yield '\tnexthop via 192.0.2.1 dev eth0 weight 1'
+                yield '\tnexthop via 198.51.100.1 dev eth1 weight 1'
+            else:
+                yield '{}/{} via 192.0.2.1 dev eth0 metric 20'.format(address, length)
+    write_text(directory, 'network_routes_all.txt', routes())
+
+# ----------------------------------------------------------------------
+
+def package_names(count):
+    return ['lib{}-package-{}'.format(['ssl', 'xml', 'gtk', 'python3', 'perl'][i % 5], i) for i in range(count)]
+
+# ----------------------------------------------------------------------
+
+def generate_apt(directory, count, rnd):
+    def lines():
+        yield 'Listing...'
+        for name in package_names(count):
+            epoch = '1:' if rnd.random() < 0.1 else ''
+            yield '{}/stable,now {}{}.{}.{}-{}+deb12u1 amd64 [installed]'.format(
+                name, epoch, rnd.randint(0, 9), rnd.randint(0, 99), rnd.randint(0, 9), rnd.randint(1, 9))
+    write_text(directory, 'packages_apt.txt', lines())
+
+# ----------------------------------------------------------------------
+
+def generate_yum(directory, count, rnd):
+    def lines():
+        yield 'Loaded plugins: fastestmirror'
+        yield 'Installed Packages'
+        for name in package_names(count):
+            version = '{}.{}.{}-{}.el8'.format(rnd.randint(0, 9), rnd.randint(0, 99), rnd.randint(0, 9), rnd.randint(1, 9))
+            # yum wraps the line when the name does not fit into its column.
+            if len(name) > 20:
+                yield '{}.x86_64'.format(name)
+                yield '{:>40}{:>20}'.format(version, '@baseos')
+            else:
+                yield '{:<40}{:<20}{}'.format(name + '.x86_64', version, '@baseos')
+    write_text(directory, 'packages_yum.txt', lines())
+
+# ----------------------------------------------------------------------
+
+def netstat_ports(count):
+    return [1024 + i for i in range(count // 2)]
+
+# ----------------------------------------------------------------------
+
+def generate_netstat(directory, count, rnd):
+    def lines():
+        for port in netstat_ports(count):
+            pid = rnd.randint(100, 4000000)
+            yield 'tcp        0      0 0.0.0.0:{:<15} 0.0.0.0:*               LISTEN      0          {:<10} {}/docker-proxy'.format(
+                port, rnd.randint(10000, 9999999), pid)
+            yield 'tcp6       0      0 :::{:<21} :::*                    LISTEN      0          {:<10} {}/docker-proxy'.format(
+                port, rnd.randint(10000, 9999999), pid)
+    write_text(directory, 'netstat.txt', lines())
+
+# ----------------------------------------------------------------------
+
+def generate_docker(directory, count, ports, rnd):
+    containers = []
+    for i in range(count):
+        port = ports[i % len(ports)]
+        containers.append({
+            'Command': '"/docker-entrypoint.sh nginx -g \'daemon off;\'"',
+            'CreatedAt': '2024-08-31 00:00:00 +0000 UTC',
+            'ID': '{:064x}'.format(rnd.getrandbits(256)),
+            'Image': 'registry.example.com/app-{}:1.{}'.format(i % 50, i % 7),
+            'Labels': 'com.docker.compose.project=app{}'.format(i % 50),
+            'Names': 'app-{}'.format(i),
+            'Ports': '0.0.0.0:{0}->80/tcp, :::{0}->80/tcp, 443/tcp'.format(port),
+            'State': 'running',
+            'Status': 'Up 3 days',
+        })
+    write_json(directory, 'docker.json', containers)
+
+# ----------------------------------------------------------------------
+
+def generate_storcli(directory, count, rnd):
+    controllers = []
+    per_controller = max(1, count // 4)
+    for controller in range(4):
+        response = {}
+        for i in range(per_controller):
+            drive = 'Drive /c{}/e252/s{}'.format(controller, i)
+            response[drive] = [{'EID:Slt': '252:{}'.format(i), 'DID': i, 'State': 'Onln', 'Size': '3.637 TB',
+                                'Intf': 'SAS', 'Med': 'HDD', 'Model': 'ST4000NM0025'}]
+            response[drive + ' - Detailed Information'] = {
+                drive + ' State': {'Shield Counter': 0, 'Media Error Count': 0, 'Predictive Failure Count': 0},
+                drive + ' Device attributes': {
+                    'SN': 'ZC{:08d}        '.format(controller * per_controller + i),
+                    'WWN': '5000C500{:08X}'.format(rnd.getrandbits(32)),
+                    'Firmware Revision': 'DS11',
+                    'Raw size': '3.638 TB [0x1d1c0beb0 Sectors]',
+                    'Model Number': 'ST4000NM0025',
+                },
+            }
+        controllers.append({'Command Status': {'Controller': controller, 'Status': 'Success'},
+                            'Response Data': response})
+    write_json(directory, 'storcli-disks.json', {'Controllers': controllers})
+
+# ----------------------------------------------------------------------
+
+def generate_fixtures(directory, scale=1.0, seed=1):
+    # Every stage gets its own directory with only the artifacts it reads,
+    # and 'inventory' gets all of them for an end-to-end run.
+    rnd = random.Random(seed)
+    full = os.path.join(directory, 'inventory')
+    for stage in STAGES:
+        os.makedirs(os.path.join(directory, stage[1]), exist_ok=True)
+
+    write_json(os.path.join(directory, 'lshw'), 'lshw.json', generate_lshw(size('lshw_disks', scale), rnd))
+    generate_ip(os.path.join(directory, 'routes'), size('routes', scale), rnd)
+    generate_apt(os.path.join(directory, 'packages_apt'), size('packages', scale), rnd)
+    generate_yum(os.path.join(directory, 'packages_yum'), size('packages', scale), rnd)
+    generate_netstat(os.path.join(directory, 'netstat'), size('netstat', scale), rnd)
+    generate_netstat(os.path.join(directory, 'docker'), size('netstat', scale), rnd)
+    generate_docker(os.path.join(directory, 'docker'), size('containers', scale),
+                    netstat_ports(size('netstat', scale)), rnd)
+    generate_storcli(os.path.join(directory, 'storcli'), size('storcli_disks', scale), rnd)
+
+    for stage, filename in [('lshw', 'lshw.json'), ('routes', 'ip_link.txt'), ('routes', 'ip_addr.txt'),
+                            ('routes', 'network_routes_all.txt'), ('packages_apt', 'packages_apt.txt'),
+                            ('docker', 'netstat.txt'), ('docker', 'docker.json'), ('storcli', 'storcli-disks.json')]:
+        target = os.path.join(full, filename)
+        if not os.path.exists(target):
+            os.symlink(os.path.join(directory, stage, filename), target)
+    for filename, content in OS_ARTIFACTS.items():
+        with open(os.path.join(full, filename), 'w') as f:
+            f.write(content)
+    write_json(directory, FIXTURES_INFO, {'scale': scale, 'seed': seed})
+
+# ----------------------------------------------------------------------
+# STAGES
+
+def stage_lshw(inventory):
+    inventory2.read_lshw('lshw.json', inventory)
+
+def stage_routes(inventory):
+    inventory2.parse_ip_l0(inventory)
+
+def stage_routes_summary(inventory):
+    inventory2.parse_ip_l0(inventory, 'summary')
+
+def stage_packages(inventory):
+    inventory2.parse_packages_l0(inventory)
+
+def stage_netstat(inventory):
+    inventory2.parse_netstat_l0(inventory)
+
+def setup_docker(inventory):
+    inventory2.parse_netstat_l0(inventory)
+
+def stage_docker(inventory):
+    inventory2.parse_docker_l0(inventory)
+
+def stage_storcli(inventory):
+    inventory2.parse_storcli_l0(inventory2.readJSONfromFile('storcli-disks.json'), inventory)
+
+def stage_inventory(inventory):
+    inventory2.inventory(to_screen=False, to_file=False)
+
+# name, fixture directory, setup (not measured), stage
+STAGES = [
+    ('lshw', 'lshw', None, stage_lshw),
+    ('routes', 'routes', None, stage_routes),
+    ('routes_summary', 'routes', None, stage_routes_summary),
+    ('packages_apt', 'packages_apt', None, stage_packages),
+    ('packages_yum', 'packages_yum', None, stage_packages),
+    ('netstat', 'netstat', None, stage_netstat),
+    ('docker', 'docker', setup_docker, stage_docker),
+    ('storcli', 'storcli', None, stage_storcli),
+    ('inventory', 'inventory', None, stage_inventory),
+]
+
+# ----------------------------------------------------------------------
+
+def run_stage(directory, setup, stage, repeat):
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        times = []
+        for i in range(repeat):
+            inventory = inventory2.new_inventory()
+            if setup is not None:
+                setup(inventory)
+            start = time.perf_counter()
+            stage(inventory)
+            times.append(time.perf_counter() - start)
+            del inventory
+
+        # Memory is measured in a separate run, tracemalloc slows it down.
+        inventory = inventory2.new_inventory()
+        if setup is not None:
+            setup(inventory)
+        tracemalloc.start()
+        try:
+            stage(inventory)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+    return {'seconds': round(min(times), 4), 'peak_bytes': peak}
+
+# ----------------------------------------------------------------------
+
+def calibrate(repeat):
+    # A fixed piece of parser-like work: split lines, fill dicts, dump JSON.
+    lines = ['10.{}.{}.0/24 via 192.0.2.{} dev eth0 metric {}'.format(i >> 8 & 255, i & 255, i % 254 + 1, i % 100)
+             for i in range(CALIBRATION_LINES)]
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        table = {}
+        for line in lines:
+            fields = line.split()
+            table[fields[0]] = {'via': fields[2], 'dev': fields[4], 'metric': int(fields[6])}
+        json.dumps(table)
+        times.append(time.perf_counter() - start)
+    return round(min(times), 4)
+
+# ----------------------------------------------------------------------
+
+def compare(results, baseline, calibration):
+    # Times are compared in calibration loops, the baseline in seconds is
+    # what it took on this machine.
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result['relative'] > base['relative'] * TIME_TOLERANCE + TIME_SLACK / calibration:
+            regressions.append('{}: {}s, baseline {}s here'.format(name, result['seconds'],
+                                                                  round(base['relative'] * calibration, 4)))
+        if result['peak_bytes'] > base['peak_bytes'] * MEMORY_TOLERANCE + MEMORY_SLACK:
+            regressions.append('{}: peak {} MB, baseline {} MB'.format(
+                name, round(result['peak_bytes'] / 2 ** 20, 1), round(base['peak_bytes'] / 2 ** 20, 1)))
+    return regressions
+
+# ----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='Linux Inventory Tool benchmark')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='fixture size relative to a large host')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per stage, the fastest one counts')
+    parser.add_argument('--stage', action='append', choices=[stage[0] for stage in STAGES],
+                        help='run only this stage, may be repeated')
+    parser.add_argument('--fixtures', default=None,
+                        help='generate fixtures into this directory and keep them')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='baseline file to compare with or to save')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    temp_dir = None
+    directory = args.fixtures
+    if directory is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix='inventory-benchmark-')
+        directory = temp_dir.name
+    if os.path.exists(os.path.join(directory, FIXTURES_INFO)):
+        scale = inventory2.readJSONfromFile(os.path.join(directory, FIXTURES_INFO)).get('scale')
+        if scale != args.scale:
+            parser.error('fixtures in {} were generated at scale {}, not {}'.format(directory, scale, args.scale))
+    elif os.path.exists(os.path.join(directory, 'inventory', 'VERSION')):
+        parser.error('fixtures in {} are incomplete or of an unknown scale, use an empty directory'.format(directory))
+    else:
+        start = time.perf_counter()
+        generate_fixtures(directory, args.scale)
+        sys.stderr.write('fixtures generated in {:.1f}s\n'.format(time.perf_counter() - start))
+
+    calibration = calibrate(args.repeat)
+    print('{:<16} {:>10.3f}s'.format('calibration', calibration))
+
+    results = {}
+    for name, fixture, setup, stage in STAGES:
+        if args.stage and name not in args.stage:
+            continue
+        results[name] = run_stage(os.path.join(directory, fixture), setup, stage, args.repeat)
+        results[name]['relative'] = round(results[name]['seconds'] / calibration, 4)
+        print('{:<16} {:>10.3f}s {:>10.1f} MB'.format(name, results[name]['seconds'],
+                                                      results[name]['peak_bytes'] / 2 ** 20))
+
+    if temp_dir is not None:
+        temp_dir.cleanup()
+
+    if args.save_baseline:
+        baseline = {'scale': args.scale, 'calibration': calibration, 'stages': results}
+        if os.path.exists(args.baseline):
+            old = inventory2.readJSONfromFile(args.baseline)
+            if old.get('scale') == args.scale and 'calibration' in old:
+                baseline['stages'] = dict(old['stages'], **results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=4)
+            f.write('\n')
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.stderr.write('NO BASELINE {}, nothing compared, record one with --save-baseline\n'.format(args.baseline))
+        sys.exit(2)
+    baseline = inventory2.readJSONfromFile(args.baseline)
+    if baseline.get('scale') != args.scale:
+        sys.stderr.write('NO BASELINE at scale {}, {} was recorded at scale {}, nothing compared\n'.format(
+            args.scale, args.baseline, baseline.get('scale')))
+        sys.exit(2)
+    if 'calibration' not in baseline:
+        sys.stderr.write('NO BASELINE with a calibration in {}, nothing compared, record it again\n'.format(
+            args.baseline))
+        sys.exit(2)
+    regressions = compare(results, baseline['stages'], calibration)
+    for regression in regressions:
+        sys.stderr.write('REGRESSION {}\n'.format(regression))
+    if len(regressions) > 0:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - bundle
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Raw artifact bundles. After a run the collector outputs of the work directory
+# are kept as one <host>.<time>.tar.gz, with the collector results next to them,
+# so results can be made again from the raw data when a parser is fixed.
+#
+# Replay reads every bundle into memory and hands the files to inventory() as a
+# dict, without extracting or changing directory, so bundles are parsed on a
+# pool of processes, one per core.
+
+import io
+import os
+import sys
+import json
+import time
+import tarfile
+import multiprocessing
+
+BUNDLE_SUFFIX = '.tar.gz'
+COLLECTOR_RESULTS = 'collectors.json'
+# Files in the work directory that are not collector outputs.
+EXTRA_ARTIFACTS = ['VERSION']
+
+# ----------------------------------------------------------------------
+
+def artifact_names(collector_results=None):
+    # With the results of the run, only the outputs it has written, not
+    # files left over from another run in the same directory.
+    import collectors
+    names = set(EXTRA_ARTIFACTS)
+    for collector in collectors.COLLECTORS.values():
+        if collector_results is None:
+            names.add(collector.output)
+        elif collector_results.get(collector.name, {}).get('status') in ('ok', 'failed'):
+            names.add(collector.output)
+    return sorted(names)
+
+# ----------------------------------------------------------------------
+
+def write_bundle(bundle_dir, hostname, collector_results=None, directory='.'):
+    # Returns the path of the bundle.
+    if not os.path.isdir(bundle_dir):
+        os.makedirs(bundle_dir)
+    path = os.path.join(bundle_dir, '{}.{}{}'.format(hostname, time.strftime('%Y%m%dT%H%M%S'), BUNDLE_SUFFIX))
+    with tarfile.open(path + '.part', 'w:gz', compresslevel=6) as tar:
+        for name in artifact_names(collector_results):
+            if os.path.isfile(os.path.join(directory, name)):
+                tar.add(os.path.join(directory, name), arcname=name)
+        if collector_results is not None:
+            data = json.dumps(collector_results, ensure_ascii=False).encode('UTF-8')
+            info = tarfile.TarInfo(COLLECTOR_RESULTS)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+    os.rename(path + '.part', path)
+    return path
+
+# ----------------------------------------------------------------------
+
+def read_bundle(path):
+    # Returns ({file name: content}, collector results or None).
+    artifacts = {}
+    with tarfile.open(path, 'r:*') as tar:
+        for member in tar:
+            if member.isfile():
+                artifacts[os.path.basename(member.name)] = tar.extractfile(member).read()
+    collector_results = None
+    if COLLECTOR_RESULTS in artifacts:
+        collector_results = json.loads(artifacts.pop(COLLECTOR_RESULTS).decode('UTF-8'))
+    return artifacts, collector_results
+
+# ----------------------------------------------------------------------
+
+def find_bundles(paths):
+    bundles = []
+    for path in paths:
+        if os.path.isdir(path):
+            bundles.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                           if name.endswith(BUNDLE_SUFFIX))
+        else:
+            bundles.append(path)
+    return bundles
+
+# ----------------------------------------------------------------------
+
+def replay_bundle(task):
+    # Runs in a pool process. Returns (bundle, written file or None, error).
+    path, output_dir, inventory_options = task
+    import inventory2
+    try:
+        artifacts, collector_results = read_bundle(path)
+        filename = os.path.join(output_dir, os.path.basename(path)[:-len(BUNDLE_SUFFIX)])
+        inventory2.inventory(to_screen=False, to_file=True, filename=filename, artifacts=artifacts,
+                             collector_results=collector_results, **inventory_options)
+        return path, filename, None
+    except Exception as e:
+        return path, None, '{}: {}'.format(type(e).__name__, e)
+
+# ----------------------------------------------------------------------
+
+def replay(paths, output_dir, workers=None, inventory_options=None):
+    # Returns the number of bundles that failed.
+    bundles = find_bundles(paths)
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    tasks = [(path, output_dir, inventory_options or {}) for path in bundles]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    failed = 0
+    start = time.time()
+    with multiprocessing.Pool(workers) as pool:
+        # Small chunks keep the pool busy when bundle sizes differ a lot.
+        for path, filename, error in pool.imap_unordered(replay_bundle, tasks,
+                                                         chunksize=max(1, len(tasks) // (workers * 8))):
+            if error is not None:
+                failed += 1
+                sys.stderr.write('replay {}: {}\n'.format(path, error))
+    sys.stderr.write('replayed {} bundles, {} failed, in {:.1f}s on {} processes\n'.format(
+        len(tasks), failed, time.time() - start, workers))
+    return failed
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - cache
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Persistent cache of collector artifacts. An entry is only valid for the
+# same boot, the same machine (DMI serial and UUID) and the same state of the
+# files the collector depends on, and for at most its collector's TTL. The
+# cache directory is kept below a size limit by dropping the oldest entries.
+#
+# What the parsers made of an artifact is kept next to it, under the same key
+# and a digest of the parser, so a run that gets the artifact from the cache
+# does not parse it again.
+
+import os
+import json
+import time
+import shutil
+import hashlib
+
+DEFAULT_CACHE_MAX_BYTES = 64 * 2 ** 20
+
+BOOT_ID = '/proc/sys/kernel/random/boot_id'
+DMI_IDS = ['/sys/class/dmi/id/product_serial', '/sys/class/dmi/id/product_uuid']
+
+# ----------------------------------------------------------------------
+
+def read_id(filename):
+    try:
+        with open(filename) as f:
+            return f.read().strip()
+    except (IOError, OSError):
+        return None
+
+# ----------------------------------------------------------------------
+
+def file_state(filename):
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+# ----------------------------------------------------------------------
+
+def host_fingerprint():
+    return [read_id(BOOT_ID)] + [read_id(filename) for filename in DMI_IDS]
+
+# ----------------------------------------------------------------------
+
+class CollectorCache(object):
+
+    def __init__(self, directory, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fingerprint = host_fingerprint()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def key(self, collector, command, files, options):
+        state = {
+            'collector': collector,
+            'command': command,
+            'host': self.fingerprint,
+            'files': dict((filename, file_state(filename)) for filename in files),
+            'options': dict((name, value) for name, value in options.items() if not name.startswith('cache_')),
+        }
+        return hashlib.sha256(json.dumps(state, sort_keys=True).encode('UTF-8')).hexdigest()[:32]
+
+    def entry(self, collector, key):
+        return os.path.join(self.directory, '{}.{}'.format(collector, key))
+
+    def get(self, collector, key, ttl, output):
+        # Copies a fresh entry to output, returns False on a miss.
+        entry = self.entry(collector, key)
+        try:
+            age = time.time() - os.stat(entry).st_mtime
+        except OSError:
+            return False
+        if age > ttl:
+            self.remove(entry)
+            return False
+        shutil.copyfile(entry, output)
+        os.utime(entry, (time.time(), os.stat(entry).st_mtime))
+        return True
+
+    def put(self, collector, key, output):
+        entry = self.entry(collector, key)
+        shutil.copyfile(output, entry + '.part')
+        os.rename(entry + '.part', entry)
+        # Only the latest entry of a collector can still match, with the
+        # parsed outputs of that entry.
+        for name in os.listdir(self.directory):
+            if name.startswith(collector + '.') and not name.startswith(os.path.basename(entry)):
+                self.remove(os.path.join(self.directory, name))
+        self.evict()
+
+    def parsed_entry(self, collector, key, parser):
+        parser = hashlib.sha256(json.dumps(parser, sort_keys=True).encode('UTF-8')).hexdigest()[:16]
+        return '{}.{}.json'.format(self.entry(collector, key), parser)
+
+    def get_parsed(self, collector, key, parser):
+        # Returns the parsed output of the entry, None on a miss. It is valid
+        # as long as the entry itself.
+        if not os.path.exists(self.entry(collector, key)):
+            return None
+        try:
+            with open(self.parsed_entry(collector, key, parser), encoding='UTF-8') as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def put_parsed(self, collector, key, parser, data):
+        if not os.path.exists(self.entry(collector, key)):
+            return
+        entry = self.parsed_entry(collector, key, parser)
+        with open(entry + '.part', 'w', encoding='UTF-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.rename(entry + '.part', entry)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_atime, st.st_size, name))
+        total = sum(size for atime, size, name in entries)
+        for atime, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def remove(self, entry):
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
@@ -0,0 +1,571 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - collectors
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Every raw artifact that inventory() reads from the work directory is produced
+# by a registered collector. Independent collectors run at the same time on a
+# bounded pool of worker threads, so the total run time is close to the slowest
+# collector, and every collector has its own timeout.
+
+import json, sys, os
+import time
+import shutil
+import signal
+import threading
+import subprocess
+import queue
+
+import instrument
+
+SHELL = '/bin/bash'
+
+DEFAULT_TIMEOUT = 60
+DEFAULT_WORKERS = 8
+# Time a command gets after the deadline to be killed and reaped before
+# its worker is given up.
+KILL_GRACE = 5
+
+MEGACLI = '/usr/local/bin/MegaCli'
+STORCLI = ['/opt/MegaRAID/storcli/storcli64', '/opt/MegaRAID/storcli/storcli']
+
+DEFAULT_OPTIONS = {
+    'net_source': 'native',
+    'hw_source': 'lshw',
+    'packages_source': 'native',
+    'containers_source': 'native',
+    'volumes_source': 'native',
+    'os_source': 'native',
+    'users_source': 'files',
+    'users_limit': 10000,
+    'routes_output': 'full',
+    'cache_dir': None,
+    'cache_max_bytes': None,
+    'smart_workers': 8,
+    'smart_timeout': 30,
+    'netns_workers': 0,
+}
+
+DAY = 24 * 60 * 60
+
+DPKG_STATUS = '/var/lib/dpkg/status'
+RPMDB = ['/var/lib/rpm/rpmdb.sqlite', '/var/lib/rpm/Packages']
+SSHD_CONFIG = '/etc/ssh/sshd_config'
+OS_COMMANDS = ['os_hostname', 'os_version', 'os_core', 'os_users', 'os_users_sudo', 'os_users_wheel',
+               'os_ssh_port', 'os_users_ssh', 'os_ssl_version', 'os_ssh_version']
+
+COLLECTORS = {}
+
+# ----------------------------------------------------------------------
+
+class Collector(object):
+
+    def __init__(self, name, output, command=None, function=None,
+                 timeout=DEFAULT_TIMEOUT, condition=None, discard_on_error=False,
+                 fallback=None, cache_ttl=None, cache_files=None):
+        self.name = name
+        self.output = output
+        self.command = command
+        self.function = function
+        self.timeout = timeout
+        self.condition = condition
+        self.discard_on_error = discard_on_error
+        self.fallback = fallback or []
+        # Artifacts are only cached for collectors with a TTL, and are
+        # invalidated by a reboot or by any change of cache_files.
+        self.cache_ttl = cache_ttl
+        self.cache_files = cache_files or []
+
+    def fallbacks(self, options):
+        return self.fallback(options) if callable(self.fallback) else self.fallback
+
+    def enabled(self, options):
+        if self.condition is None:
+            return True
+        return bool(self.condition(options))
+
+    def run(self, options, cache=None, deadline=None):
+        result = {'name': self.name, 'output': self.output, 'status': None,
+                  'returncode': None, 'elapsed': 0.0}
+        start = time.time()
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = min(timeout, max(deadline - start, 0))
+        part = '{}.part'.format(self.output)
+        command = self.command(options) if callable(self.command) else self.command
+        cache_key = None
+        if cache is not None and self.cache_ttl:
+            cache_key = cache.key(self.name, command or self.function.__name__, self.cache_files, options)
+            if cache.get(self.name, cache_key, self.cache_ttl, self.output):
+                result['status'] = 'ok'
+                result['returncode'] = 0 if command is not None else None
+                result['cached'] = True
+                result['cache_key'] = cache_key
+                result['elapsed'] = round(time.time() - start, 3)
+                return result
+        meter = instrument.Meter()
+        try:
+            if self.command is not None:
+                result['status'], result['returncode'], usage = run_command(command, part, timeout)
+                result.update(usage)
+            else:
+                # Functions get the time they have to finish by as an option.
+                data = self.function(dict(options, deadline=start + timeout))
+                write_artifact(part, data)
+                result['status'] = 'ok'
+                usage = meter.usage()
+                usage.pop('elapsed')
+                result.update(usage)
+        except Exception as e:
+            result['status'] = 'error'
+            result['error'] = '{}: {}'.format(type(e).__name__, e)
+        if os.path.exists(part):
+            result['bytes_written'] = os.path.getsize(part)
+
+        if (result['status'] == 'ok' or
+            (result['status'] == 'failed' and not self.discard_on_error)):
+            os.rename(part, self.output)
+        else:
+            remove_file(part)
+            # The output of an earlier run in the same directory would
+            # pass for this one and win over the fallbacks.
+            remove_file(self.output)
+
+        if cache_key is not None and result['status'] == 'ok':
+            try:
+                cache.put(self.name, cache_key, self.output)
+                result['cache_key'] = cache_key
+            except OSError as e:
+                result['error'] = 'cache: {}'.format(e)
+
+        result['elapsed'] = round(time.time() - start, 3)
+        return result
+
+# ----------------------------------------------------------------------
+
+def register(collector):
+    COLLECTORS[collector.name] = collector
+    return collector
+
+# ----------------------------------------------------------------------
+
+def register_command(name, output, command, **kwargs):
+    return register(Collector(name, output, command=command, **kwargs))
+
+# ----------------------------------------------------------------------
+
+def register_function(name, output, **kwargs):
+    def decorator(function):
+        register(Collector(name, output, function=function, **kwargs))
+        return function
+    return decorator
+
+# ----------------------------------------------------------------------
+
+def write_artifact(filename, data):
+    if isinstance(data, str):
+        with open(filename, 'w', encoding='UTF-8') as f:
+            f.write(data)
+    else:
+        with open(filename, 'w', encoding='UTF-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+# ----------------------------------------------------------------------
+
+def remove_file(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+# ----------------------------------------------------------------------
+
+def kill_process_group(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+# ----------------------------------------------------------------------
+
+def wait_process(proc, timeout):
+    # Like proc.wait(), but the child is reaped with wait4 so its resource
+    # usage is known. Returns (returncode, rusage), returncode is None on
+    # timeout.
+    deadline = time.time() + timeout
+    delay = 0.001
+    while True:
+        pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+        if pid != 0:
+            break
+        if time.time() > deadline:
+            return None, None
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+    if os.WIFSIGNALED(status):
+        proc.returncode = -os.WTERMSIG(status)
+    else:
+        proc.returncode = os.WEXITSTATUS(status)
+    return proc.returncode, rusage
+
+# ----------------------------------------------------------------------
+
+def run_command(command, output, timeout):
+    with open(output, 'wb') as out:
+        proc = subprocess.Popen(command, shell=True, executable=SHELL,
+                                stdin=subprocess.DEVNULL, stdout=out,
+                                start_new_session=True)
+        returncode, rusage = wait_process(proc, timeout)
+        if returncode is None:
+            kill_process_group(proc)
+            # A command stuck in the kernel (D state) can not be reaped
+            # until it comes back, it is left behind.
+            wait_process(proc, KILL_GRACE)
+            return 'timeout', None, {}
+
+    return ('ok' if returncode == 0 else 'failed'), returncode, instrument.rusage_usage(rusage)
+
+# ----------------------------------------------------------------------
+
+def select_collectors(names=None):
+    selected = []
+    for collector in COLLECTORS.values():
+        if names is not None and collector.name not in names:
+            continue
+        selected.append(collector)
+    return selected
+
+# ----------------------------------------------------------------------
+
+def get_option(options, name):
+    return options.get(name, DEFAULT_OPTIONS.get(name))
+
+# ----------------------------------------------------------------------
+
+def run_collectors(names=None, workers=DEFAULT_WORKERS, options=None, deadline=None):
+    # deadline is the time all collectors have to finish by. Collectors
+    # still running then are killed or abandoned, those not started yet
+    # are not started, all of them are reported with status timeout.
+    options = dict(DEFAULT_OPTIONS, **(options or {}))
+    cache = None
+    if get_option(options, 'cache_dir'):
+        import cache as cache_module
+        cache = cache_module.CollectorCache(get_option(options, 'cache_dir'),
+                                            get_option(options, 'cache_max_bytes') or
+                                            cache_module.DEFAULT_CACHE_MAX_BYTES)
+    results = {}
+    started = {}
+    tasks = queue.Queue()
+    lock = threading.Lock()
+
+    for collector in select_collectors(names):
+        if collector.enabled(options):
+            tasks.put(collector)
+        else:
+            results[collector.name] = {'name': collector.name, 'output': collector.output,
+                                       'status': 'skipped', 'returncode': None, 'elapsed': 0.0}
+
+    pending = dict((c.name, c) for c in list(tasks.queue))
+
+    # A failed collector hands over to its fallback collectors, which run
+    # even when their own condition has disabled them.
+    def fall_back(collector):
+        for name in collector.fallbacks(options):
+            if name in pending or (name in results and results[name]['status'] != 'skipped'):
+                continue
+            results.pop(name, None)
+            pending[name] = COLLECTORS[name]
+            tasks.put(COLLECTORS[name])
+            spawn()
+
+    def worker():
+        while True:
+            try:
+                collector = tasks.get_nowait()
+            except queue.Empty:
+                return
+            with lock:
+                started[collector.name] = time.time()
+            if deadline is not None and time.time() >= deadline:
+                remove_file(collector.output)
+                result = {'name': collector.name, 'output': collector.output,
+                          'status': 'timeout', 'returncode': None, 'elapsed': 0.0}
+            else:
+                result = collector.run(options, cache, deadline)
+            with lock:
+                if collector.name not in results:
+                    results[collector.name] = result
+                    if result['status'] != 'ok':
+                        fall_back(collector)
+                else:
+                    # Given up on already, what it wrote too late is not
+                    # used.
+                    remove_file(collector.output)
+
+    def spawn():
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+
+    for i in range(min(workers, len(pending))):
+        spawn()
+
+    # Commands are killed by their own worker on timeout. A python collector
+    # can not be interrupted, so it is abandoned and its worker is replaced.
+    # So is a command that can not be reaped after its timeout or after the
+    # deadline.
+    while True:
+        with lock:
+            now = time.time()
+            for name, collector in list(pending.items()):
+                if name in results:
+                    pending.pop(name)
+                elif name in started and (
+                        (collector.function is not None and now - started[name] > collector.timeout) or
+                        (collector.command is not None and now - started[name] > collector.timeout + KILL_GRACE) or
+                        (deadline is not None and now > deadline + KILL_GRACE)):
+                    results[name] = {'name': name, 'output': collector.output,
+                                     'status': 'timeout', 'returncode': None,
+                                     'elapsed': round(now - started[name], 3)}
+                    remove_file(collector.output)
+                    pending.pop(name)
+                    fall_back(collector)
+                    if not tasks.empty():
+                        spawn()
+            if len(pending) == 0:
+                break
+        time.sleep(0.05)
+
+    # A timeout is recovered when a fallback has produced the data instead.
+    for name, result in results.items():
+        if result['status'] == 'timeout' and any(
+                results.get(fallback, {}).get('status') == 'ok' for fallback in COLLECTORS[name].fallbacks(options)):
+            result['recovered'] = True
+
+    for result in sorted(results.values(), key=lambda r: r['name']):
+        sys.stderr.write('collector {}: {}{} in {}s{}\n'.format(
+            result['name'], result['status'], ' (cached)' if result.get('cached') else '', result['elapsed'],
+            ' ({})'.format(result['error']) if 'error' in result else ''))
+
+    return results
+
+# ----------------------------------------------------------------------
+
+def find_raid_tool():
+    if os.path.isfile(MEGACLI):
+        return 'megacli', MEGACLI
+    for storcli in STORCLI:
+        if os.path.isfile(storcli):
+            return 'storcli', storcli
+    return None, None
+
+# ----------------------------------------------------------------------
+
+def find_package_manager():
+    if shutil.which('apt'):
+        return 'apt'
+    if shutil.which('yum'):
+        return 'yum'
+    return None
+
+# ----------------------------------------------------------------------
+
+def find_container_sockets():
+    import containers
+    return containers.find_container_sockets()
+
+# ----------------------------------------------------------------------
+# OS
+
+@register_function('date_of_inventory', 'date_of_inventory.txt', timeout=5)
+def collect_date_of_inventory(options):
+    return time.strftime('%Y-%m-%d | %H:%M') + '\n'
+
+@register_function('os', 'os.json', timeout=60,
+                   condition=lambda options: get_option(options, 'os_source') == 'native',
+                   fallback=OS_COMMANDS)
+def collect_os(options):
+    import osinfo
+    return osinfo.collect_os(users_source=get_option(options, 'users_source'),
+                             users_limit=get_option(options, 'users_limit'))
+
+register_command('os_hostname', 'os_hostname.txt', 'hostname', timeout=10,
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_version', 'os_version.txt',
+                 'grep -i pretty /etc/os-release | awk -F\\" \'{print $2}\'', timeout=10,
+                 cache_ttl=DAY, cache_files=['/etc/os-release'],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_core', 'os_core.txt', 'uname -r', timeout=10, cache_ttl=DAY,
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_users', 'os_users.txt',
+                 'awk -F: \'{print $1}\' /etc/passwd | grep -iv nobody', timeout=30,
+                 cache_ttl=DAY, cache_files=['/etc/passwd'],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_users_sudo', 'os_users_sudo.txt',
+                 'cat /etc/group | grep -i sudo | awk -F":" \'{print $NF}\'', timeout=30,
+                 cache_ttl=DAY, cache_files=['/etc/group'],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_users_wheel', 'os_users_wheel.txt',
+                 'cat /etc/group | grep -i wheel | awk -F":" \'{print $NF}\'', timeout=30,
+                 cache_ttl=DAY, cache_files=['/etc/group'],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_ssh_port', 'os_ssh_port.txt',
+                 'grep "Port " /etc/ssh/sshd_config | awk \'{print $NF}\'', timeout=10,
+                 cache_ttl=DAY, cache_files=[SSHD_CONFIG],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_users_ssh', 'os_users_ssh.txt',
+                 'cat /etc/ssh/sshd_config | grep -i allowusers | cut -d\' \' -f2-', timeout=10,
+                 cache_ttl=DAY, cache_files=[SSHD_CONFIG],
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_ssl_version', 'os_ssl_version.txt', 'openssl version', timeout=10,
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+register_command('os_ssh_version', 'os_ssh_version.txt', 'ssh -V 2>&1', timeout=10,
+                 condition=lambda options: get_option(options, 'os_source') == 'tools')
+
+# ----------------------------------------------------------------------
+# PACKAGES
+
+@register_function('packages', 'packages.json', timeout=120,
+                   cache_ttl=DAY, cache_files=[DPKG_STATUS] + RPMDB,
+                   condition=lambda options: get_option(options, 'packages_source') == 'native',
+                   fallback=lambda options: ['packages_{}'.format(find_package_manager())]
+                                            if find_package_manager() else [])
+def collect_packages(options):
+    import packages
+    return packages.collect_packages()
+
+register_command('packages_apt', 'packages_apt.txt', 'apt --installed list', timeout=300,
+                 cache_ttl=DAY, cache_files=[DPKG_STATUS],
+                 condition=lambda options: (get_option(options, 'packages_source') == 'tools' and
+                                            find_package_manager() == 'apt'))
+register_command('packages_yum', 'packages_yum.txt', 'yum list installed', timeout=300,
+                 cache_ttl=DAY, cache_files=RPMDB,
+                 condition=lambda options: (get_option(options, 'packages_source') == 'tools' and
+                                            find_package_manager() == 'yum'))
+
+# ----------------------------------------------------------------------
+# NETWORK
+
+@register_function('containers', 'containers.json', timeout=60,
+                   condition=lambda options: (get_option(options, 'containers_source') == 'native' and
+                                              find_container_sockets()),
+                   fallback=lambda options: ['docker'] if shutil.which('docker') else [])
+def collect_containers(options):
+    import containers
+    return containers.collect_containers()
+
+register_command('docker', 'docker.json',
+                 'docker ps > /dev/null && '
+                 'docker ps --no-trunc --format \'{{json .}}\' | jq -s \'.\' | sed \'s/\\\\\\"//g\' | jq \'.\'',
+                 timeout=60, discard_on_error=True,
+                 condition=lambda options: (get_option(options, 'containers_source') == 'tools' and
+                                            shutil.which('docker')))
+
+@register_function('listen_ports', 'listen_ports.json', timeout=60,
+                   condition=lambda options: get_option(options, 'net_source') == 'native',
+                   fallback=['netstat'])
+def collect_listen_ports(options):
+    import network
+    return network.collect_listen_ports()
+
+register_command('netstat', 'netstat.txt', 'netstat -tulpen | grep -e \'tcp\' -e \'udp\'', timeout=60,
+                 condition=lambda options: get_option(options, 'net_source') == 'tools')
+
+@register_function('network', 'network.json', timeout=60,
+                   condition=lambda options: get_option(options, 'net_source') == 'native',
+                   fallback=['ip_link', 'ip_addr', 'ip_route'])
+def collect_network(options):
+    import network
+    return network.collect_network(get_option(options, 'routes_output'))
+
+@register_function('netns', 'netns.json', timeout=60,
+                   condition=lambda options: (get_option(options, 'netns_workers') > 0 and
+                                              get_option(options, 'net_source') == 'native'))
+def collect_netns(options):
+    import netns
+    # Finish a little before the collector timeout, with the namespaces
+    # done so far.
+    deadline = get_option(options, 'deadline')
+    deadline -= min(5, (deadline - time.time()) / 10)
+    return netns.collect_namespaces(get_option(options, 'routes_output'),
+                                    workers=get_option(options, 'netns_workers'), deadline=deadline)
+
+register_command('ip_link', 'ip_link.txt', 'ip link', timeout=30,
+                 condition=lambda options: get_option(options, 'net_source') == 'tools')
+register_command('ip_addr', 'ip_addr.txt', 'ip addr', timeout=30,
+                 condition=lambda options: get_option(options, 'net_source') == 'tools')
+register_command('ip_route', 'network_routes_all.txt',
+                 'ip route | sed -e \'s/scope link //g\' -e \'s/proto //g\' -e \'s/ linkdown//g\' '
+                 '-e \'s/ kernel//g\' -e \'s/ static//g\'', timeout=60,
+                 condition=lambda options: get_option(options, 'net_source') == 'tools')
+
+# ----------------------------------------------------------------------
+# HARDWARE
+
+@register_function('hardware', 'hardware.json', timeout=60, cache_ttl=DAY,
+                   condition=lambda options: get_option(options, 'hw_source') == 'sysfs',
+                   fallback=['lshw'])
+def collect_hardware(options):
+    import hardware
+    return hardware.collect_hardware()
+
+register_command('lshw', 'lshw.json',
+                 'dmesg -n 1; lshw -json; rc=$?; dmesg -n 4; exit $rc', timeout=300, cache_ttl=DAY,
+                 condition=lambda options: get_option(options, 'hw_source') == 'lshw')
+@register_function('volumes', 'volumes.json', timeout=60,
+                   condition=lambda options: get_option(options, 'volumes_source') == 'native',
+                   fallback=['lsblk'])
+def collect_volumes(options):
+    import volumes
+    return volumes.collect_volumes()
+
+register_command('lsblk', 'volumes.txt',
+                 'lsblk -a -P -p -o NAME,FSTYPE,MOUNTPOINT,SIZE,TYPE | grep -iv loop | sed \'s/\\"//g\'',
+                 timeout=60,
+                 condition=lambda options: get_option(options, 'volumes_source') == 'tools')
+
+@register_function('smart', 'smart.json', timeout=300,
+                   condition=lambda options: (get_option(options, 'smart_workers') > 0 and
+                                              shutil.which('smartctl')))
+def collect_smart(options):
+    import smart
+    # Finish a little before the collector timeout, with the devices done
+    # so far.
+    deadline = get_option(options, 'deadline')
+    deadline -= min(10, (deadline - time.time()) / 10)
+    return smart.collect_smart(workers=get_option(options, 'smart_workers'),
+                               timeout=get_option(options, 'smart_timeout'), deadline=deadline)
+
+register_command('megacli_controllers', 'megacli-controllers.txt',
+                 '{} -AdpAllInfo -aALL -NoLog | grep -i -e "Product Name" -e "Serial No"'.format(MEGACLI),
+                 timeout=120, cache_ttl=DAY,
+                 condition=lambda options: find_raid_tool()[0] == 'megacli')
+register_command('megacli_disks', 'megacli-disks.txt',
+                 '{} -PDList -aAll -NoLog | grep -i -e "wwn" -e "inquiry" -e "Raw Size"'.format(MEGACLI),
+                 timeout=120, cache_ttl=DAY,
+                 condition=lambda options: find_raid_tool()[0] == 'megacli')
+register_command('storcli_controllers', 'storcli-controllers.txt',
+                 lambda options: '{} /call show all nolog | grep -i -e "model = " -e "serial number = " '
+                                 '-e "pci address" | grep -iv support | sed \'s/ = /=/g\''.format(find_raid_tool()[1]),
+                 timeout=120, cache_ttl=DAY,
+                 condition=lambda options: find_raid_tool()[0] == 'storcli')
+register_command('storcli_disks', 'storcli-disks.json',
+                 lambda options: '{} /call /eall /sall show all J nolog'.format(find_raid_tool()[1]),
+                 timeout=120, discard_on_error=True, cache_ttl=DAY,
+                 condition=lambda options: find_raid_tool()[0] == 'storcli')
+
+# ----------------------------------------------------------------------
+
+def main():
+    run_collectors()
+
+if __name__ == '__main__':
+    main()
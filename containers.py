@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - containers
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Running containers are read from the Docker Engine API (or the podman
+# compatible API) over its unix socket, instead of parsing `docker ps` text.
+# Every socket is asked once for all containers with their port bindings.
+
+import os
+import json
+import socket
+import http.client
+
+CONTAINER_SOCKETS = [
+    ('docker', '/var/run/docker.sock'),
+    ('podman', '/run/podman/podman.sock'),
+]
+
+API_TIMEOUT = 30
+
+# ----------------------------------------------------------------------
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+
+    def __init__(self, path, timeout=API_TIMEOUT):
+        http.client.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+        self.path = path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+# ----------------------------------------------------------------------
+
+class EngineClient(object):
+
+    # One keep-alive connection per socket, reused by every request.
+
+    def __init__(self, path, timeout=API_TIMEOUT):
+        self.connection = UnixHTTPConnection(path, timeout)
+
+    def get(self, url):
+        self.connection.request('GET', url, headers={'Host': 'localhost', 'Accept': 'application/json'})
+        response = self.connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise IOError('GET {} returned {} {}'.format(url, response.status, response.reason))
+        return json.loads(body.decode('UTF-8'))
+
+    def close(self):
+        self.connection.close()
+
+# ----------------------------------------------------------------------
+
+def find_container_sockets():
+    candidates = list(CONTAINER_SOCKETS)
+    docker_host = os.environ.get('DOCKER_HOST', '')
+    if docker_host.startswith('unix://'):
+        candidates.insert(0, ('docker', docker_host[len('unix://'):]))
+    sockets = []
+    for runtime, path in candidates:
+        if os.path.exists(path) and path not in [s[1] for s in sockets]:
+            sockets.append((runtime, path))
+    return sockets
+
+# ----------------------------------------------------------------------
+
+def format_port(port):
+    # Same notation as the Ports column of `docker ps`.
+    if port['public_port']:
+        return '{}:{}->{}/{}'.format(port['ip'] or '0.0.0.0', port['public_port'],
+                                     port['private_port'], port['proto'])
+    return '{}/{}'.format(port['private_port'], port['proto'])
+
+# ----------------------------------------------------------------------
+
+def container_record(runtime, container):
+    ports = []
+    for port in container.get('Ports') or []:
+        if 'PrivatePort' not in port:
+            continue
+        ports.append({'ip': port.get('IP'), 'public_port': port.get('PublicPort'),
+                      'private_port': port['PrivatePort'], 'proto': port.get('Type', 'tcp')})
+    ports.sort(key=lambda p: (p['private_port'], p['proto'], p['public_port'] or 0, ':' in (p['ip'] or '')))
+    return {
+        'runtime': runtime,
+        'id': container['Id'],
+        'name': ','.join(name.lstrip('/') for name in container.get('Names') or []),
+        'image': container.get('Image'),
+        'ports': ports,
+    }
+
+# ----------------------------------------------------------------------
+
+def collect_containers(sockets=None):
+    if sockets is None:
+        sockets = find_container_sockets()
+    if len(sockets) == 0:
+        raise IOError('no container engine socket found')
+
+    containers = []
+    for runtime, path in sockets:
+        client = EngineClient(path)
+        try:
+            for container in client.get('/containers/json'):
+                containers.append(container_record(runtime, container))
+        finally:
+            client.close()
+    return {'containers': containers}
+
+# ----------------------------------------------------------------------
+
+def listen_port_id(port):
+    # The network_listen_ports key a published port is listening on.
+    ip = port['ip'] or '0.0.0.0'
+    proto = port['proto'] + '6' if ':' in ip else port['proto']
+    return 'port {}/{} on {}'.format(proto, port['public_port'], ip)
+
+# ----------------------------------------------------------------------
+
+def containers_to_inventory(containers, inventory):
+    listen_ports = inventory['network_listen_ports']
+    by_id = {}
+    for container in containers['containers']:
+        temp_container = {}
+        temp_container['name'] = container['name']
+        temp_container['id'] = container['id']
+        temp_container['image'] = container['image']
+        temp_container['runtime'] = container['runtime']
+        temp_container['ports'] = [format_port(port) for port in container['ports']]
+        inventory['docker_containers'].append(temp_container)
+        by_id[container['id']] = temp_container
+
+        for port in container['ports']:
+            if not port['public_port']:
+                continue
+            id = listen_port_id(port)
+            if id in listen_ports:
+                set_listen_container(listen_ports[id], temp_container)
+
+    # Sockets attributed to a container through their cgroup are joined
+    # by container ID, which also covers ports that are not published.
+    for listen_port in listen_ports.values():
+        container = by_id.get(listen_port.get('listen_container_id'))
+        if container is not None and 'listen_container_name' not in listen_port:
+            set_listen_container(listen_port, container)
+
+# ----------------------------------------------------------------------
+
+def set_listen_container(listen_port, container):
+    listen_port['listen_container_name'] = container['name']
+    listen_port['listen_container_image'] = container['image']
+    listen_port['listen_container_id'] = container['id']
@@ -0,0 +1,549 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - fleet
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Fleet store: the results of many hosts in one SQLite database, so questions
+# like "which hosts listen on port X", "where is disk serial Y" or "which hosts
+# have openssl older than Z" are answered from an index instead of a scan of
+# every result.json.
+#
+# Results are decoded on a pool of processes, one per core, which turn each of
+# them into rows. The database is written by this process only, in batches of
+# hosts per transaction. A host is identified by its hostname. The digest of
+# every section is kept, so when a host is ingested again only the sections
+# that have changed are replaced, and a result that is not changed at all is
+# skipped. A section missing from a result, e.g. from a run with --only, keeps
+# the rows ingested before. The digest of every file is kept as well, a file
+# that has not changed since it was ingested is not decoded again.
+#
+# Results are read as JSON (indented or compact) and NDJSON, plain or gzip or
+# zstd compressed. A JSON file may also hold one result per line, like the
+# spool files and batches of push.py. MessagePack and CBOR results are not
+# read, and the <result>.patch.json change sets are skipped.
+#
+#   fleet.py ingest fleet.db /srv/results
+#   fleet.py query fleet.db --port 443
+#   fleet.py query fleet.db --package openssl --below 3.0.7
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import multiprocessing
+
+import incremental
+
+DEFAULT_BATCH_SIZE = 200
+SCHEMA_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS hosts (
+    id INTEGER PRIMARY KEY,
+    hostname TEXT NOT NULL UNIQUE,
+    digest TEXT,
+    source TEXT,
+    ingested REAL,
+    date_of_inventory TEXT,
+    script_version TEXT,
+    os_version TEXT,
+    os_core TEXT,
+    os_ssl_version TEXT,
+    os_ssh_version TEXT,
+    is_vm INTEGER,
+    system_vendor TEXT,
+    system_platform TEXT,
+    system_serial TEXT,
+    cpu_model TEXT,
+    cpu_count INTEGER,
+    memory_size_in_gb REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    digest TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sections (
+    host_id INTEGER NOT NULL,
+    section TEXT NOT NULL,
+    digest TEXT,
+    PRIMARY KEY (host_id, section)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS disks (
+    host_id INTEGER NOT NULL,
+    model TEXT,
+    serial TEXT,
+    wwn TEXT,
+    size_in_gb REAL,
+    fw_version TEXT,
+    logicalname TEXT
+);
+CREATE TABLE IF NOT EXISTS memory_modules (
+    host_id INTEGER NOT NULL,
+    slot TEXT,
+    vendor TEXT,
+    model TEXT,
+    serial TEXT,
+    size_in_gb REAL,
+    frequency_in_mhz INTEGER
+);
+CREATE TABLE IF NOT EXISTS interfaces (
+    host_id INTEGER NOT NULL,
+    name TEXT,
+    mac TEXT,
+    master TEXT
+);
+CREATE TABLE IF NOT EXISTS addresses (
+    host_id INTEGER NOT NULL,
+    interface TEXT,
+    ip TEXT,
+    prefix INTEGER
+);
+CREATE TABLE IF NOT EXISTS listen_ports (
+    host_id INTEGER NOT NULL,
+    proto TEXT,
+    ip TEXT,
+    port INTEGER,
+    program TEXT,
+    container TEXT
+);
+CREATE TABLE IF NOT EXISTS packages (
+    host_id INTEGER NOT NULL,
+    id TEXT,
+    name TEXT,
+    version TEXT
+);
+CREATE TABLE IF NOT EXISTS containers (
+    host_id INTEGER NOT NULL,
+    name TEXT,
+    container_id TEXT,
+    image TEXT
+);
+CREATE INDEX IF NOT EXISTS hosts_system_serial ON hosts (system_serial);
+CREATE INDEX IF NOT EXISTS disks_host ON disks (host_id);
+CREATE INDEX IF NOT EXISTS disks_serial ON disks (serial);
+CREATE INDEX IF NOT EXISTS disks_wwn ON disks (wwn);
+CREATE INDEX IF NOT EXISTS memory_modules_host ON memory_modules (host_id);
+CREATE INDEX IF NOT EXISTS memory_modules_serial ON memory_modules (serial);
+CREATE INDEX IF NOT EXISTS interfaces_host ON interfaces (host_id);
+CREATE INDEX IF NOT EXISTS interfaces_mac ON interfaces (mac);
+CREATE INDEX IF NOT EXISTS addresses_host ON addresses (host_id);
+CREATE INDEX IF NOT EXISTS addresses_ip ON addresses (ip);
+CREATE INDEX IF NOT EXISTS listen_ports_host ON listen_ports (host_id);
+CREATE INDEX IF NOT EXISTS listen_ports_port ON listen_ports (port);
+CREATE INDEX IF NOT EXISTS packages_host ON packages (host_id);
+CREATE INDEX IF NOT EXISTS packages_name ON packages (name, version);
+CREATE INDEX IF NOT EXISTS containers_host ON containers (host_id);
+CREATE INDEX IF NOT EXISTS containers_image ON containers (image);
+'''
+
+# Host columns filled from the result keys of the same name.
+HOST_COLUMNS = ['date_of_inventory', 'script_version', 'os_version', 'os_core', 'os_ssl_version', 'os_ssh_version',
+                'is_vm', 'system_vendor', 'system_platform', 'system_serial', 'cpu_model', 'cpu_count',
+                'memory_size_in_gb']
+
+# Table -> columns after host_id.
+TABLES = {
+    'disks': ['model', 'serial', 'wwn', 'size_in_gb', 'fw_version', 'logicalname'],
+    'memory_modules': ['slot', 'vendor', 'model', 'serial', 'size_in_gb', 'frequency_in_mhz'],
+    'interfaces': ['name', 'mac', 'master'],
+    'addresses': ['interface', 'ip', 'prefix'],
+    'listen_ports': ['proto', 'ip', 'port', 'program', 'container'],
+    'packages': ['id', 'name', 'version'],
+    'containers': ['name', 'container_id', 'image'],
+}
+
+RESULT_SUFFIXES = ['.json', '.ndjson']
+COMPRESSION_SUFFIXES = ['', '.gz', '.zst']
+# Files in a results tree that are not results.
+SKIPPED_SUFFIXES = ['.patch.json']
+SKIPPED_NAMES = ['state.json']
+
+# rpm package ids are name.arch, the name alone is what is looked up.
+RPM_ARCHES = ['x86_64', 'noarch', 'i686', 'i386', 'aarch64', 'ppc64le', 'ppc64', 's390x', 'armv7hl']
+
+# ----------------------------------------------------------------------
+
+def disk_rows(disks):
+    return [(disk.get('model'), disk.get('serial'), disk.get('wwn'), disk.get('size_in_gb'),
+             disk.get('fw_version'), disk.get('logicalname')) for disk in disks or []]
+
+# ----------------------------------------------------------------------
+
+def memory_rows(modules):
+    return [(module.get('slot'), module.get('vendor'), module.get('model'), module.get('serial'),
+             module.get('size_in_gb'), module.get('frequency_in_mhz')) for module in modules or []]
+
+# ----------------------------------------------------------------------
+
+def interface_rows(interfaces):
+    # Returns the rows of interfaces and of addresses.
+    temp_interfaces = []
+    temp_addresses = []
+    for name, interface in sorted((interfaces or {}).items()):
+        mac = interface.get('mac')
+        temp_interfaces.append((name, mac.lower() if mac else mac, interface.get('master')))
+        for address in interface.get('ips') or []:
+            ip, _, prefix = address.partition('/')
+            temp_addresses.append((name, ip, int(prefix) if prefix.isdigit() else None))
+    return temp_interfaces, temp_addresses
+
+# ----------------------------------------------------------------------
+
+def listen_port_rows(ports):
+    rows = []
+    for port in (ports or {}).values():
+        number = port.get('listen_port')
+        rows.append((port.get('listen_proto'), port.get('listen_ip'),
+                     int(number) if str(number).isdigit() else None,
+                     port.get('listen_pid_program'), port.get('listen_container_name')))
+    return rows
+
+# ----------------------------------------------------------------------
+
+def package_name(id):
+    name, _, arch = id.rpartition('.')
+    if name and arch in RPM_ARCHES:
+        return name
+    return id
+
+# ----------------------------------------------------------------------
+
+def package_rows(packages):
+    return [(id, package_name(id), version) for id, version in (packages or {}).items()]
+
+# ----------------------------------------------------------------------
+
+def container_rows(containers):
+    return [(container.get('name'), container.get('id'), container.get('image')) for container in containers or []]
+
+# ----------------------------------------------------------------------
+
+# Result key -> function returning {table: rows}.
+SECTIONS = {
+    'disks': lambda value: {'disks': disk_rows(value)},
+    'memory_modules': lambda value: {'memory_modules': memory_rows(value)},
+    'network_interfaces': lambda value: dict(zip(['interfaces', 'addresses'], interface_rows(value))),
+    'network_listen_ports': lambda value: {'listen_ports': listen_port_rows(value)},
+    'packages_version': lambda value: {'packages': package_rows(value)},
+    'docker_containers': lambda value: {'containers': container_rows(value)},
+}
+
+# ----------------------------------------------------------------------
+
+def connect(filename):
+    db = sqlite3.connect(filename)
+    # WAL lets queries run while an ingest is writing.
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    version = db.execute('PRAGMA user_version').fetchone()[0]
+    if version not in (0, SCHEMA_VERSION):
+        raise ValueError('{}: schema version {}, expected {}'.format(filename, version, SCHEMA_VERSION))
+    db.executescript(SCHEMA)
+    db.execute('PRAGMA user_version={}'.format(SCHEMA_VERSION))
+    return db
+
+# ----------------------------------------------------------------------
+
+def is_result(name):
+    if name in SKIPPED_NAMES or name.endswith(tuple(SKIPPED_SUFFIXES)):
+        return False
+    return name.endswith(tuple(suffix + compression for suffix in RESULT_SUFFIXES
+                               for compression in COMPRESSION_SUFFIXES))
+
+# ----------------------------------------------------------------------
+
+def find_results(paths):
+    results = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                results.extend(os.path.join(directory, name) for name in sorted(names) if is_result(name))
+        else:
+            results.append(path)
+    return results
+
+# ----------------------------------------------------------------------
+
+def decompress(path, data):
+    if path.endswith('.gz'):
+        import gzip
+        # Concatenated members, like a push batch, come out as one stream.
+        return gzip.decompress(data), path[:-len('.gz')]
+    if path.endswith('.zst'):
+        # compression.zstd is in the standard library since Python 3.14.
+        try:
+            from compression import zstd
+            return zstd.decompress(data), path[:-len('.zst')]
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('reading zstd results needs Python 3.14 or the zstandard module')
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data), path[:-len('.zst')]
+    return data, path
+
+# ----------------------------------------------------------------------
+
+def decode_inventories(path, data):
+    # Returns the results in the file.
+    data, path = decompress(path, data)
+    text = data.decode('UTF-8')
+    if path.endswith('.ndjson'):
+        # One {"<section>": value} object per line.
+        inventory = {}
+        for line in text.splitlines():
+            if line.strip():
+                inventory.update(json.loads(line))
+        return [inventory]
+    try:
+        return [json.loads(text)]
+    except ValueError:
+        # One result per line.
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+# ----------------------------------------------------------------------
+
+def host_rows(inventory):
+    temp_sections = {}
+    for key, rows in SECTIONS.items():
+        if key in inventory:
+            temp_sections[key] = (incremental.digest(inventory[key]), rows(inventory[key]))
+    columns = [inventory.get(column) for column in HOST_COLUMNS]
+    columns[HOST_COLUMNS.index('is_vm')] = None if inventory.get('is_vm') is None else int(bool(inventory['is_vm']))
+    # The digest of a result covers what is stored of it, the host columns
+    # and the section digests.
+    result_digest = incremental.digest([columns, sorted((key, value[0]) for key, value in temp_sections.items())])
+    return {'hostname': inventory['os_hostname'], 'digest': result_digest, 'columns': columns,
+            'sections': temp_sections}
+
+# ----------------------------------------------------------------------
+
+def decode_result(task):
+    # Runs in a pool process. Returns (path, file digest, hosts, error), a
+    # host is {'hostname', 'digest', 'columns', 'sections': {key: (digest, {table: rows})}}.
+    # hosts is None when the file is the one ingested before from this path.
+    path, stored_digest = task
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        file_digest = hashlib.sha256(data).hexdigest()[:16]
+        if file_digest == stored_digest:
+            return path, file_digest, None, None
+        inventories = decode_inventories(path, data)
+        del data
+        if not all(isinstance(inventory, dict) and inventory.get('os_hostname') for inventory in inventories):
+            return path, file_digest, None, 'no os_hostname'
+        return path, file_digest, [host_rows(inventory) for inventory in inventories], None
+    except Exception as e:
+        return path, None, None, '{}: {}'.format(type(e).__name__, e)
+
+# ----------------------------------------------------------------------
+
+def store_host(db, host, source):
+    # Returns True when anything has changed.
+    row = db.execute('SELECT id, digest FROM hosts WHERE hostname = ?', (host['hostname'],)).fetchone()
+    if row is not None and row[1] == host['digest']:
+        return False
+    columns = ['hostname', 'digest', 'source', 'ingested'] + HOST_COLUMNS
+    values = [host['hostname'], host['digest'], source, time.time()] + host['columns']
+    if row is None:
+        host_id = db.execute('INSERT INTO hosts ({}) VALUES ({})'.format(
+            ', '.join(columns), ', '.join('?' * len(columns))), values).lastrowid
+        stored = {}
+    else:
+        host_id = row[0]
+        db.execute('UPDATE hosts SET {} WHERE id = ?'.format(', '.join(column + ' = ?' for column in columns)),
+                   values + [host_id])
+        stored = dict(db.execute('SELECT section, digest FROM sections WHERE host_id = ?', (host_id,)))
+    for key, (section_digest, tables) in host['sections'].items():
+        if stored.get(key) == section_digest:
+            continue
+        for table, rows in tables.items():
+            if key in stored:
+                db.execute('DELETE FROM {} WHERE host_id = ?'.format(table), (host_id,))
+            db.executemany('INSERT INTO {} (host_id, {}) VALUES (?, {})'.format(
+                table, ', '.join(TABLES[table]), ', '.join('?' * len(TABLES[table]))),
+                [(host_id,) + row for row in rows])
+        db.execute('INSERT OR REPLACE INTO sections (host_id, section, digest) VALUES (?, ?, ?)',
+                   (host_id, key, section_digest))
+    return True
+
+# ----------------------------------------------------------------------
+
+def ingest(filename, paths, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    # Returns (stored, unchanged, failed), unchanged are results and files
+    # that were not decoded again.
+    results = find_results(paths)
+    db = connect(filename)
+    stored = 0
+    unchanged = 0
+    failed = 0
+    pending = 0
+    start = time.time()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(results) or 1))
+    try:
+        # A result file ingested before is only hashed, not decoded.
+        files = dict(db.execute('SELECT path, digest FROM files'))
+        tasks = [(path, files.get(path)) for path in results]
+        with multiprocessing.Pool(workers) as pool:
+            # In order, so of two results of the same host the later one
+            # given is the one kept, in one file as well as in several.
+            for path, file_digest, hosts, error in pool.imap(decode_result, tasks, chunksize=4):
+                if error is not None:
+                    failed += 1
+                    sys.stderr.write('ingest {}: {}\n'.format(path, error))
+                    continue
+                if hosts is None:
+                    unchanged += 1
+                    continue
+                db.execute('INSERT OR REPLACE INTO files (path, digest) VALUES (?, ?)', (path, file_digest))
+                for host in hosts:
+                    if store_host(db, host, path):
+                        stored += 1
+                    else:
+                        unchanged += 1
+                    pending += 1
+                if pending >= batch_size:
+                    db.commit()
+                    pending = 0
+        db.commit()
+        db.execute('PRAGMA optimize')
+    finally:
+        db.close()
+    sys.stderr.write('ingested {} files, {} results stored, {} unchanged, {} files failed, '
+                     'in {:.1f}s on {} processes\n'.format(len(results), stored, unchanged, failed,
+                                                           time.time() - start, workers))
+    return stored, unchanged, failed
+
+# ----------------------------------------------------------------------
+
+def version_key(version):
+    # Numbers compare as numbers, '1.10' is newer than '1.9'.
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in re.findall(r'\d+|[A-Za-z]+', version or '')]
+
+# ----------------------------------------------------------------------
+
+def query(db, sql, parameters):
+    cursor = db.execute(sql, parameters)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+# ----------------------------------------------------------------------
+
+def hosts_by_ip(db, ip):
+    return query(db, 'SELECT h.hostname, a.interface, a.ip, a.prefix FROM addresses a '
+                     'JOIN hosts h ON h.id = a.host_id WHERE a.ip = ? ORDER BY h.hostname', (ip,))
+
+# ----------------------------------------------------------------------
+
+def hosts_by_mac(db, mac):
+    return query(db, 'SELECT h.hostname, i.name AS interface, i.mac, i.master FROM interfaces i '
+                     'JOIN hosts h ON h.id = i.host_id WHERE i.mac = ? ORDER BY h.hostname', (mac.lower(),))
+
+# ----------------------------------------------------------------------
+
+def hosts_by_serial(db, serial):
+    # Disks, memory modules and systems, disks by their WWN as well.
+    return query(db, 'SELECT h.hostname, \'disk\' AS kind, d.model, d.logicalname AS location FROM disks d '
+                     'JOIN hosts h ON h.id = d.host_id WHERE d.serial = ?1 OR d.wwn = ?1 '
+                     'UNION ALL SELECT h.hostname, \'memory_module\', m.model, m.slot FROM memory_modules m '
+                     'JOIN hosts h ON h.id = m.host_id WHERE m.serial = ?1 '
+                     'UNION ALL SELECT hostname, \'system\', system_platform, NULL FROM hosts '
+                     'WHERE system_serial = ?1 ORDER BY 1', (serial,))
+
+# ----------------------------------------------------------------------
+
+def hosts_by_port(db, port, proto=None):
+    sql = ('SELECT h.hostname, p.proto, p.ip, p.port, p.program, p.container FROM listen_ports p '
+           'JOIN hosts h ON h.id = p.host_id WHERE p.port = ?')
+    parameters = [port]
+    if proto is not None:
+        sql += ' AND p.proto IN (?, ?)'
+        parameters.extend([proto, proto + '6'])
+    return query(db, sql + ' ORDER BY h.hostname', parameters)
+
+# ----------------------------------------------------------------------
+
+def hosts_by_package(db, name, below=None):
+    # The name alone or the package id, name.arch on rpm systems. Versions
+    # are compared here, SQLite would compare them as text.
+    sql = ('SELECT h.hostname, p.id AS package, p.version FROM packages p '
+           'JOIN hosts h ON h.id = p.host_id WHERE p.name = ?')
+    parameters = [package_name(name)]
+    if parameters[0] != name:
+        sql += ' AND p.id = ?'
+        parameters.append(name)
+    rows = query(db, sql + ' ORDER BY h.hostname', parameters)
+    if below is not None:
+        limit = version_key(below)
+        rows = [row for row in rows if version_key(row['version']) < limit]
+    return rows
+
+# ----------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description='Linux Inventory Tool fleet store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = commands.add_parser('ingest', help='store results in the database')
+    ingest_parser.add_argument('database')
+    ingest_parser.add_argument('paths', nargs='+', metavar='path',
+                               help='result file or directory of results')
+    ingest_parser.add_argument('--workers', type=int, default=None,
+                               help='decoding processes, one per core by default')
+    ingest_parser.add_argument('--batch', type=int, default=DEFAULT_BATCH_SIZE,
+                               help='hosts per transaction')
+    query_parser = commands.add_parser('query', help='find hosts')
+    query_parser.add_argument('database')
+    lookup = query_parser.add_mutually_exclusive_group(required=True)
+    lookup.add_argument('--ip', help='hosts with this address')
+    lookup.add_argument('--mac', help='hosts with this MAC address')
+    lookup.add_argument('--serial', help='hosts with a disk, memory module or system of this serial or WWN')
+    lookup.add_argument('--port', type=int, help='hosts listening on this port')
+    lookup.add_argument('--package', help='hosts with this package')
+    query_parser.add_argument('--proto', choices=['tcp', 'udp'], default=None,
+                              help='with --port, only this protocol')
+    query_parser.add_argument('--below', default=None,
+                              help='with --package, only versions older than this')
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        stored, unchanged, failed = ingest(args.database, args.paths, args.workers, max(1, args.batch))
+        if failed > 0:
+            sys.exit(1)
+        return
+
+    if not os.path.exists(args.database):
+        parser.error('{} does not exist'.format(args.database))
+    db = connect(args.database)
+    try:
+        if args.ip is not None:
+            rows = hosts_by_ip(db, args.ip)
+        elif args.mac is not None:
+            rows = hosts_by_mac(db, args.mac)
+        elif args.serial is not None:
+            rows = hosts_by_serial(db, args.serial)
+        elif args.port is not None:
+            rows = hosts_by_port(db, args.port, args.proto)
+        else:
+            rows = hosts_by_package(db, args.package, args.below)
+    finally:
+        db.close()
+    for row in rows:
+        print(json.dumps(row, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
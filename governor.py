@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - governor
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Keeps the inventory out of the way of the services on a busy host. The CPU
+# and I/O priority are lowered before any collector starts, so every worker
+# thread and every command inherits them. A cgroup can cap the CPU time and the
+# memory of the whole run, commands included. The deadline of the whole run is
+# enforced by run_collectors().
+
+import os
+import sys
+import ctypes
+import platform
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+CGROUP_NAME = 'inventory2'
+CPU_PERIOD = 100000
+
+# ioprio_set(2) has no wrapper in the C library or in Python.
+IOPRIO_SET = {
+    'x86_64': 251,
+    'i686': 289,
+    'i386': 289,
+    'aarch64': 30,
+    'armv7l': 314,
+    'ppc64le': 273,
+    'ppc64': 273,
+    's390x': 282,
+}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_CLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+
+# ----------------------------------------------------------------------
+
+def warn(message):
+    sys.stderr.write('governor: {}\n'.format(message))
+
+# ----------------------------------------------------------------------
+
+def set_nice(nice):
+    # Only ever lowers the priority, an unprivileged process could not
+    # raise it again.
+    if nice is not None and nice > os.getpriority(os.PRIO_PROCESS, 0):
+        os.setpriority(os.PRIO_PROCESS, 0, nice)
+
+# ----------------------------------------------------------------------
+
+def set_ionice(ionice_class, level=7):
+    if ionice_class is None:
+        return
+    number = IOPRIO_SET.get(platform.machine())
+    if number is None:
+        warn('ionice is not supported on {}'.format(platform.machine()))
+        return
+    # The idle class has no levels.
+    if ionice_class == 'idle':
+        level = 0
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.syscall(number, IOPRIO_WHO_PROCESS, 0, IOPRIO_CLASSES[ionice_class] << IOPRIO_CLASS_SHIFT | level) < 0:
+        warn('ionice {}: {}'.format(ionice_class, os.strerror(ctypes.get_errno())))
+
+# ----------------------------------------------------------------------
+
+def write_file(filename, value):
+    with open(filename, 'w') as f:
+        f.write(value)
+
+# ----------------------------------------------------------------------
+
+def current_cgroup(controller=None):
+    # The cgroup path of this process, in the v1 hierarchy of controller
+    # or in the v2 hierarchy when controller is None.
+    try:
+        with open('/proc/self/cgroup') as f:
+            for line in f:
+                id, controllers, path = line.rstrip('\n').split(':', 2)
+                if (controller is None and id == '0') or controller in controllers.split(','):
+                    return path
+    except (IOError, OSError):
+        pass
+    return '/'
+
+# ----------------------------------------------------------------------
+
+class Cgroup(object):
+
+    # A cgroup for this process and everything it starts. cgroup v2 is used
+    # where it is mounted, otherwise the cpu and memory hierarchies of v1.
+
+    def __init__(self, cpu_percent=None, memory_mb=None, root=CGROUP_ROOT, name=CGROUP_NAME):
+        self.cpu_percent = cpu_percent
+        self.memory_mb = memory_mb
+        self.root = root
+        self.name = name
+        # (directory of the created group, cgroup.procs of the group the
+        # process came from)
+        self.groups = []
+
+    def enter(self):
+        if self.cpu_percent is None and self.memory_mb is None:
+            return False
+        try:
+            if os.path.exists(os.path.join(self.root, 'cgroup.controllers')):
+                self.enter_v2()
+            else:
+                self.enter_v1()
+        except (IOError, OSError) as e:
+            warn('cgroup limits are not applied: {}'.format(e))
+            self.leave()
+            return False
+        return True
+
+    def enter_v2(self):
+        path = os.path.join(self.root, self.name)
+        controllers = []
+        if self.cpu_percent is not None:
+            controllers.append('cpu')
+        if self.memory_mb is not None:
+            controllers.append('memory')
+        with open(os.path.join(self.root, 'cgroup.subtree_control')) as f:
+            enabled = f.read().split()
+        missing = [controller for controller in controllers if controller not in enabled]
+        if len(missing) > 0:
+            write_file(os.path.join(self.root, 'cgroup.subtree_control'),
+                       ' '.join('+' + controller for controller in missing))
+        if not os.path.isdir(path):
+            os.mkdir(path)
+        self.groups.append((path, os.path.join(self.root + current_cgroup(), 'cgroup.procs')))
+        if self.cpu_percent is not None:
+            write_file(os.path.join(path, 'cpu.max'), '{} {}'.format(
+                int(CPU_PERIOD * self.cpu_percent / 100), CPU_PERIOD))
+        if self.memory_mb is not None:
+            write_file(os.path.join(path, 'memory.max'), str(self.memory_mb * 2 ** 20))
+        write_file(os.path.join(path, 'cgroup.procs'), str(os.getpid()))
+
+    def enter_v1(self):
+        limits = []
+        if self.cpu_percent is not None:
+            limits.append(('cpu', 'cpu.cfs_period_us', str(CPU_PERIOD)))
+            limits.append(('cpu', 'cpu.cfs_quota_us', str(int(CPU_PERIOD * self.cpu_percent / 100))))
+        if self.memory_mb is not None:
+            limits.append(('memory', 'memory.limit_in_bytes', str(self.memory_mb * 2 ** 20)))
+        for hierarchy in sorted(set(limit[0] for limit in limits)):
+            path = os.path.join(self.root, hierarchy, self.name)
+            if not os.path.isdir(path):
+                os.mkdir(path)
+            parent = os.path.join(self.root, hierarchy) + current_cgroup(hierarchy)
+            self.groups.append((path, os.path.join(parent, 'cgroup.procs')))
+            for limit_hierarchy, filename, value in limits:
+                if limit_hierarchy == hierarchy:
+                    write_file(os.path.join(path, filename), value)
+            write_file(os.path.join(path, 'cgroup.procs'), str(os.getpid()))
+
+    def leave(self):
+        # Back to the group it came from, then the empty group is removed.
+        # Commands left behind by a timeout keep it busy, it is reused next
+        # time.
+        for path, parent_procs in reversed(self.groups):
+            try:
+                write_file(parent_procs, str(os.getpid()))
+                os.rmdir(path)
+            except (IOError, OSError):
+                pass
+        self.groups = []
+
+# ----------------------------------------------------------------------
+
+def apply_priority(nice=None, ionice_class=None, ionice_level=7):
+    # Must run in the main thread before any other thread is started,
+    # the priorities are per thread and are inherited from the creator.
+    try:
+        set_nice(nice)
+    except OSError as e:
+        warn('nice {}: {}'.format(nice, e))
+    set_ionice(ionice_class, ionice_level)
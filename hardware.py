@@ -0,0 +1,452 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - hardware
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Fast alternative to lshw. Hardware is read from sysfs, /proc/cpuinfo and the
+# raw SMBIOS tables and returned as an lshw-compatible tree, so inventory()
+# parses it with the same parse_lshw_l0 as lshw.json.
+
+import os
+import struct
+
+PCI_IDS = ['/usr/share/misc/pci.ids', '/usr/share/hwdata/pci.ids', '/usr/share/pci.ids']
+
+BLOCK_PREFIXES = ('sd', 'hd', 'vd', 'xvd')
+
+SMBIOS_MEMORY_DEVICE = 17
+SMBIOS_POWER_SUPPLY = 39
+SMBIOS_END = 127
+
+SMBIOS_FORM_FACTORS = {
+    0x03: 'SIMM', 0x05: 'DIP', 0x06: 'ZIP', 0x07: 'SIP', 0x08: 'SIMM', 0x09: 'DIMM',
+    0x0A: 'TSOP', 0x0B: 'Row of chips', 0x0C: 'RIMM', 0x0D: 'SODIMM', 0x0E: 'SRIMM',
+    0x0F: 'FB-DIMM', 0x10: 'Die',
+}
+
+SMBIOS_MEMORY_TYPES = {
+    0x03: 'DRAM', 0x0F: 'SDRAM', 0x12: 'DDR', 0x13: 'DDR2', 0x14: 'DDR2 FB-DIMM',
+    0x18: 'DDR3', 0x1A: 'DDR4', 0x1B: 'LPDDR', 0x1C: 'LPDDR2', 0x1D: 'LPDDR3',
+    0x1E: 'LPDDR4', 0x1F: 'Logical non-volatile device', 0x20: 'HBM', 0x21: 'HBM2',
+    0x22: 'DDR5', 0x23: 'LPDDR5', 0x24: 'HBM3',
+}
+
+SMBIOS_TYPE_DETAILS = [
+    (3, 'Fast-paged'), (4, 'Static column'), (5, 'Pseudo-static'), (6, 'RAMBUS'),
+    (7, 'Synchronous'), (8, 'CMOS'), (9, 'EDO'), (10, 'Window DRAM'), (11, 'Cache DRAM'),
+    (12, 'Non-volatile'), (13, 'Registered (Buffered)'), (14, 'Unbuffered (Unregistered)'),
+    (15, 'LRDIMM'),
+]
+
+# ----------------------------------------------------------------------
+
+def read_sysfs(path, default=None):
+    try:
+        with open(path, 'rb') as f:
+            value = f.read().decode('UTF-8', 'replace').strip()
+    except (IOError, OSError):
+        return default
+    return value if len(value) > 0 else default
+
+# ----------------------------------------------------------------------
+
+def list_dir(path):
+    try:
+        return sorted(os.listdir(path))
+    except OSError:
+        return []
+
+# ----------------------------------------------------------------------
+
+def add_if(node, key, value):
+    if value is not None:
+        node[key] = value
+
+# ----------------------------------------------------------------------
+
+def load_pci_ids(wanted, root=''):
+    # Only the vendor, device and class names of present devices are kept.
+    names = {'vendors': {}, 'devices': {}, 'classes': {}}
+    for filename in PCI_IDS:
+        if os.path.exists(root + filename):
+            break
+    else:
+        return names
+
+    vendors = set(vendor for vendor, device in wanted['devices'])
+    vendor = None
+    pci_class = None
+    with open(root + filename, 'rb') as f:
+        for line in f:
+            if line.startswith(b'#') or len(line.strip()) == 0:
+                continue
+            line = line.decode('UTF-8', 'replace').rstrip('\n')
+            if line.startswith('C '):
+                vendor = None
+                pci_class = line[2:4].lower()
+                names['classes'][pci_class] = line[6:].strip()
+            elif not line.startswith('\t'):
+                pci_class = None
+                vendor = line[:4].lower()
+                if vendor in vendors:
+                    names['vendors'][vendor] = line[6:].strip()
+            elif not line.startswith('\t\t'):
+                if vendor is not None and (vendor, line[1:5].lower()) in wanted['devices']:
+                    names['devices'][(vendor, line[1:5].lower())] = line[7:].strip()
+                elif pci_class is not None:
+                    names['classes'][pci_class + line[1:3].lower()] = line[5:].strip()
+    return names
+
+# ----------------------------------------------------------------------
+
+def read_pci_devices(root=''):
+    devices = []
+    base = root + '/sys/bus/pci/devices'
+    for address in list_dir(base):
+        path = '{}/{}'.format(base, address)
+        device = {
+            'address': address,
+            'vendor_id': (read_sysfs(path + '/vendor') or '0x0000')[2:].lower(),
+            'device_id': (read_sysfs(path + '/device') or '0x0000')[2:].lower(),
+            'class_id': (read_sysfs(path + '/class') or '0x000000')[2:].lower(),
+            'driver': None,
+            'interfaces': [],
+        }
+        if os.path.islink(path + '/driver'):
+            device['driver'] = os.path.basename(os.readlink(path + '/driver'))
+        devices.append(device)
+
+    # Interfaces may hang off a child device (virtio), so they are matched
+    # by the PCI addresses in the resolved path of /sys/class/net/*/device.
+    by_address = dict((device['address'], device) for device in devices)
+    base = root + '/sys/class/net'
+    for name in list_dir(base):
+        path = os.path.realpath('{}/{}/device'.format(base, name))
+        for part in reversed(path.split('/')):
+            if part in by_address:
+                by_address[part]['interfaces'].append(name)
+                break
+    return devices
+
+# ----------------------------------------------------------------------
+
+def pci_names(device, names):
+    vendor = names['vendors'].get(device['vendor_id'], device['vendor_id'])
+    product = names['devices'].get((device['vendor_id'], device['device_id']), device['device_id'])
+    description = names['classes'].get(device['class_id'][:4], names['classes'].get(device['class_id'][:2]))
+    return vendor, product, description
+
+# ----------------------------------------------------------------------
+
+def read_dmi(root=''):
+    base = root + '/sys/class/dmi/id/'
+    dmi = {}
+    for name in ['sys_vendor', 'product_name', 'product_version', 'product_serial',
+                 'board_vendor', 'board_name', 'board_version', 'board_serial',
+                 'bios_vendor', 'bios_version', 'bios_date']:
+        dmi[name] = read_sysfs(base + name)
+    return dmi
+
+# ----------------------------------------------------------------------
+
+def read_cpus(root=''):
+    sockets = {}
+    model = None
+    physical_id = None
+    with open(root + '/proc/cpuinfo') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            key = key.strip()
+            value = value.strip()
+            if key in ('model name', 'cpu model', 'Processor') and model is None:
+                model = value
+            elif key == 'physical id':
+                physical_id = value
+            elif key == 'core id':
+                sockets.setdefault(physical_id, set()).add(value)
+
+    if len(sockets) == 0:
+        base = root + '/sys/devices/system/cpu'
+        for cpu in list_dir(base):
+            if not cpu.startswith('cpu') or not cpu[3:].isdigit():
+                continue
+            package = read_sysfs('{}/{}/topology/physical_package_id'.format(base, cpu))
+            core = read_sysfs('{}/{}/topology/core_id'.format(base, cpu))
+            if package is not None:
+                sockets.setdefault(package, set()).add(core)
+
+    cpus = []
+    for package in sorted(sockets):
+        cpus.append({'id': 'cpu:{}'.format(len(cpus)), 'class': 'processor',
+                     'description': 'CPU', 'product': model,
+                     'configuration': {'cores': str(len(sockets[package]))}})
+    return cpus
+
+# ----------------------------------------------------------------------
+
+def iter_smbios(data):
+    offset = 0
+    while offset + 4 <= len(data):
+        smbios_type, length, handle = struct.unpack_from('<BBH', data, offset)
+        if length < 4:
+            return
+        end = data.find(b'\0\0', offset + length)
+        if end == -1:
+            return
+        strings = data[offset + length:end].split(b'\0')
+        yield smbios_type, data[offset:offset + length], [s.decode('UTF-8', 'replace').strip() for s in strings]
+        if smbios_type == SMBIOS_END:
+            return
+        offset = end + 2
+
+# ----------------------------------------------------------------------
+
+def smbios_string(formatted, strings, offset):
+    if offset >= len(formatted):
+        return None
+    index = formatted[offset]
+    if index == 0 or index > len(strings):
+        return None
+    value = strings[index - 1]
+    if len(value) == 0 or value.lower() in ('not specified', 'unknown', 'no dimm', 'none'):
+        return None
+    return value
+
+# ----------------------------------------------------------------------
+
+def smbios_word(formatted, offset):
+    if offset + 2 > len(formatted):
+        return None
+    return struct.unpack_from('<H', formatted, offset)[0]
+
+# ----------------------------------------------------------------------
+
+def smbios_memory_device(formatted, strings, number):
+    size = smbios_word(formatted, 0x0C)
+    if size in (None, 0, 0xFFFF):
+        return None
+    if size == 0x7FFF and len(formatted) >= 0x20:
+        size = (struct.unpack_from('<I', formatted, 0x1C)[0] & 0x7FFFFFFF) * 2 ** 20
+    elif size & 0x8000:
+        size = (size & 0x7FFF) * 2 ** 10
+    else:
+        size = size * 2 ** 20
+
+    speed = smbios_word(formatted, 0x15)
+    if speed == 0xFFFF and len(formatted) >= 0x58:
+        speed = struct.unpack_from('<I', formatted, 0x54)[0]
+
+    words = []
+    words.append(SMBIOS_FORM_FACTORS.get(formatted[0x0E], ''))
+    words.append(SMBIOS_MEMORY_TYPES.get(formatted[0x12] if len(formatted) > 0x12 else 0, ''))
+    details = smbios_word(formatted, 0x13) or 0
+    words.extend(name for bit, name in SMBIOS_TYPE_DETAILS if details & (1 << bit))
+    if speed:
+        words.append('{} MHz ({:.1f} ns)'.format(speed, 1000.0 / speed))
+    description = ' '.join(word for word in words if len(word) > 0) or 'Memory'
+
+    bank = {'id': 'bank:{}'.format(number), 'class': 'memory', 'description': description, 'size': size}
+    add_if(bank, 'product', smbios_string(formatted, strings, 0x1A))
+    add_if(bank, 'vendor', smbios_string(formatted, strings, 0x17))
+    add_if(bank, 'serial', smbios_string(formatted, strings, 0x18))
+    add_if(bank, 'slot', smbios_string(formatted, strings, 0x10))
+    if speed:
+        bank['clock'] = speed * 1000000
+    return bank
+
+# ----------------------------------------------------------------------
+
+def smbios_power_supply(formatted, strings, number):
+    psu = {'id': 'power:{}'.format(number), 'class': 'power', 'description': 'Power Supply'}
+    add_if(psu, 'vendor', smbios_string(formatted, strings, 0x07))
+    add_if(psu, 'product', smbios_string(formatted, strings, 0x0A))
+    add_if(psu, 'serial', smbios_string(formatted, strings, 0x08))
+    capacity = smbios_word(formatted, 0x0C)
+    if capacity is not None and capacity != 0x8000:
+        psu['units'] = 'mWh'
+        psu['capacity'] = capacity * 1000
+    return psu
+
+# ----------------------------------------------------------------------
+
+def read_smbios(root=''):
+    banks = []
+    psus = []
+    try:
+        with open(root + '/sys/firmware/dmi/tables/DMI', 'rb') as f:
+            data = f.read()
+    except (IOError, OSError):
+        return banks, psus
+
+    for smbios_type, formatted, strings in iter_smbios(data):
+        if smbios_type == SMBIOS_MEMORY_DEVICE:
+            bank = smbios_memory_device(formatted, strings, len(banks))
+            if bank is not None:
+                banks.append(bank)
+        elif smbios_type == SMBIOS_POWER_SUPPLY:
+            psus.append(smbios_power_supply(formatted, strings, len(psus)))
+    return banks, psus
+
+# ----------------------------------------------------------------------
+
+def read_block_serial(root, name):
+    serial = read_sysfs('{}/sys/block/{}/device/serial'.format(root, name))
+    if serial is not None:
+        return serial
+    try:
+        with open('{}/sys/block/{}/device/vpd_pg80'.format(root, name), 'rb') as f:
+            data = f.read()
+        serial = data[4:].decode('ascii', 'replace').strip(' \0')
+        if len(serial) > 0:
+            return serial
+    except (IOError, OSError):
+        pass
+    serial = read_sysfs('{}/sys/block/{}/serial'.format(root, name))
+    if serial is not None:
+        return serial
+    dev = read_sysfs('{}/sys/block/{}/dev'.format(root, name))
+    if dev is not None:
+        try:
+            with open('{}/run/udev/data/b{}'.format(root, dev)) as f:
+                for line in f:
+                    if line.startswith('E:ID_SERIAL_SHORT='):
+                        return line.strip().split('=', 1)[1]
+        except (IOError, OSError):
+            pass
+    return None
+
+# ----------------------------------------------------------------------
+
+def read_disks(root=''):
+    disks = []
+    for name in list_dir(root + '/sys/block'):
+        if not name.startswith(BLOCK_PREFIXES):
+            continue
+        base = '{}/sys/block/{}'.format(root, name)
+        disk = {'id': 'disk', 'class': 'disk', 'description': 'Disk', 'logicalname': '/dev/' + name}
+        add_if(disk, 'product', read_sysfs(base + '/device/model'))
+        add_if(disk, 'vendor', read_sysfs(base + '/device/vendor'))
+        add_if(disk, 'serial', read_block_serial(root, name))
+        add_if(disk, 'version', read_sysfs(base + '/device/rev') or read_sysfs(base + '/device/firmware_rev'))
+        size = read_sysfs(base + '/size')
+        if size is not None:
+            disk['size'] = int(size) * 512
+        if read_sysfs(base + '/removable') == '1' and int(size or 0) == 0:
+            continue
+        disks.append(disk)
+    return disks
+
+# ----------------------------------------------------------------------
+
+def read_nvme(root=''):
+    controllers = []
+    base = root + '/sys/class/nvme'
+    for name in list_dir(base):
+        path = '{}/{}'.format(base, name)
+        controller = {'id': 'nvme', 'class': 'storage', 'description': 'NVMe device',
+                      'logicalname': '/dev/' + name}
+        add_if(controller, 'product', read_sysfs(path + '/model'))
+        add_if(controller, 'serial', read_sysfs(path + '/serial'))
+        add_if(controller, 'version', read_sysfs(path + '/firmware_rev'))
+        controller['children'] = []
+        for namespace in list_dir(path):
+            if not namespace.startswith('nvme') or 'n' not in namespace[4:]:
+                continue
+            size = read_sysfs('{}/{}/size'.format(path, namespace))
+            if size is not None:
+                controller['children'].append({'id': 'namespace', 'class': 'disk', 'description': 'NVMe disk',
+                                               'logicalname': '/dev/' + namespace, 'size': int(size) * 512})
+        controllers.append(controller)
+    return controllers
+
+# ----------------------------------------------------------------------
+
+def read_pci_nodes(root=''):
+    devices = read_pci_devices(root)
+    wanted = {'devices': set((d['vendor_id'], d['device_id']) for d in devices)}
+    names = load_pci_ids(wanted, root)
+
+    nodes = []
+    for device in devices:
+        vendor, product, description = pci_names(device, names)
+        if device['class_id'].startswith('03'):
+            node = {'id': 'display', 'class': 'display', 'description': description or 'Display controller'}
+        elif device['class_id'].startswith('01') and not device['class_id'].startswith('0108'):
+            node = {'id': 'storage', 'class': 'storage', 'description': description or 'Storage controller'}
+        elif device['class_id'].startswith('02'):
+            if len(device['interfaces']) == 0 and device['driver'] is None:
+                continue
+            node = {'id': 'network', 'class': 'network', 'description': description or 'Network controller'}
+            if len(device['interfaces']) > 0:
+                node['logicalname'] = device['interfaces'][0]
+            if device['driver'] is not None:
+                node['configuration'] = {'driver': device['driver']}
+        else:
+            continue
+        node['vendor'] = vendor
+        node['product'] = product
+        node['businfo'] = 'pci@' + device['address']
+        nodes.append(node)
+    return nodes
+
+# ----------------------------------------------------------------------
+
+def read_memory_total(root=''):
+    with open(root + '/proc/meminfo') as f:
+        for line in f:
+            if line.startswith('MemTotal:'):
+                return int(line.split()[1]) * 1024
+    return None
+
+# ----------------------------------------------------------------------
+
+def collect_hardware(root=''):
+    # 'children' is always the last key of a node, as in lshw output, so
+    # parse_lshw_stream sees every other key before descending.
+    dmi = read_dmi(root)
+    banks, psus = read_smbios(root)
+
+    computer = {'id': 'computer', 'class': 'system', 'description': 'Computer'}
+    add_if(computer, 'vendor', dmi['sys_vendor'])
+    add_if(computer, 'product', dmi['product_name'])
+    add_if(computer, 'version', dmi['product_version'])
+    add_if(computer, 'serial', dmi['product_serial'])
+
+    core = {'id': 'core', 'class': 'bus', 'description': 'Motherboard'}
+    add_if(core, 'vendor', dmi['board_vendor'])
+    add_if(core, 'product', dmi['board_name'])
+    add_if(core, 'version', dmi['board_version'])
+    add_if(core, 'serial', dmi['board_serial'])
+    core['children'] = []
+    computer['children'] = [core]
+
+    firmware = {'id': 'firmware', 'class': 'memory', 'description': 'BIOS'}
+    add_if(firmware, 'vendor', dmi['bios_vendor'])
+    add_if(firmware, 'version', dmi['bios_version'])
+    add_if(firmware, 'date', dmi['bios_date'])
+    core['children'].append(firmware)
+
+    core['children'].extend(read_cpus(root))
+
+    memory = {'id': 'memory', 'class': 'memory', 'description': 'System Memory'}
+    if len(banks) > 0:
+        memory['size'] = sum(bank['size'] for bank in banks)
+    else:
+        add_if(memory, 'size', read_memory_total(root))
+    memory['children'] = banks
+    core['children'].append(memory)
+
+    core['children'].extend(read_pci_nodes(root))
+    core['children'].extend(read_nvme(root))
+    core['children'].extend(read_disks(root))
+    core['children'].extend(psus)
+
+    return computer
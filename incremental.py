@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - incremental
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Change sets between two inventories. Every top-level section has a hash, and
+# the sections listed in KEYED_SECTIONS also have a hash per item, so only the
+# hashes of the previous run have to be kept. Changes are written as JSON Patch
+# operations. Items of list sections are addressed by their key instead of their
+# index (/disks/<serial>), so a path stays valid when the list order changes.
+
+import os
+import json
+import hashlib
+
+import records
+
+STATE_VERSION = 1
+
+# Section -> function returning the key of an item, None for dict sections.
+KEYED_SECTIONS = {
+    'network_interfaces': None,
+    'network_listen_ports': None,
+    'network_routes_all': None,
+    'network_namespaces': None,
+    'packages_version': None,
+    'packages': None,
+    'docker_containers': lambda item: item.get('id'),
+    'disks': lambda item: item.get('serial') or item.get('logicalname'),
+    'memory_modules': lambda item: item.get('slot'),
+}
+
+# ----------------------------------------------------------------------
+
+def digest(value):
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+                      default=records.json_default)
+    return hashlib.sha256(data.encode('UTF-8')).hexdigest()[:16]
+
+# ----------------------------------------------------------------------
+
+def escape_pointer(token):
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+# ----------------------------------------------------------------------
+
+def section_items(section, value):
+    # Returns {key: item} for a keyed section, or None when the value can
+    # not be split into keyed items (wrong type, missing or repeated keys).
+    if section not in KEYED_SECTIONS:
+        return None
+    key_function = KEYED_SECTIONS[section]
+    if key_function is None:
+        return value if isinstance(value, dict) else None
+    if not isinstance(value, list):
+        return None
+    items = {}
+    for item in value:
+        key = key_function(item) if isinstance(item, (dict, records.Record)) else None
+        if key is None or str(key) in items:
+            return None
+        items[str(key)] = item
+    return items
+
+# ----------------------------------------------------------------------
+
+def inventory_hashes(inventory):
+    hashes = {'sections': {}, 'items': {}}
+    for section, value in inventory.items():
+        # Sections like _meta describe the run, not the host.
+        if section.startswith('_'):
+            continue
+        items = section_items(section, value)
+        if items is None:
+            hashes['sections'][section] = digest(value)
+            continue
+        item_hashes = dict((key, digest(item)) for key, item in items.items())
+        hashes['items'][section] = item_hashes
+        hashes['sections'][section] = digest(sorted(item_hashes.items()))
+    return hashes
+
+# ----------------------------------------------------------------------
+
+def diff_inventory(inventory, hashes, previous, keys=None):
+    changes = []
+    old_sections = previous['sections']
+    for section, value in inventory.items():
+        if section.startswith('_'):
+            continue
+        path = '/' + escape_pointer(section)
+        if section not in old_sections:
+            changes.append({'op': 'add', 'path': path, 'value': value})
+            continue
+        if hashes['sections'][section] == old_sections[section]:
+            continue
+        if section not in hashes['items'] or section not in previous['items']:
+            changes.append({'op': 'replace', 'path': path, 'value': value})
+            continue
+        items = section_items(section, value)
+        old_items = previous['items'][section]
+        for key, item_hash in hashes['items'][section].items():
+            if key not in old_items:
+                changes.append({'op': 'add', 'path': path + '/' + escape_pointer(key), 'value': items[key]})
+            elif old_items[key] != item_hash:
+                changes.append({'op': 'replace', 'path': path + '/' + escape_pointer(key), 'value': items[key]})
+        for key in old_items:
+            if key not in hashes['items'][section]:
+                changes.append({'op': 'remove', 'path': path + '/' + escape_pointer(key)})
+    for section in old_sections:
+        if section not in inventory and (keys is None or section in keys):
+            changes.append({'op': 'remove', 'path': '/' + escape_pointer(section)})
+    return changes
+
+# ----------------------------------------------------------------------
+
+def read_state(filename):
+    try:
+        with open(filename, encoding='UTF-8') as f:
+            state = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+# ----------------------------------------------------------------------
+
+def write_state(filename, state):
+    with open(filename + '.part', 'w', encoding='UTF-8') as f:
+        json.dump(state, f, separators=(',', ':'))
+    os.rename(filename + '.part', filename)
+
+# ----------------------------------------------------------------------
+
+def incremental(inventory, state_filename, keys=None):
+    # Returns (change set, state): the changes against the state of the
+    # previous run, and the state of this one. keys are the sections a
+    # partial run covers, the hashes of the other sections are kept from
+    # the previous run and they are not reported as removed. The state is
+    # only written by the caller with write_state(), once the change set is
+    # on disk, so a change set that could not be written is sent again.
+    hashes = inventory_hashes(inventory)
+    previous = read_state(state_filename)
+    if previous is None:
+        previous = {'digest': None, 'sections': {}, 'items': {}}
+    changes = diff_inventory(inventory, hashes, previous, keys)
+    if keys is not None:
+        for section, section_hash in previous['sections'].items():
+            if section not in keys and section not in hashes['sections']:
+                hashes['sections'][section] = section_hash
+                if section in previous['items']:
+                    hashes['items'][section] = previous['items'][section]
+    inventory_digest = digest(sorted(hashes['sections'].items()))
+    state = {'version': STATE_VERSION, 'digest': inventory_digest,
+             'sections': hashes['sections'], 'items': hashes['items']}
+    return {
+        'base': previous['digest'],
+        'digest': inventory_digest,
+        'changes': changes,
+        'hashes': hashes['sections'],
+    }, state
+
+# ----------------------------------------------------------------------
+
+def unescape_pointer(token):
+    return token.replace('~1', '/').replace('~0', '~')
+
+# ----------------------------------------------------------------------
+
+def apply_changes(inventory, changes):
+    # Applies a change set to the previous inventory in place, for the
+    # receiving side. Keyed items of list sections are matched by key.
+    for change in changes:
+        path = [unescape_pointer(token) for token in change['path'].split('/')[1:]]
+        section = path[0]
+        if len(path) == 1:
+            if change['op'] == 'remove':
+                inventory.pop(section, None)
+            else:
+                inventory[section] = change['value']
+            continue
+        key = path[1]
+        key_function = KEYED_SECTIONS[section]
+        if key_function is None:
+            if change['op'] == 'remove':
+                inventory[section].pop(key, None)
+            else:
+                inventory[section][key] = change['value']
+            continue
+        items = inventory[section]
+        index = next((i for i, item in enumerate(items) if str(key_function(item)) == key), None)
+        if change['op'] == 'remove':
+            if index is not None:
+                items.pop(index)
+        elif index is None:
+            items.append(change['value'])
+        else:
+            items[index] = change['value']
+    return inventory
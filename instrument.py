@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - instrument
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Run-time measurements for the _meta block of the result: wall and CPU time,
+# peak RSS growth and bytes read, per collector and per parse stage. CPU time
+# and I/O are read per thread, so collectors running side by side do not count
+# each other's work. Stages can also be profiled with cProfile and tracemalloc.
+
+import os
+import sys
+import time
+import resource
+
+# ----------------------------------------------------------------------
+
+def thread_io():
+    # rchar counts every byte read by the thread, read_bytes only the
+    # bytes that had to come from the block device.
+    io = {'rchar': 0, 'read_bytes': 0}
+    try:
+        with open('/proc/thread-self/io') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in io:
+                    io[key] = int(value)
+    except (IOError, OSError):
+        pass
+    return io
+
+# ----------------------------------------------------------------------
+
+def max_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# ----------------------------------------------------------------------
+
+def rusage_usage(rusage):
+    # Usage of a waited-for child process, including its own children.
+    return {
+        'cpu': round(rusage.ru_utime + rusage.ru_stime, 3),
+        'max_rss': rusage.ru_maxrss * 1024,
+        'bytes_read': rusage.ru_inblock * 512,
+    }
+
+# ----------------------------------------------------------------------
+
+class Meter(object):
+
+    # Measures one piece of work done by the calling thread.
+
+    def __init__(self):
+        self.wall = time.time()
+        self.cpu = time.thread_time()
+        self.rss = max_rss()
+        self.io = thread_io()
+
+    def usage(self):
+        io = thread_io()
+        return {
+            'elapsed': round(time.time() - self.wall, 3),
+            'cpu': round(time.thread_time() - self.cpu, 3),
+            'max_rss_delta': max_rss() - self.rss,
+            'bytes_read': io['rchar'] - self.io['rchar'],
+        }
+
+# ----------------------------------------------------------------------
+
+class StageMeter(object):
+
+    # Stages are delimited by begin() and end() calls at the BEGIN and END
+    # markers of inventory(). With profile_dir every stage also leaves a
+    # <stage>.prof (cProfile) and a <stage>.tracemalloc.txt there.
+
+    def __init__(self, profile_dir=None):
+        self.stages = {}
+        self.profile_dir = profile_dir
+        self.name = None
+        self.meter = None
+        self.profiler = None
+        if profile_dir is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def begin(self, name):
+        if self.name is not None:
+            self.end()
+        self.name = name
+        if self.profile_dir is not None:
+            import cProfile
+            import tracemalloc
+            tracemalloc.start()
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.meter = Meter()
+
+    def end(self):
+        if self.name is None:
+            return
+        usage = self.meter.usage()
+        if self.profiler is not None:
+            import tracemalloc
+            self.profiler.disable()
+            self.profiler.dump_stats(os.path.join(self.profile_dir, '{}.prof'.format(self.name)))
+            self.profiler = None
+            snapshot = tracemalloc.take_snapshot()
+            usage['traced_peak'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            with open(os.path.join(self.profile_dir, '{}.tracemalloc.txt'.format(self.name)), 'w') as f:
+                for stat in snapshot.statistics('lineno')[:50]:
+                    f.write('{}\n'.format(stat))
+        self.stages[self.name] = usage
+        self.name = None
+
+# ----------------------------------------------------------------------
+
+def meta_block(collector_results=None, stages=None):
+    meta = {
+        'python': sys.version.split()[0],
+        'max_rss': max_rss(),
+    }
+    if collector_results is not None:
+        meta['collectors'] = {}
+        for name, result in sorted(collector_results.items()):
+            meta['collectors'][name] = dict((key, value) for key, value in result.items()
+                                            if key not in ('name', 'output', 'cache_key'))
+    if stages is not None:
+        meta['stages'] = stages
+    return meta
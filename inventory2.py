@@ -14,44 +14,79 @@
 GB = 2 ** 30  #  1GB in bytes
 
 import json, sys, os
+import time
+import io
+import copy
 import codecs
+import argparse
 from operator import itemgetter
 
+import instrument
+import output
+import sections as sections_module
+
+# ----------------------------------------------------------------------
+
+def open_artifact(filename, artifacts=None):
+    # artifacts maps file names to their content, for bundles read into
+    # memory. Without it the files of the current directory are read.
+    if artifacts is None:
+        return open(filename, 'rb')
+    if filename not in artifacts:
+        raise IOError('{} is not in the bundle'.format(filename))
+    return io.BytesIO(artifacts[filename])
+
+# ----------------------------------------------------------------------
+
+def artifact_exists(filename, artifacts=None):
+    if artifacts is None:
+        return os.path.exists(filename)
+    return filename in artifacts
+
 # ----------------------------------------------------------------------
 
-def readJSONfromFile(filename):
-    with codecs.open(filename, 'r', encoding='UTF-8') as f:
-        return json.load(f)
+def readJSONfromFile(filename, artifacts=None):
+    with open_artifact(filename, artifacts) as f:
+        return json.loads(f.read().decode('UTF-8'))
 
 # ----------------------------------------------------------------------
 
-def dumpJSONtoFile(filename, data, mode='w'):
+def dumpJSONtoFile(filename, data, mode='w', indent=4):
     
     if data is None:
         return
     
     filename = "{}.json".format(filename)
     with codecs.open(filename, mode, encoding="UTF-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+        json.dump(data, f, ensure_ascii=False, indent=indent,
+                  separators=None if indent is not None else (',', ':'))
 
     return
 
 # ----------------------------------------------------------------------
 
-def readLINEfromFile(filename):
-    with codecs.open(filename, 'r', encoding='UTF-8') as f:
-        return f.readline().split('\n')[0]
+def readLINEfromFile(filename, artifacts=None):
+    with open_artifact(filename, artifacts) as f:
+        return f.readline().decode('UTF-8').split('\n')[0]
  
 # ----------------------------------------------------------------------
 
-def readLINESfromFile(filename):
-    with codecs.open(filename, 'r', encoding='UTF-8') as f:
-        return f.read().splitlines()
+def readLINESfromFile(filename, artifacts=None):
+    with open_artifact(filename, artifacts) as f:
+        return f.read().decode('UTF-8').splitlines()
+
+# ----------------------------------------------------------------------
+
+def iterLINESfromFile(filename, artifacts=None):
+    # For dumps too large to hold, like full routing tables.
+    with open_artifact(filename, artifacts) as f:
+        for line in io.TextIOWrapper(f, encoding='UTF-8'):
+            yield line.rstrip('\r\n')
 
 # ----------------------------------------------------------------------
 
 def assing_if_is(value, key):
-    if key in list(value.keys()):
+    if key in value:
         if value[key] != 'None':
             return value[key]
         else:
@@ -61,277 +96,346 @@ def assing_if_is(value, key):
 
 # ----------------------------------------------------------------------
 
-def parse_lshw_l0(lshw_data, inventory):
-    if isinstance(lshw_data, list):
-        for lshw_data_element in lshw_data:
-            parse_lshw_l1(lshw_data_element, inventory)
-            if 'children' in list(lshw_data_element.keys()):
-                parse_lshw_l0(lshw_data_element['children'], inventory)
-    elif isinstance(lshw_data, dict):
-        if 'children' in list(lshw_data.keys()):
-            parse_lshw_l1(lshw_data, inventory)
-            parse_lshw_l0(lshw_data['children'], inventory)
-        else:
-            parse_lshw_l1(lshw_data, inventory)
-            return
+def parse_lshw_l0(lshw_data, inventory, nodes=None):
+    stack = [lshw_data] if isinstance(lshw_data, dict) else list(reversed(lshw_data))
+    while len(stack) > 0:
+        lshw_node = stack.pop()
+        parse_lshw_l1(lshw_node, inventory, nodes)
+        if 'children' in lshw_node:
+            stack.extend(reversed(lshw_node['children']))
+
+# ----------------------------------------------------------------------
+
+class LshwOrderError(Exception):
+    pass
 
 # ----------------------------------------------------------------------
 
-def parse_lshw_l1(lshw_data, inventory):
-    if 'description' in list(lshw_data.keys()):
-
-        if lshw_data['description'].lower() == 'computer':
-            inventory['system_vendor'] = assing_if_is(lshw_data, 'vendor')
-            inventory['system_platform'] = assing_if_is(lshw_data, 'product')
-            inventory['system_platform_version'] = assing_if_is(lshw_data, 'version')
-            inventory['system_serial'] = assing_if_is(lshw_data, 'serial')
-            if inventory['system_platform'] is not None:
-                if ('kvm' in inventory['system_platform'].lower() or
-                    'vmware' in inventory['system_platform'].lower() or
-                    'bochs' in inventory['system_vendor'].lower()):
-                    inventory['is_vm'] = True
-
-        if lshw_data['description'].lower() == 'motherboard':
-            inventory['mb_vendor'] = assing_if_is(lshw_data, 'vendor')
-            inventory['mb_model'] = assing_if_is(lshw_data, 'product')
-            inventory['mb_version'] = assing_if_is(lshw_data, 'version')
-            inventory['mb_serial'] = assing_if_is(lshw_data, 'serial')
-
-        if lshw_data['description'].lower() == 'bios':
-            inventory['mb_bios_vendor'] = assing_if_is(lshw_data, 'vendor')
-            inventory['mb_bios_version'] = assing_if_is(lshw_data, 'version')
-            inventory['mb_bios_date'] = assing_if_is(lshw_data, 'date')
-
-        if lshw_data['description'].lower() == 'cpu' and 'product' in list(lshw_data.keys()):
-            inventory['cpu_model'] = lshw_data['product']
-            inventory['cpu_count'] += 1
-            if 'configuration' in list(lshw_data.keys()):
-                if 'cores' in list(lshw_data['configuration'].keys()):
-                    inventory['cpu_count_of_all_cores'] += int(lshw_data['configuration']['cores'])
+def parse_lshw_stream(f, inventory, nodes=None):
+    # Walks lshw.json event by event, so only the node being parsed is kept
+    # in memory. Nodes that need their children (NVMe controllers) are built
+    # in full and handed over to parse_lshw_l0.
+    #
+    # A node is parsed when its 'children' key comes, so this relies on lshw
+    # writing 'children' last, as it does. A key after 'children' raises
+    # LshwOrderError, read_lshw() then parses the whole file at once.
+    import ijson
+
+    frames = []  # [container, current key, holds nodes / is node, parsed, children seen]
+    buffer_at = None
+
+    def attach(value):
+        if len(frames) == 0:
+            return
+        parent = frames[-1]
+        if buffer_at is None and parent[2] and isinstance(parent[0], list):
+            return
+        if isinstance(parent[0], list):
+            parent[0].append(value)
+        elif buffer_at is not None or parent[1] != 'children':
+            parent[0][parent[1]] = value
+
+    for prefix, event, value in ijson.parse(f, multiple_values=True, use_float=True):
+        if event == 'map_key':
+            frame = frames[-1]
+            if frame[4] and frame[2] and (buffer_at is None or buffer_at == len(frames) - 1):
+                raise LshwOrderError('lshw node key {} after its children'.format(value))
+            frame[1] = value
+            if value == 'children':
+                frame[4] = True
+            if value == 'children' and buffer_at is None and frame[2]:
+                if lshw_needs_children(frame[0]):
+                    buffer_at = len(frames) - 1
                 else:
-                    inventory['cpu_count_of_all_cores'] += 1
+                    parse_lshw_l1(frame[0], inventory, nodes)
+                    frame[3] = True
+        elif event == 'start_map' or event == 'start_array':
+            container = {} if event == 'start_map' else []
+            if len(frames) == 0:
+                is_node = True
+            elif isinstance(frames[-1][0], list):
+                is_node = frames[-1][2] and event == 'start_map'
             else:
-                inventory['cpu_count_of_all_cores'] += 1
-
-
-        if (lshw_data['description'].lower() == 'vga compatible controller' or
-            (lshw_data['id'].lower() == 'display' and lshw_data['class'].lower() == 'display')):
-            temp_vga = {}
-            temp_vga['vga_vendor'] = assing_if_is(lshw_data, 'vendor')
-            temp_vga['vga_model'] = assing_if_is(lshw_data, 'product')
-            inventory['vga'].append(temp_vga)
-
-        if lshw_data['class'].lower() == 'power' and 'power' in lshw_data['id'].lower():
-            temp_psu = {}
-            temp_psu['vendor'] = assing_if_is(lshw_data, 'vendor')
-            temp_psu['model'] = assing_if_is(lshw_data, 'product')
-            temp_psu['serial'] = assing_if_is(lshw_data, 'serial')
-            temp_psu['units'] = assing_if_is(lshw_data, 'units')
-            temp_psu['capacity'] = assing_if_is(lshw_data, 'capacity')
-            inventory['psu'].append(temp_psu)
-            inventory['psu_count'] += 1
-
-        if lshw_data['class'].lower() == 'storage' and lshw_data['id'].lower() != 'nvme':
-            temp_storage = {}
-            temp_storage['vendor'] = assing_if_is(lshw_data, 'vendor')
-            temp_storage['model'] = assing_if_is(lshw_data, 'product')
-            temp_storage['description'] = assing_if_is(lshw_data, 'description')            
-            temp_storage['serial'] = assing_if_is(lshw_data, 'serial')
-            inventory['storages'].append(temp_storage)
-
-        if lshw_data['class'].lower() == 'storage' and lshw_data['id'].lower() == 'nvme':
-            temp_disk = {}
+                is_node = frames[-1][2] and frames[-1][1] == 'children'
+            attach(container)
+            frames.append([container, None, is_node, False, False])
+        elif event == 'end_map' or event == 'end_array':
+            frame = frames.pop()
+            if buffer_at == len(frames):
+                buffer_at = None
+                parse_lshw_l0(frame[0], inventory, nodes)
+            elif buffer_at is None and event == 'end_map' and frame[2] and not frame[3]:
+                parse_lshw_l1(frame[0], inventory, nodes)
+        else:
+            attach(value)
 
-            temp_disk['model'] = assing_if_is(lshw_data, 'product')
-            if 'children' in list(lshw_data.keys()):
-                for temp in lshw_data['children']:
-                    if 'size' in list(temp.keys()):
-                        temp_disk['size_in_gb'] = assing_if_is(temp, 'size')
-                        if isinstance(temp_disk['size_in_gb'], int):
-                            temp_disk['size_in_gb'] //= GB
-                        break
-
-            temp_disk['serial'] = assing_if_is(lshw_data, 'serial')
-            temp_disk['fw_version'] = assing_if_is(lshw_data, 'version')
-            temp_disk['logicalname'] = assing_if_is(lshw_data, 'logicalname')
-            
-            inventory['disks'].append(temp_disk)
-
-        if lshw_data['class'].lower() == 'disk' and 'nvme' not in lshw_data['description'].lower():
-            temp_disk = {}
-            temp_disk['model'] = assing_if_is(lshw_data, 'product')
-            temp_disk['size_in_gb'] = assing_if_is(lshw_data, 'size')
-            if isinstance(temp_disk['size_in_gb'], int):
-                temp_disk['size_in_gb'] //= GB
-            temp_disk['serial'] = assing_if_is(lshw_data, 'serial')
-            temp_disk['fw_version'] = assing_if_is(lshw_data, 'version')
-            temp_disk['logicalname'] = assing_if_is(lshw_data, 'logicalname')
-            inventory['disks'].append(temp_disk)
+# ----------------------------------------------------------------------
 
-        
-        if lshw_data['description'].lower() == 'system memory':
-            if 'size' in lshw_data.keys():
-                inventory['memory_size_in_gb'] = lshw_data['size'] / GB                
-
-        if (lshw_data['class'].lower() == 'memory' and
-            'cache' not in lshw_data['description'] and
-            'bios' not in lshw_data['description'].lower() and
-            'system memory' not in lshw_data['description'].lower() and
-            'size' in list(lshw_data.keys()) and
-            'slot' in list(lshw_data.keys())):
-            temp_ram_module = {}
-            temp_ram_module['slot'] = lshw_data['slot']
-            temp_ram_module['vendor'] = assing_if_is(lshw_data, 'vendor')
-            temp_ram_module['model'] = assing_if_is(lshw_data, 'product')
-            temp_ram_module['type'] = lshw_data['description']
-            temp_ram_module['frequency_in_mhz'] = assing_if_is(lshw_data, 'clock')
-            if isinstance(temp_ram_module['frequency_in_mhz'], int):
-                temp_ram_module['frequency_in_mhz'] //= 1000000
-            temp_ram_module['serial'] = assing_if_is(lshw_data, 'serial')
-            temp_ram_module['size_in_gb'] = lshw_data['size'] / GB
-            inventory['memory_modules_count'] += 1
-            inventory['memory_modules'].append(temp_ram_module)
-
-        if (lshw_data['class'].lower() == 'network' and
-            'logicalname' in list(lshw_data.keys())):
-            if isinstance(lshw_data['logicalname'], list):
-                lshw_data['logicalname'] = lshw_data['logicalname'][0]
-            if lshw_data['logicalname'] in list(inventory['network_interfaces'].keys()):
-                if 'vendor' in list(lshw_data.keys()):
-                    inventory['network_interfaces'][lshw_data['logicalname']]['vendor'] = lshw_data['vendor']
-                if 'product' in list(lshw_data.keys()):
-                    inventory['network_interfaces'][lshw_data['logicalname']]['product'] = lshw_data['product']
-
-        elif (lshw_data['class'].lower() == 'network' and 'logicalname' not in list(lshw_data.keys())):
-            temp_id = "{}{}".format(lshw_data['configuration']['driver'], inventory['network_nonstd_id'])
-            inventory['network_interfaces'][temp_id] = {}
-            if 'vendor' in list(lshw_data.keys()):
-                inventory['network_interfaces'][temp_id]['vendor'] = lshw_data['vendor']
-            if 'product' in list(lshw_data.keys()):
-                inventory['network_interfaces'][temp_id]['product'] = lshw_data['product']
-            inventory['network_nonstd_id'] += 1
+def read_lshw(filename, inventory, artifacts=None, nodes=None):
+    # nodes, if given, gets the nodes the parsers used, in order. Handing
+    # them to parse_lshw_l1 again fills the inventory the same way.
+    try:
+        import ijson
+    except ImportError:
+        ijson = None
+
+    if ijson is not None:
+        # What the nodes streamed so far have filled is put back before
+        # the file is parsed again.
+        saved = copy.deepcopy(dict((key, inventory[key]) for key in LSHW_KEYS if key in inventory))
+        try:
+            with open_artifact(filename, artifacts) as f:
+                parse_lshw_stream(f, inventory, nodes)
+            return
+        except LshwOrderError:
+            for key in LSHW_KEYS:
+                if key in saved:
+                    inventory[key] = saved[key]
+                else:
+                    inventory.pop(key, None)
+            if nodes is not None:
+                del nodes[:]
+
+    parse_lshw_l0(readJSONfromFile(filename, artifacts), inventory, nodes)
 
 # ----------------------------------------------------------------------
 
-def parse_storcli_l0(storcli_data, inventory):
-    for controller in storcli_data['Controllers']:
-        for drive in controller['Response Data'].values():
-            if isinstance(drive, dict):
-                for drive_detail in drive.values():
-                    if isinstance(drive_detail, dict):
-                        if 'SN' in list(drive_detail.keys() and 'Model Number' in drive_detail.keys()):
-                            temp_disk = {}
-                            temp_disk['model'] = assing_if_is(drive_detail, 'Model Number')
-                            temp_disk['size_raw'] = assing_if_is(drive_detail, 'Raw size')
-                            temp_disk['serial'] = assing_if_is(drive_detail, 'SN').split()[0]
-                            temp_disk['wwn'] = assing_if_is(drive_detail, 'WWN')
-                            temp_disk['fw_version'] = assing_if_is(drive_detail, 'Firmware Revision')
-                            inventory['disks'].append(temp_disk)
+def lshw_needs_children(lshw_data):
+    return (lshw_data.get('class', '').lower() == 'storage' and
+            lshw_data.get('id', '').lower() == 'nvme')
 
 # ----------------------------------------------------------------------
 
-def inventory(to_screen=True, to_file=True, filename='result'):
+def parse_lshw_system(lshw_data, lshw_keys, inventory):
+    inventory['system_vendor'] = assing_if_is(lshw_data, 'vendor')
+    inventory['system_platform'] = assing_if_is(lshw_data, 'product')
+    inventory['system_platform_version'] = assing_if_is(lshw_data, 'version')
+    inventory['system_serial'] = assing_if_is(lshw_data, 'serial')
+    if inventory['system_platform'] is not None:
+        if ('kvm' in inventory['system_platform'].lower() or
+            'vmware' in inventory['system_platform'].lower() or
+            'bochs' in inventory['system_vendor'].lower()):
+            inventory['is_vm'] = True
 
-    # ----------------------------------------------------------------------
-    # PRERUN BEGIN
+# ----------------------------------------------------------------------
 
-    inventory = {}
+def parse_lshw_motherboard(lshw_data, lshw_keys, inventory):
+    inventory['mb_vendor'] = assing_if_is(lshw_data, 'vendor')
+    inventory['mb_model'] = assing_if_is(lshw_data, 'product')
+    inventory['mb_version'] = assing_if_is(lshw_data, 'version')
+    inventory['mb_serial'] = assing_if_is(lshw_data, 'serial')
 
-    inventory['is_vm'] = False
+# ----------------------------------------------------------------------
 
-    inventory['date_of_inventory'] = None
-    inventory['script_version'] = None
+def parse_lshw_bios(lshw_data, lshw_keys, inventory):
+    inventory['mb_bios_vendor'] = assing_if_is(lshw_data, 'vendor')
+    inventory['mb_bios_version'] = assing_if_is(lshw_data, 'version')
+    inventory['mb_bios_date'] = assing_if_is(lshw_data, 'date')
 
-    inventory['os_hostname'] = None
-    inventory['os_version'] = None
-    inventory['os_core'] = None
-    inventory['os_users'] = []
-    inventory['os_users_sudo'] = []
-    inventory['os_users_wheel'] = []
-    inventory['os_users_ssh'] = []
-    inventory['os_ssh_port'] = None
+# ----------------------------------------------------------------------
 
-    inventory['os_ssl_version'] = None
-    inventory['os_ssh_version'] = None
+def parse_lshw_cpu(lshw_data, lshw_keys, inventory):
+    if 'product' not in lshw_data:
+        return
+    inventory['cpu_model'] = lshw_data['product']
+    inventory['cpu_count'] += 1
+    if 'configuration' in lshw_data and 'cores' in lshw_data['configuration']:
+        inventory['cpu_count_of_all_cores'] += int(lshw_data['configuration']['cores'])
+    else:
+        inventory['cpu_count_of_all_cores'] += 1
 
-    inventory['packages_version'] = {}
+# ----------------------------------------------------------------------
 
-    inventory['system_vendor'] = None
-    inventory['system_platform'] = None
-    inventory['system_platform_version'] = None
-    inventory['system_serial'] = None
+def parse_lshw_vga(lshw_data, lshw_keys, inventory):
+    description, lshw_class, lshw_id = lshw_keys
+    if not (description == 'vga compatible controller' or
+            (lshw_id == 'display' and lshw_class == 'display')):
+        return
+    temp_vga = {}
+    temp_vga['vga_vendor'] = assing_if_is(lshw_data, 'vendor')
+    temp_vga['vga_model'] = assing_if_is(lshw_data, 'product')
+    inventory['vga'].append(temp_vga)
 
-    inventory['cpu_model'] = None
-    inventory['cpu_count'] = 0
-    inventory['cpu_count_of_all_cores'] = 0
+# ----------------------------------------------------------------------
 
-    inventory['mb_vendor'] = None
-    inventory['mb_model'] = None
-    inventory['mb_version'] = None
-    inventory['mb_serial'] = None
+def parse_lshw_psu(lshw_data, lshw_keys, inventory):
+    if 'power' not in lshw_keys[2]:
+        return
+    temp_psu = {}
+    temp_psu['vendor'] = assing_if_is(lshw_data, 'vendor')
+    temp_psu['model'] = assing_if_is(lshw_data, 'product')
+    temp_psu['serial'] = assing_if_is(lshw_data, 'serial')
+    temp_psu['units'] = assing_if_is(lshw_data, 'units')
+    temp_psu['capacity'] = assing_if_is(lshw_data, 'capacity')
+    inventory['psu'].append(temp_psu)
+    inventory['psu_count'] += 1
 
-    inventory['mb_bios_vendor'] = None
-    inventory['mb_bios_version'] = None
-    inventory['mb_bios_date'] = None
+# ----------------------------------------------------------------------
 
-    inventory['memory_size_in_gb'] = 0
-    inventory['memory_modules_count'] = 0
-    inventory['memory_modules'] = []
+def parse_lshw_storage(lshw_data, lshw_keys, inventory):
+    if lshw_keys[2] != 'nvme':
+        temp_storage = {}
+        temp_storage['vendor'] = assing_if_is(lshw_data, 'vendor')
+        temp_storage['model'] = assing_if_is(lshw_data, 'product')
+        temp_storage['description'] = assing_if_is(lshw_data, 'description')
+        temp_storage['serial'] = assing_if_is(lshw_data, 'serial')
+        inventory['storages'].append(temp_storage)
+        return
 
-    inventory['vga'] = []
+    temp_disk = {}
+    temp_disk['model'] = assing_if_is(lshw_data, 'product')
+    for temp in lshw_data.get('children', []):
+        if 'size' in temp:
+            temp_disk['size_in_gb'] = assing_if_is(temp, 'size')
+            if isinstance(temp_disk['size_in_gb'], int):
+                temp_disk['size_in_gb'] //= GB
+            break
+    temp_disk['serial'] = assing_if_is(lshw_data, 'serial')
+    temp_disk['fw_version'] = assing_if_is(lshw_data, 'version')
+    temp_disk['logicalname'] = assing_if_is(lshw_data, 'logicalname')
+    inventory['disks'].append(temp_disk)
 
-    inventory['storages'] = []
+# ----------------------------------------------------------------------
 
-    inventory['disks'] = []
+def parse_lshw_disk(lshw_data, lshw_keys, inventory):
+    if 'nvme' in lshw_keys[0]:
+        return
+    temp_disk = {}
+    temp_disk['model'] = assing_if_is(lshw_data, 'product')
+    temp_disk['size_in_gb'] = assing_if_is(lshw_data, 'size')
+    if isinstance(temp_disk['size_in_gb'], int):
+        temp_disk['size_in_gb'] //= GB
+    temp_disk['serial'] = assing_if_is(lshw_data, 'serial')
+    temp_disk['fw_version'] = assing_if_is(lshw_data, 'version')
+    temp_disk['logicalname'] = assing_if_is(lshw_data, 'logicalname')
+    inventory['disks'].append(temp_disk)
 
-    inventory['volumes'] = []
+# ----------------------------------------------------------------------
 
-    inventory['psu_count'] = 0
-    inventory['psu'] = []
+def parse_lshw_system_memory(lshw_data, lshw_keys, inventory):
+    if 'size' in lshw_data:
+        inventory['memory_size_in_gb'] = lshw_data['size'] / GB
 
-    inventory['network_all_ip_addresses'] = []
-    inventory['network_routes_all'] = {}
-    inventory['network_interfaces'] = {}
-    inventory['network_listen_ports_list'] = []
-    inventory['network_listen_ports'] = {}
-    inventory['network_nonstd_id'] = 0
+# ----------------------------------------------------------------------
 
-    inventory['docker_containers'] = []
+def parse_lshw_memory_module(lshw_data, lshw_keys, inventory):
+    description = lshw_keys[0]
+    if ('cache' in lshw_data['description'] or
+        'bios' in description or
+        'system memory' in description or
+        'size' not in lshw_data or
+        'slot' not in lshw_data):
+        return
+    temp_ram_module = {}
+    temp_ram_module['slot'] = lshw_data['slot']
+    temp_ram_module['vendor'] = assing_if_is(lshw_data, 'vendor')
+    temp_ram_module['model'] = assing_if_is(lshw_data, 'product')
+    temp_ram_module['type'] = lshw_data['description']
+    temp_ram_module['frequency_in_mhz'] = assing_if_is(lshw_data, 'clock')
+    if isinstance(temp_ram_module['frequency_in_mhz'], int):
+        temp_ram_module['frequency_in_mhz'] //= 1000000
+    temp_ram_module['serial'] = assing_if_is(lshw_data, 'serial')
+    temp_ram_module['size_in_gb'] = lshw_data['size'] / GB
+    inventory['memory_modules_count'] += 1
+    inventory['memory_modules'].append(temp_ram_module)
 
-    # PRERUN END
-    # ----------------------------------------------------------------------
-    # OS BEGIN
+# ----------------------------------------------------------------------
+
+def parse_lshw_network(lshw_data, lshw_keys, inventory):
+    if 'logicalname' in lshw_data:
+        if isinstance(lshw_data['logicalname'], list):
+            lshw_data['logicalname'] = lshw_data['logicalname'][0]
+        if lshw_data['logicalname'] in inventory['network_interfaces']:
+            if 'vendor' in lshw_data:
+                inventory['network_interfaces'][lshw_data['logicalname']]['vendor'] = lshw_data['vendor']
+            if 'product' in lshw_data:
+                inventory['network_interfaces'][lshw_data['logicalname']]['product'] = lshw_data['product']
+    else:
+        temp_id = "{}{}".format(lshw_data['configuration']['driver'], inventory['network_nonstd_id'])
+        inventory['network_interfaces'][temp_id] = {}
+        if 'vendor' in lshw_data:
+            inventory['network_interfaces'][temp_id]['vendor'] = lshw_data['vendor']
+        if 'product' in lshw_data:
+            inventory['network_interfaces'][temp_id]['product'] = lshw_data['product']
+        inventory['network_nonstd_id'] += 1
 
-    inventory['date_of_inventory'] = readLINEfromFile('date_of_inventory.txt')
-    inventory['script_version'] = readLINEfromFile('VERSION')
+# ----------------------------------------------------------------------
 
-    inventory['os_hostname'] = readLINEfromFile('os_hostname.txt')
-    inventory['os_version'] = readLINEfromFile('os_version.txt')
-    inventory['os_core'] = readLINEfromFile('os_core.txt')
-    inventory['os_users'] =  sorted(readLINESfromFile('os_users.txt'))
-    
-    temp_users_line = readLINEfromFile('os_users_sudo.txt')
-    if len(temp_users_line) > 0:
-        inventory['os_users_sudo'] = sorted(temp_users_line.split(','))
-    
-    temp_users_line = readLINEfromFile('os_users_wheel.txt')
-    if len(temp_users_line) > 0:    
-        inventory['os_users_wheel'] = sorted(temp_users_line.split(','))
+# Every inventory key the lshw parsers fill.
+LSHW_KEYS = ['is_vm', 'system_vendor', 'system_platform', 'system_platform_version', 'system_serial',
+             'mb_vendor', 'mb_model', 'mb_version', 'mb_serial', 'mb_bios_vendor', 'mb_bios_version',
+             'mb_bios_date', 'cpu_model', 'cpu_count', 'cpu_count_of_all_cores', 'vga', 'psu', 'psu_count',
+             'storages', 'disks', 'memory_size_in_gb', 'memory_modules_count', 'memory_modules',
+             'network_interfaces', 'network_nonstd_id']
+
+LSHW_BY_DESCRIPTION = {
+    'computer': [parse_lshw_system],
+    'motherboard': [parse_lshw_motherboard],
+    'bios': [parse_lshw_bios],
+    'cpu': [parse_lshw_cpu],
+    'vga compatible controller': [parse_lshw_vga],
+    'system memory': [parse_lshw_system_memory],
+}
+
+LSHW_BY_CLASS = {
+    'display': [parse_lshw_vga],
+    'power': [parse_lshw_psu],
+    'storage': [parse_lshw_storage],
+    'disk': [parse_lshw_disk],
+    'memory': [parse_lshw_memory_module],
+    'network': [parse_lshw_network],
+}
+
+# ----------------------------------------------------------------------
+
+def parse_lshw_l1(lshw_data, inventory, nodes=None):
+    if 'description' not in lshw_data:
+        return
+
+    lshw_keys = (lshw_data['description'].lower(),
+                 lshw_data.get('class', '').lower(),
+                 lshw_data.get('id', '').lower())
+
+    handlers = LSHW_BY_DESCRIPTION.get(lshw_keys[0], [])
+    class_handlers = [handler for handler in LSHW_BY_CLASS.get(lshw_keys[1], []) if handler not in handlers]
+    for handler in handlers + class_handlers:
+        handler(lshw_data, lshw_keys, inventory)
 
-    inventory['os_users_ssh'] = sorted(readLINEfromFile('os_users_ssh.txt').split())
-    inventory['os_ssh_port'] = int(readLINEfromFile('os_ssh_port.txt'))
-    inventory['os_ssl_version'] = readLINEfromFile('os_ssl_version.txt')
-    inventory['os_ssh_version'] = readLINEfromFile('os_ssh_version.txt')
+    if nodes is not None and (handlers or class_handlers):
+        if lshw_needs_children(lshw_data):
+            nodes.append(lshw_data)
+        else:
+            nodes.append(dict((key, value) for key, value in lshw_data.items() if key != 'children'))
+
+# ----------------------------------------------------------------------
+
+def parse_storcli_l0(storcli_data, inventory):
+    for controller in storcli_data['Controllers']:
+        for drive in controller['Response Data'].values():
+            if isinstance(drive, dict):
+                for drive_detail in drive.values():
+                    if isinstance(drive_detail, dict):
+                        if 'SN' in drive_detail and 'Model Number' in drive_detail:
+                            temp_disk = {}
+                            temp_disk['model'] = assing_if_is(drive_detail, 'Model Number')
+                            temp_disk['size_raw'] = assing_if_is(drive_detail, 'Raw size')
+                            temp_disk['serial'] = assing_if_is(drive_detail, 'SN').split()[0]
+                            temp_disk['wwn'] = assing_if_is(drive_detail, 'WWN')
+                            temp_disk['fw_version'] = assing_if_is(drive_detail, 'Firmware Revision')
+                            inventory['disks'].append(temp_disk)
 
-    if os.path.exists('packages_apt.txt'):
+# ----------------------------------------------------------------------
+
+def parse_packages_l0(inventory, artifacts=None):
+    if artifact_exists('packages_apt.txt', artifacts):
         package_filename = 'packages_apt.txt'
         flag1 = 'apt'
-        temp_packages_list = readLINESfromFile(package_filename)[1::]
+        temp_packages_list = readLINESfromFile(package_filename, artifacts)[1::]
         
-    elif os.path.exists('packages_yum.txt'):
+    elif artifact_exists('packages_yum.txt', artifacts):
         package_filename = 'packages_yum.txt'
         flag1 = 'yum'
-        temp_packages_list = readLINESfromFile(package_filename)[2::]
+        temp_packages_list = readLINESfromFile(package_filename, artifacts)[2::]
 
     temp_packages_dict = {}
     flag2_skip = False
@@ -353,11 +457,10 @@ def inventory(to_screen=True, to_file=True, filename='result'):
 
     inventory['packages_version'] = temp_packages_dict
 
-    # OS END
-    # ----------------------------------------------------------------------
-    # NETWORK BEGIN
+# ----------------------------------------------------------------------
 
-    netstat = [record.split() for record in readLINESfromFile('netstat.txt')]
+def parse_netstat_l0(inventory, artifacts=None):
+    netstat = [record.split() for record in readLINESfromFile('netstat.txt', artifacts)]
 
     for rec in netstat:
         rec.append(int(rec[3].split(':')[-1]))
@@ -366,6 +469,7 @@ def inventory(to_screen=True, to_file=True, filename='result'):
     netstat = sorted(netstat, key=itemgetter(-1))
     netstat = sorted(netstat, key=itemgetter(-2))
 
+    ports_seen = set()
     for rec in netstat:
         id = 'port {}/{} on {}'.format(rec[0], rec[-2], rec[-1])[:-1:]
         inventory['network_listen_ports'][id] = {}
@@ -373,48 +477,54 @@ def inventory(to_screen=True, to_file=True, filename='result'):
         inventory['network_listen_ports'][id]['listen_port'] = str(rec[-2])
         inventory['network_listen_ports'][id]['listen_ip'] = rec[-1][:-1:]
         inventory['network_listen_ports'][id]['listen_pid_program'] = rec[-3]
-        if str(rec[-2]) not in inventory['network_listen_ports_list']:
+        if str(rec[-2]) not in ports_seen:
+            ports_seen.add(str(rec[-2]))
             inventory['network_listen_ports_list'].append(str(rec[-2]))
 
-    if os.path.exists('docker.json'):
-        docker_raw = readJSONfromFile('docker.json')
-        docker = []
-        docker_ports = {}
-        
-        for container in docker_raw:
-            docker_temp = {}
-            docker_temp['name'] = container['Names']
-            docker_temp['id'] = container['ID']
-            docker_temp['image'] = container['Image']
-            docker_temp['ports'] = container['Ports'].split(', ') if len(container['Ports']) > 0 else []
-            for port in docker_temp['ports']:
-                if '0.0.0.0:' in port or ':::' in port:
-                    if '0.0.0.0:' in port:
-                        name_temp_port = port.split(':')[-1].split('->')[0]
-                        name_temp_proto = port.split('/')[-1]
-                        name_temp_ip = '0.0.0.0'#port.split(':')[0]
-                    elif ':::' in port:
-                        name_temp_port = port.split(':')[-1].split('->')[0]
-                        name_temp_proto = port.split('/')[-1]+'6'
-                        name_temp_ip = '::'#port.split(':')[0]
-                    name_temp = 'port {}/{} on {}'.format(name_temp_proto, name_temp_port, name_temp_ip)
-                    if name_temp in list(inventory['network_listen_ports'].keys()):
-                        docker_ports[name_temp] = {}
-                        docker_ports[name_temp]['listen_proto'] = name_temp_proto
-                        docker_ports[name_temp]['listen_port'] = name_temp_port
-                        docker_ports[name_temp]['listen_ip'] = name_temp_ip
-                        docker_ports[name_temp]['listen_container_name'] = docker_temp['name']
-                        docker_ports[name_temp]['listen_container_image'] = docker_temp['image']
-                        docker_ports[name_temp]['listen_container_id'] = docker_temp['id']
-                        inventory['network_listen_ports'][name_temp]['listen_container_name'] = docker_temp['name']
-                        inventory['network_listen_ports'][name_temp]['listen_container_image'] = docker_temp['image']
-                        inventory['network_listen_ports'][name_temp]['listen_container_id'] = docker_temp['id']
-            docker.append(docker_temp)
-        
-        inventory['docker_containers'] = docker
+# ----------------------------------------------------------------------
+
+def parse_docker_l0(inventory, artifacts=None):
+    docker_raw = readJSONfromFile('docker.json', artifacts)
+    docker = []
+    docker_ports = {}
+    
+    for container in docker_raw:
+        docker_temp = {}
+        docker_temp['name'] = container['Names']
+        docker_temp['id'] = container['ID']
+        docker_temp['image'] = container['Image']
+        docker_temp['ports'] = container['Ports'].split(', ') if len(container['Ports']) > 0 else []
+        for port in docker_temp['ports']:
+            if '0.0.0.0:' in port or ':::' in port:
+                if '0.0.0.0:' in port:
+                    name_temp_port = port.split(':')[-1].split('->')[0]
+                    name_temp_proto = port.split('/')[-1]
+                    name_temp_ip = '0.0.0.0'#port.split(':')[0]
+                elif ':::' in port:
+                    name_temp_port = port.split(':')[-1].split('->')[0]
+                    name_temp_proto = port.split('/')[-1]+'6'
+                    name_temp_ip = '::'#port.split(':')[0]
+                name_temp = 'port {}/{} on {}'.format(name_temp_proto, name_temp_port, name_temp_ip)
+                if name_temp in inventory['network_listen_ports']:
+                    docker_ports[name_temp] = {}
+                    docker_ports[name_temp]['listen_proto'] = name_temp_proto
+                    docker_ports[name_temp]['listen_port'] = name_temp_port
+                    docker_ports[name_temp]['listen_ip'] = name_temp_ip
+                    docker_ports[name_temp]['listen_container_name'] = docker_temp['name']
+                    docker_ports[name_temp]['listen_container_image'] = docker_temp['image']
+                    docker_ports[name_temp]['listen_container_id'] = docker_temp['id']
+                    inventory['network_listen_ports'][name_temp]['listen_container_name'] = docker_temp['name']
+                    inventory['network_listen_ports'][name_temp]['listen_container_image'] = docker_temp['image']
+                    inventory['network_listen_ports'][name_temp]['listen_container_id'] = docker_temp['id']
+        docker.append(docker_temp)
+    
+    inventory['docker_containers'] = docker
+
+# ----------------------------------------------------------------------
 
-    ip_link_raw = readLINESfromFile('ip_link.txt')
-    ip_addr_raw = readLINESfromFile('ip_addr.txt')
+def parse_ip_l0(inventory, routes_output='full', artifacts=None):
+    ip_link_raw = readLINESfromFile('ip_link.txt', artifacts)
+    ip_addr_raw = readLINESfromFile('ip_addr.txt', artifacts)
 
     for temp_str in ip_link_raw:
         temp_str_by_words = temp_str.split()
@@ -422,10 +532,10 @@ def inventory(to_screen=True, to_file=True, filename='result'):
             temp_link_data = None
             id = temp_str.replace(': ', ':').split(':')[1]
             if '@' in id:
-                if id.split('@')[1] in list(inventory['network_interfaces'].keys()):
+                if id.split('@')[1] in inventory['network_interfaces']:
                     temp_link_data = id.split('@')[1]
                 id = id.split('@')[0]
-            if id not in list(inventory['network_interfaces'].keys()):
+            if id not in inventory['network_interfaces']:
                 inventory['network_interfaces'][id] = {}
             if temp_link_data is not None:
                 inventory['network_interfaces'][id]['link'] = temp_link_data
@@ -459,96 +569,35 @@ def inventory(to_screen=True, to_file=True, filename='result'):
             if id != 'lo':
                 inventory['network_all_ip_addresses'].append(temp_ip6)
     
-    raw_routes = readLINESfromFile('network_routes_all.txt')
-    
+    import routes
+    table = routes.RouteTable(routes_output)
     route_destination = None
-    for line in raw_routes:
+    for line in iterLINESfromFile('network_routes_all.txt', artifacts):
         l1 = line.split()
-        if route_destination != l1[0]:
-            t_route = {}
-            k1 = True
-        if not line.startswith('\t') and len(line) > 0:
-            route_destination = l1[0]
-            if route_destination not in list(inventory['network_routes_all'].keys()):
-                inventory['network_routes_all'][route_destination] = []
-            if 'src' in l1:
-                t_route['src'] = l1[l1.index('src') + 1]
-            if 'via' in l1:
-                t_route['gw'] = l1[l1.index('via') + 1]
-            if 'dev' in l1:
-                t_route['dev'] = l1[l1.index('dev') + 1]
-        elif line.startswith('\t') and len(line) > 0 and 'nexthop' in line.lower():
-            if 'src' in l1:
-                t_route['src'] = l1[l1.index('src') + 1]
-            if 'via' in l1:
-                t_route['gw'] = l1[l1.index('via') + 1]
-            if 'dev' in l1:
-                t_route['dev'] = l1[l1.index('dev') + 1]
+        if len(l1) == 0:
+            continue
+        if not line.startswith('\t'):
+            route_destination = l1[1] if l1[0] in routes.ROUTE_TYPES else l1[0]
+        elif 'nexthop' not in line.lower():
+            continue
+        t_route = {}
+        if 'src' in l1:
+            t_route['src'] = l1[l1.index('src') + 1]
+        if 'via' in l1:
+            t_route['gw'] = l1[l1.index('via') + 1]
+        if 'dev' in l1:
+            t_route['dev'] = l1[l1.index('dev') + 1]
         if len(t_route) > 0:
-            if 'dev' in list(t_route.keys()):
-                if t_route['dev'] in inventory['network_interfaces']:
-                    if 'routes_to' not in list(inventory['network_interfaces'][t_route['dev']].keys()):
-                        inventory['network_interfaces'][t_route['dev']]['routes_to'] = []
-                    inventory['network_interfaces'][t_route['dev']]['routes_to'].append(route_destination)
-            if k1:
-                inventory['network_routes_all'][route_destination].append(t_route)
-                k1 = False
-
-    inventory['network_all_ip_addresses'].sort()
-    inventory['network_interfaces'].pop('lo')
-
-    # NETWORK END
-    # ----------------------------------------------------------------------
-    # LSHW & LSPCI & STORCLI BEGIN
+            table.add(route_destination, t_route)
+        elif not line.startswith('\t'):
+            table.add(route_destination)
 
-    parse_lshw_l0(readJSONfromFile('lshw.json'), inventory)
+    routes.routes_to_inventory(table, inventory, routes_output)
 
-    if inventory['memory_size_in_gb'] == 0:
-        for module in inventory['memory_modules']:
-            inventory['memory_size_in_gb'] += module['size_in_gb']
-
-    if os.path.exists('storcli-controllers.txt'):
-        t_controller = {}
-        for line in readLINESfromFile('storcli-controllers.txt'):
-            t1 = line.split('=')
-            t_controller[t1[0].lower()] = t1[1]
-        
-        for controller in inventory['storages']:
-            if 'megaraid' in controller['model'].lower():
-                controller['model_by_storcli'] = t_controller['model']
-                controller['serial'] = t_controller['serial number']
-
-    if os.path.exists('storcli-disks.json'):
-        parse_storcli_l0(readJSONfromFile('storcli-disks.json'), inventory)
-
-    if os.path.exists('megacli-disks.txt'):
-        temp_disk = {}
-        for line in readLINESfromFile('megacli-disks.txt'):
-            temp = line.split(':')
-            if temp[0].lower() == 'wwn':
-                temp_disk['wwn'] = temp[1].strip().upper()
-            elif temp[0].lower() == 'raw size':
-                temp_disk['size_raw'] = temp[1].strip()
-            elif temp[0].lower() == 'inquiry data':
-                t_line = temp[1].split()
-                temp_disk['serial'] = t_line[0]
-                temp_disk['fw_version'] = t_line[-1]
-                temp_disk['model'] = ' '.join(t_line[1:-1:])
-                inventory['disks'].append(temp_disk)
-                temp_disk = {}
-    
-    if os.path.exists('megacli-controllers.txt'):
-        t_controller = {}
-        for line in readLINESfromFile('megacli-controllers.txt'):
-            t1 = line.split(':')
-            t_controller[t1[0].lower().strip()] = t1[1].strip()
-        
-        for controller in inventory['storages']:
-            if 'megaraid' in controller['model'].lower():
-                controller['model_by_storcli'] = t_controller['product name']
-                controller['serial'] = t_controller['serial no']
+# ----------------------------------------------------------------------
 
-    for line in readLINESfromFile('volumes.txt')[1::]:
+def parse_volumes_l0(inventory, artifacts=None):
+    for line in readLINESfromFile('volumes.txt', artifacts)[1::]:
         temp_volume = {}
         q = 1
         for rec in line.split():
@@ -573,16 +622,346 @@ def inventory(to_screen=True, to_file=True, filename='result'):
                 temp_volume['size_in_gb'] = None
         inventory['volumes'].append(temp_volume)
 
+# ----------------------------------------------------------------------
+
+def new_inventory():
+    inventory = {}
+
+    inventory['is_vm'] = False
+
+    inventory['date_of_inventory'] = None
+    inventory['script_version'] = None
+
+    inventory['os_hostname'] = None
+    inventory['os_version'] = None
+    inventory['os_core'] = None
+    inventory['os_users'] = []
+    inventory['os_users_sudo'] = []
+    inventory['os_users_wheel'] = []
+    inventory['os_users_ssh'] = []
+    inventory['os_ssh_port'] = None
+
+    inventory['os_ssl_version'] = None
+    inventory['os_ssh_version'] = None
+
+    inventory['packages_version'] = {}
+
+    inventory['system_vendor'] = None
+    inventory['system_platform'] = None
+    inventory['system_platform_version'] = None
+    inventory['system_serial'] = None
+
+    inventory['cpu_model'] = None
+    inventory['cpu_count'] = 0
+    inventory['cpu_count_of_all_cores'] = 0
+
+    inventory['mb_vendor'] = None
+    inventory['mb_model'] = None
+    inventory['mb_version'] = None
+    inventory['mb_serial'] = None
+
+    inventory['mb_bios_vendor'] = None
+    inventory['mb_bios_version'] = None
+    inventory['mb_bios_date'] = None
+
+    inventory['memory_size_in_gb'] = 0
+    inventory['memory_modules_count'] = 0
+    inventory['memory_modules'] = []
+
+    inventory['vga'] = []
+
+    inventory['storages'] = []
+
+    inventory['disks'] = []
+
+    inventory['volumes'] = []
+
+    inventory['psu_count'] = 0
+    inventory['psu'] = []
+
+    inventory['network_all_ip_addresses'] = []
+    inventory['network_routes_all'] = {}
+    inventory['network_interfaces'] = {}
+    inventory['network_listen_ports_list'] = []
+    inventory['network_listen_ports'] = {}
+    inventory['network_nonstd_id'] = 0
+
+    inventory['docker_containers'] = []
+
+    return inventory
+
+# ----------------------------------------------------------------------
+
+def parser_digest():
+    # Parsed output kept in the collector cache is only reused by the
+    # parsers that made it. inventory2.sh copies the scripts on each run,
+    # so their content is hashed, not their mtime.
+    import hashlib
+    import packages
+    temp_digest = hashlib.sha256()
+    for module_filename in (__file__, packages.__file__):
+        with open(module_filename, 'rb') as f:
+            temp_digest.update(f.read())
+    return temp_digest.hexdigest()
+
+# ----------------------------------------------------------------------
+
+class ParsedCache(object):
+    # What a stage made of an artifact the collector cache served, kept
+    # under the cache key of the artifact.
+
+    def __init__(self, cache_dir, cache_max_bytes=None, collector_results=None):
+        import cache as cache_module
+        self.cache = cache_module.CollectorCache(cache_dir, cache_max_bytes or cache_module.DEFAULT_CACHE_MAX_BYTES)
+        self.collector_results = collector_results or {}
+        self.digest = parser_digest()
+
+    def parser(self, stage, options):
+        return {'stage': stage, 'options': options, 'parser': self.digest}
+
+    def get(self, collector, stage, options=None):
+        result = self.collector_results.get(collector) or {}
+        if not result.get('cached'):
+            return None
+        return self.cache.get_parsed(collector, result['cache_key'], self.parser(stage, options))
+
+    def put(self, collector, stage, data, options=None):
+        result = self.collector_results.get(collector) or {}
+        if not result.get('cache_key'):
+            return
+        try:
+            self.cache.put_parsed(collector, result['cache_key'], self.parser(stage, options), data)
+        except (IOError, OSError):
+            pass
+
+# ----------------------------------------------------------------------
+
+def inventory(to_screen=True, to_file=True, filename='result', routes_output='full',
+              packages_output='version', state_filename=None, meta=False,
+              collector_results=None, profile_dir=None, output_format='json', compression=None,
+              sections=None, skip_sections=None, spool_dir=None, artifacts=None,
+              cache_dir=None, cache_max_bytes=None):
+
+    # ----------------------------------------------------------------------
+    # PRERUN BEGIN
+
+    stages = instrument.StageMeter(profile_dir)
+    stages.begin('prerun')
+
+    selected, needed = sections_module.resolve(sections, skip_sections)
+
+    # Collectors that missed the deadline, unless a fallback collector stood
+    # in for them, are listed in _timed_out. A section is only left out
+    # when one it is read from is missing, a collector that completes it
+    # (RAID tools, SMART) only makes it partial.
+    timed_out = sorted(name for name, result in (collector_results or {}).items()
+                       if result['status'] == 'timeout' and not result.get('recovered'))
+    late, partial = sections_module.missing_sections(timed_out, needed)
+    selected.difference_update(late)
+    needed.difference_update(late)
+
+    inventory = new_inventory()
+
+    # Artifacts served by the collector cache were parsed by an earlier run,
+    # their sections are taken from there.
+    parsed_cache = None
+    if cache_dir and collector_results and artifacts is None:
+        parsed_cache = ParsedCache(cache_dir, cache_max_bytes, collector_results)
+
+    # PRERUN END
+    # ----------------------------------------------------------------------
+    # OS BEGIN
+
+    stages.begin('os')
+
+    inventory['date_of_inventory'] = readLINEfromFile('date_of_inventory.txt', artifacts)
+    inventory['script_version'] = readLINEfromFile('VERSION', artifacts)
+
+    if 'os' in needed and artifact_exists('os.json', artifacts):
+        import osinfo
+        osinfo.os_to_inventory(readJSONfromFile('os.json', artifacts), inventory)
+    elif 'os' in needed:
+        inventory['os_hostname'] = readLINEfromFile('os_hostname.txt', artifacts)
+        inventory['os_version'] = readLINEfromFile('os_version.txt', artifacts)
+        inventory['os_core'] = readLINEfromFile('os_core.txt', artifacts)
+        inventory['os_users'] =  sorted(readLINESfromFile('os_users.txt', artifacts))
+    
+        temp_users_line = readLINEfromFile('os_users_sudo.txt', artifacts)
+        if len(temp_users_line) > 0:
+            inventory['os_users_sudo'] = sorted(temp_users_line.split(','))
+    
+        temp_users_line = readLINEfromFile('os_users_wheel.txt', artifacts)
+        if len(temp_users_line) > 0:    
+            inventory['os_users_wheel'] = sorted(temp_users_line.split(','))
+
+        inventory['os_users_ssh'] = sorted(readLINEfromFile('os_users_ssh.txt', artifacts).split())
+        inventory['os_ssh_port'] = int(readLINEfromFile('os_ssh_port.txt', artifacts))
+        inventory['os_ssl_version'] = readLINEfromFile('os_ssl_version.txt', artifacts)
+        inventory['os_ssh_version'] = readLINEfromFile('os_ssh_version.txt', artifacts)
+
+    if 'packages' in needed:
+        if artifact_exists('packages.json', artifacts):
+            temp_collector = 'packages'
+        elif artifact_exists('packages_apt.txt', artifacts):
+            temp_collector = 'packages_apt'
+        else:
+            temp_collector = 'packages_yum'
+        temp_parsed = parsed_cache.get(temp_collector, 'packages', packages_output) if parsed_cache else None
+        if temp_parsed is not None:
+            inventory.update(temp_parsed)
+        else:
+            if temp_collector == 'packages':
+                import packages
+                packages.packages_to_inventory(readJSONfromFile('packages.json', artifacts), inventory, packages_output)
+            else:
+                parse_packages_l0(inventory, artifacts)
+            if parsed_cache:
+                parsed_cache.put(temp_collector, 'packages',
+                                 dict((key, inventory[key]) for key in ('packages_version', 'packages')
+                                      if key in inventory), packages_output)
+
+    # OS END
+    # ----------------------------------------------------------------------
+    # NETWORK BEGIN
+
+    stages.begin('network')
+
+    if 'listen_ports' in needed:
+        if artifact_exists('listen_ports.json', artifacts):
+            listen_ports = readJSONfromFile('listen_ports.json', artifacts)
+            inventory['network_listen_ports'] = listen_ports['network_listen_ports']
+            inventory['network_listen_ports_list'] = listen_ports['network_listen_ports_list']
+        else:
+            parse_netstat_l0(inventory, artifacts)
+
+    if 'containers' in needed:
+        if artifact_exists('containers.json', artifacts):
+            import containers
+            containers.containers_to_inventory(readJSONfromFile('containers.json', artifacts), inventory)
+        elif artifact_exists('docker.json', artifacts):
+            parse_docker_l0(inventory, artifacts)
+
+    if 'network' in needed:
+        if artifact_exists('network.json', artifacts):
+            network = readJSONfromFile('network.json', artifacts)
+            inventory['network_interfaces'] = network['network_interfaces']
+            inventory['network_all_ip_addresses'] = network['network_all_ip_addresses']
+            inventory['network_routes_all'] = network['network_routes_all']
+            if 'network_routes_summary' in network:
+                inventory['network_routes_summary'] = network['network_routes_summary']
+        else:
+            parse_ip_l0(inventory, routes_output, artifacts)
+
+        inventory['network_all_ip_addresses'].sort()
+        inventory['network_interfaces'].pop('lo')
+
+    if 'netns' in needed and artifact_exists('netns.json', artifacts):
+        inventory['network_namespaces'] = readJSONfromFile('netns.json', artifacts)['network_namespaces']
+
+    # NETWORK END
+    # ----------------------------------------------------------------------
+    # LSHW & LSPCI & STORCLI BEGIN
+
+    stages.begin('hardware')
+
+    if 'hardware' in needed:
+        temp_collector = 'hardware' if artifact_exists('hardware.json', artifacts) else 'lshw'
+        temp_nodes = parsed_cache.get(temp_collector, 'hardware') if parsed_cache else None
+        if temp_nodes is not None:
+            for lshw_node in temp_nodes:
+                parse_lshw_l1(lshw_node, inventory)
+        else:
+            temp_nodes = [] if parsed_cache else None
+            read_lshw(temp_collector + '.json', inventory, artifacts, temp_nodes)
+            if parsed_cache:
+                parsed_cache.put(temp_collector, 'hardware', temp_nodes)
+
+        if inventory['memory_size_in_gb'] == 0:
+            for module in inventory['memory_modules']:
+                inventory['memory_size_in_gb'] += module['size_in_gb']
+
+        if artifact_exists('storcli-controllers.txt', artifacts):
+            t_controller = {}
+            for line in readLINESfromFile('storcli-controllers.txt', artifacts):
+                t1 = line.split('=')
+                t_controller[t1[0].lower()] = t1[1]
+        
+            for controller in inventory['storages']:
+                if 'megaraid' in controller['model'].lower():
+                    controller['model_by_storcli'] = t_controller['model']
+                    controller['serial'] = t_controller['serial number']
+
+    if 'disks' in needed:
+        if artifact_exists('storcli-disks.json', artifacts):
+            parse_storcli_l0(readJSONfromFile('storcli-disks.json', artifacts), inventory)
+
+        if artifact_exists('megacli-disks.txt', artifacts):
+            temp_disk = {}
+            for line in readLINESfromFile('megacli-disks.txt', artifacts):
+                temp = line.split(':')
+                if temp[0].lower() == 'wwn':
+                    temp_disk['wwn'] = temp[1].strip().upper()
+                elif temp[0].lower() == 'raw size':
+                    temp_disk['size_raw'] = temp[1].strip()
+                elif temp[0].lower() == 'inquiry data':
+                    t_line = temp[1].split()
+                    temp_disk['serial'] = t_line[0]
+                    temp_disk['fw_version'] = t_line[-1]
+                    temp_disk['model'] = ' '.join(t_line[1:-1:])
+                    inventory['disks'].append(temp_disk)
+                    temp_disk = {}
+    
+    if 'hardware' in needed:
+        if artifact_exists('megacli-controllers.txt', artifacts):
+            t_controller = {}
+            for line in readLINESfromFile('megacli-controllers.txt', artifacts):
+                t1 = line.split(':')
+                t_controller[t1[0].lower().strip()] = t1[1].strip()
+        
+            for controller in inventory['storages']:
+                if 'megaraid' in controller['model'].lower():
+                    controller['model_by_storcli'] = t_controller['product name']
+                    controller['serial'] = t_controller['serial no']
+
+    if 'disks' in needed and artifact_exists('smart.json', artifacts):
+        import smart
+        smart.smart_to_inventory(readJSONfromFile('smart.json', artifacts), inventory)
+
+    if 'volumes' in needed:
+        if artifact_exists('volumes.json', artifacts):
+            import volumes
+            volumes.volumes_to_inventory(readJSONfromFile('volumes.json', artifacts), inventory)
+        elif artifact_exists('volumes.txt', artifacts):
+            parse_volumes_l0(inventory, artifacts)
+
     # LSHW & LSPCI & STORCLI  END
     # ----------------------------------------------------------------------
     # POSTRUN BEGIN
 
+    stages.begin('postrun')
+
     inventory.pop('network_nonstd_id')
     for interface in inventory['network_interfaces'].values():
         if 'ips' in list(interface.keys()):
             if len(interface['ips']) == 0:
                 interface.pop('ips')
 
+    keys = None
+    if selected != set(sections_module.SECTIONS):
+        keys = sections_module.section_keys(selected)
+        for key in list(inventory):
+            if key not in keys:
+                inventory.pop(key)
+
+    if len(timed_out) > 0:
+        inventory['_timed_out'] = {'collectors': timed_out, 'sections': sorted(late),
+                                   'partial_sections': sorted(partial.intersection(selected))}
+
+    stages.end()
+
+    if meta == True:
+        inventory['_meta'] = instrument.meta_block(collector_results, stages.stages)
+
     # POSTRUN END
     # ----------------------------------------------------------------------
     # OUTPUT RESULTS BEGIN
@@ -590,14 +969,269 @@ def inventory(to_screen=True, to_file=True, filename='result'):
     if to_screen == True:
         print(json.dumps(inventory, ensure_ascii='UTF-8', indent=4))
 
+    # The change set is written before the state, a run that fails in
+    # between reports the same changes again.
+    changes = None
+    fragments = None
+    if state_filename is not None:
+        import incremental
+        changes, state = incremental.incremental(inventory, state_filename, keys)
+        if to_file == True:
+            fragments = output.Fragments(state_filename + '.fragments', output_format, state['sections'])
+
     if to_file == True:
-        dumpJSONtoFile(filename, inventory)
+        output.write_inventory(filename, inventory, output_format, compression, fragments)
+
+    if changes is not None:
+        dumpJSONtoFile(filename + '.patch', changes, indent=None)
+        incremental.write_state(state_filename, state)
+
+    # The result is only spooled here, it is sent once the run is done.
+    if spool_dir is not None:
+        import push
+        try:
+            push.spool_inventory(spool_dir, inventory)
+        except (IOError, OSError, ValueError) as e:
+            sys.stderr.write('{}\n'.format(e))
 
     # OUTPUT RESULTS END
     # ----------------------------------------------------------------------
 
+    return inventory
+
+# ----------------------------------------------------------------------
+
+def parse_sections(values):
+    # --only/--skip can be repeated and take comma separated lists.
+    if values is None:
+        return None
+    return [name.strip() for value in values for name in value.split(',') if name.strip()]
+
+# ----------------------------------------------------------------------
+
+def parse_headers(values):
+    headers = {}
+    for value in values or []:
+        name, _, header = value.partition(':')
+        headers[name.strip()] = header.strip()
+    return headers
+
+# ----------------------------------------------------------------------
+
+def parse_intervals(values):
+    intervals = {}
+    for value in values or []:
+        name, _, seconds = value.partition('=')
+        intervals[name] = int(seconds)
+    return intervals
+
+# ----------------------------------------------------------------------
+
+def push_spool(args):
+    # A failed push only leaves the results in the spool for the next run.
+    import push
+    try:
+        push.push_spool(args.push, args.spool_dir, batch_size=args.push_batch, jitter=args.push_jitter,
+                        timeout=args.push_timeout, headers=parse_headers(args.push_header))
+    except (IOError, OSError, ValueError) as e:
+        sys.stderr.write('{}\n'.format(e))
+
+# ----------------------------------------------------------------------
+
 def main():
-    inventory(to_screen=False, to_file=True, filename='result')
+    parser = argparse.ArgumentParser(description='Linux Inventory Tool')
+    parser.add_argument('--collect', action='store_true',
+                        help='run the collectors in the current directory before parsing')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of collectors running at the same time')
+    parser.add_argument('--net-source', choices=['native', 'tools'], default='native',
+                        help='read network data from rtnetlink and /proc or from ip and netstat output')
+    parser.add_argument('--hw-source', choices=['lshw', 'sysfs'], default='lshw',
+                        help='read hardware data from lshw or straight from sysfs and SMBIOS')
+    parser.add_argument('--packages-source', choices=['native', 'tools'], default='native',
+                        help='read installed packages from the dpkg/rpm database or from apt and yum output')
+    parser.add_argument('--packages', choices=['version', 'full'], default='version',
+                        help='keep only package versions or also epoch, release and arch')
+    parser.add_argument('--containers-source', choices=['native', 'tools'], default='native',
+                        help='read containers from the docker/podman API socket or from docker ps output')
+    parser.add_argument('--volumes-source', choices=['native', 'tools'], default='native',
+                        help='read block devices from sysfs and mountinfo or from lsblk output')
+    parser.add_argument('--os-source', choices=['native', 'tools'], default='native',
+                        help='read OS identity from its files or from hostname, uname, grep, openssl and ssh output')
+    parser.add_argument('--users-source', choices=['files', 'nss'], default='files',
+                        help='list users from /etc/passwd or from all NSS sources (LDAP, SSSD)')
+    parser.add_argument('--users-limit', type=int, default=10000,
+                        help='stop listing users after this many')
+    parser.add_argument('--smart-workers', type=int, default=8,
+                        help='number of smartctl processes running at the same time, 0 to skip disk health')
+    parser.add_argument('--smart-timeout', type=int, default=30,
+                        help='timeout of smartctl for one device in seconds')
+    parser.add_argument('--netns-workers', type=int, default=0,
+                        help='also collect every other network namespace, this many at the same time, '
+                             '0 for only the namespace of the tool')
+    parser.add_argument('--cache-dir', default=None,
+                        help='keep collector artifacts in this directory and reuse them while they are valid')
+    parser.add_argument('--cache-max-size', type=int, default=64,
+                        help='size limit of the cache directory in MB')
+    parser.add_argument('--only', action='append', default=None, metavar='SECTION',
+                        help='collect only these sections and the sections they need ({}), can be repeated'.format(
+                            ', '.join(sorted(sections_module.SECTIONS))))
+    parser.add_argument('--skip', action='append', default=None, metavar='SECTION',
+                        help='do not collect these sections, can be repeated')
+    parser.add_argument('--nice', type=int, default=None,
+                        help='run the collectors at this niceness (0-19)')
+    parser.add_argument('--ionice', choices=['idle', 'best-effort'], default=None,
+                        help='run the collectors in this I/O scheduling class')
+    parser.add_argument('--ionice-level', type=int, choices=range(8), default=7,
+                        help='priority in the best-effort I/O class, 7 is the lowest')
+    parser.add_argument('--cpu-limit', type=int, default=None, metavar='PERCENT',
+                        help='cap the CPU time of the whole run with a cgroup, 100 is one CPU')
+    parser.add_argument('--memory-limit', type=int, default=None, metavar='MB',
+                        help='cap the memory of the whole run with a cgroup')
+    parser.add_argument('--deadline', type=int, default=None, metavar='SECONDS',
+                        help='stop the collectors after this many seconds and write the sections that are done')
+    parser.add_argument('--state', default=None,
+                        help='keep section hashes in this file and also write the changes since the last run '
+                             'to <result>.patch.json, not with --agent')
+    parser.add_argument('--meta', action='store_true',
+                        help='add a _meta block with timings and resource usage of collectors and stages')
+    parser.add_argument('--profile-dir', default=None,
+                        help='write cProfile and tracemalloc dumps of every parse stage to this directory')
+    parser.add_argument('--routes', choices=['full', 'summary', 'auto'], default='full',
+                        help='list every route or only a summary with per-device route counts')
+    parser.add_argument('--format', choices=output.FORMATS, default='json',
+                        help='encoding of the result file: indented or compact JSON, one JSON line per section, '
+                             'MessagePack or CBOR')
+    parser.add_argument('--compress', choices=output.COMPRESSIONS, default=None,
+                        help='compress the result file')
+    parser.add_argument('--push', default=None, metavar='URL',
+                        help='also send the result to this http(s) endpoint, through a local spool')
+    parser.add_argument('--spool-dir', default='/var/spool/inventory2',
+                        help='results wait here until the endpoint has accepted them')
+    parser.add_argument('--push-batch', type=int, default=20,
+                        help='number of spooled results sent in one request')
+    parser.add_argument('--push-jitter', type=int, default=60, metavar='SECONDS',
+                        help='wait a random time up to this long before pushing')
+    parser.add_argument('--push-timeout', type=int, default=30, metavar='SECONDS',
+                        help='timeout of one push request')
+    parser.add_argument('--push-header', action='append', default=None, metavar='NAME:VALUE',
+                        help='extra header of the push requests, like Authorization, can be repeated')
+    parser.add_argument('--push-later', action='store_true',
+                        help='with --push, only spool the result, it is sent by --flush-spool or the next run')
+    parser.add_argument('--flush-spool', action='store_true',
+                        help='with --push, only send the spooled results and exit')
+    parser.add_argument('--bundle-dir', default=None,
+                        help='keep the raw collector outputs of the run as one <host>.<time>.tar.gz in this directory')
+    parser.add_argument('--replay', nargs='+', default=None, metavar='BUNDLE',
+                        help='parse these bundles (or all bundles in these directories) again instead of collecting')
+    parser.add_argument('--replay-dir', default='replay',
+                        help='directory the replayed results are written to')
+    parser.add_argument('--agent', action='store_true',
+                        help='stay resident, refresh the collectors on a schedule and answer queries')
+    parser.add_argument('--listen', default=None,
+                        help='unix socket path or host:port the agent answers on (default: inventory2.sock)')
+    parser.add_argument('--listen-remote', action='store_true',
+                        help='let the agent answer on a host:port that is not loopback, without authentication')
+    parser.add_argument('--refresh', action='append', default=None, metavar='COLLECTOR=SECONDS',
+                        help='agent refresh interval of a collector, can be repeated')
+    args = parser.parse_args()
+
+    # Every agent refresh would replace the change set and move the state
+    # on, consumers would miss the changes in between.
+    if args.agent and args.state:
+        parser.error('--state can not be used with --agent')
+    if (args.push_later or args.flush_spool) and not args.push:
+        parser.error('--push-later and --flush-spool need --push')
+    if args.agent and args.listen:
+        import agent
+        try:
+            agent.check_listen(args.listen, args.listen_remote)
+        except ValueError as e:
+            parser.error('--listen {}, use --listen-remote to allow it'.format(e))
+    try:
+        output.check_compression(args.compress)
+    except RuntimeError as e:
+        parser.error('--compress {}: {}'.format(args.compress, e))
+
+    only = parse_sections(args.only)
+    skip = parse_sections(args.skip)
+    try:
+        needed = sections_module.resolve(only, skip)[1]
+    except ValueError as e:
+        parser.error(str(e))
+    names = sections_module.section_collectors(needed)
+
+    options = {'net_source': args.net_source, 'hw_source': args.hw_source,
+               'packages_source': args.packages_source, 'containers_source': args.containers_source,
+               'volumes_source': args.volumes_source, 'os_source': args.os_source,
+               'users_source': args.users_source, 'users_limit': args.users_limit,
+               'routes_output': args.routes, 'cache_dir': args.cache_dir,
+               'cache_max_bytes': args.cache_max_size * 2 ** 20,
+               'smart_workers': args.smart_workers, 'smart_timeout': args.smart_timeout,
+               'netns_workers': args.netns_workers}
+
+    # Priorities are set before the first collector thread is started.
+    import governor
+    governor.apply_priority(args.nice, args.ionice, args.ionice_level)
+    cgroup = governor.Cgroup(args.cpu_limit, args.memory_limit)
+    cgroup.enter()
+    try:
+        run(args, options, names, only, skip)
+    finally:
+        cgroup.leave()
+
+# ----------------------------------------------------------------------
+
+def run(args, options, names, only, skip):
+    if args.flush_spool:
+        push_spool(args)
+        return
+
+    if args.replay:
+        import bundle
+        failed = bundle.replay(args.replay, args.replay_dir, workers=args.workers,
+                               inventory_options={'routes_output': args.routes, 'packages_output': args.packages,
+                                                  'output_format': args.format, 'compression': args.compress,
+                                                  'sections': only, 'skip_sections': skip})
+        if failed > 0:
+            sys.exit(1)
+        return
+
+    import collectors
+    if args.agent:
+        import agent
+        build = lambda collector_results: inventory(to_screen=False, to_file=False, routes_output=args.routes,
+                                                    packages_output=args.packages,
+                                                    meta=args.meta, collector_results=collector_results,
+                                                    sections=only, skip_sections=skip,
+                                                    cache_dir=args.cache_dir,
+                                                    cache_max_bytes=options['cache_max_bytes'])
+        agent.run_agent(build, options, workers=args.workers or collectors.DEFAULT_WORKERS,
+                        listen=args.listen or agent.DEFAULT_LISTEN, intervals=parse_intervals(args.refresh),
+                        names=names, allow_remote=args.listen_remote)
+        return
+
+    collector_results = None
+    if args.collect:
+        deadline = time.time() + args.deadline if args.deadline else None
+        collector_results = collectors.run_collectors(names=names,
+                                                      workers=args.workers or collectors.DEFAULT_WORKERS,
+                                                      options=options, deadline=deadline)
+
+    inventory(to_screen=False, to_file=True, filename='result', routes_output=args.routes,
+              packages_output=args.packages, state_filename=args.state, meta=args.meta,
+              collector_results=collector_results, profile_dir=args.profile_dir,
+              output_format=args.format, compression=args.compress, sections=only, skip_sections=skip,
+              spool_dir=args.spool_dir if args.push else None,
+              cache_dir=args.cache_dir, cache_max_bytes=options['cache_max_bytes'])
+
+    if args.bundle_dir:
+        import bundle
+        bundle.write_bundle(args.bundle_dir, os.uname().nodename, collector_results)
+
+    # Last, the push may wait out its jitter.
+    if args.push and not args.push_later:
+        push_spool(args)
 
 if __name__ == '__main__':
     main()
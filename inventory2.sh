@@ -13,10 +13,7 @@
 
 set -Eo pipefail
 
-start_dir=$(dirname ${0})
-if [ "$start_dir" = "." ]; then
-    start_dir=$(pwd)
-fi
+start_dir=$(cd "$(dirname "${0}")" && pwd)
 
 logfile=$start_dir/inventory2.log
 blockfile=$start_dir/blockfile.lock
@@ -47,70 +44,83 @@ if [[ ! -d ${full_work_path} ]]; then
 fi
 
 cp -f $inventory_script_version_path $full_work_path
-cp -f $inventory_script_file_path $full_work_path
+cp -f $start_dir/*.py $full_work_path
 cd $full_work_path
 
 inventory_script_file_path=$full_work_path/$inventory_script_file
 
-date +"%Y-%m-%d | %H:%M" > date_of_inventory.txt
-
-dmesg -n 1
-lshw -json > lshw.json
-dmesg -n 4
-
-hostname > os_hostname.txt
-grep -i pretty /etc/os-release | awk -F\" '{print $2}' > os_version.txt
-uname -r > os_core.txt
-awk -F: '{print $1}' /etc/passwd | grep -iv nobody > os_users.txt
-cat /etc/group | grep -i sudo | awk -F":" '{print $NF}' > os_users_sudo.txt
-cat /etc/group | grep -i wheel | awk -F":" '{print $NF}' > os_users_wheel.txt
-grep "Port " /etc/ssh/sshd_config | awk '{print $NF}' > os_ssh_port.txt
-cat /etc/ssh/sshd_config | grep -i allowusers | cut -d' ' -f2- > os_users_ssh.txt
-openssl version > os_ssl_version.txt
-ssh -V > os_ssh_version.txt 2>&1
-
-if (command -v docker &>>$logfile) && (docker ps &>>$logfile); then
-    docker ps --no-trunc --format '{{json .}}' | jq -s '.' | sed 's/\\\"//g' | jq '.' > docker.json
+# The script runs in the work directory, which is removed at the end. Relative
+# paths of the options that keep files between runs (bundles, state, cache)
+# are taken from the script directory instead.
+path_options=" --bundle-dir --state --cache-dir --profile-dir --spool-dir --replay-dir "
+
+absolute_path() {
+    if [[ $1 == /* ]]; then
+        echo "$1"
+    else
+        echo "$start_dir/$1"
+    fi
+}
+
+args=()
+expect_path=no
+replay_dir_given=no
+replay_given=no
+push_given=no
+for arg in "$@"; do
+    if [[ $expect_path == yes ]]; then
+        arg=$(absolute_path "$arg")
+        expect_path=no
+    elif [[ $expect_path == many && $arg != -* ]]; then
+        arg=$(absolute_path "$arg")
+    elif [[ $path_options == *" $arg "* ]]; then
+        expect_path=yes
+    elif [[ $arg == --*=* && $path_options == *" ${arg%%=*} "* ]]; then
+        arg="${arg%%=*}=$(absolute_path "${arg#*=}")"
+    elif [[ $arg == --replay ]]; then
+        # Bundles to replay, up to the next option.
+        expect_path=many
+    else
+        expect_path=no
+    fi
+    [[ $arg == --replay ]] && replay_given=yes
+    [[ $arg == --push || $arg == --push=* ]] && push_given=yes
+    [[ $arg == --replay-dir || $arg == --replay-dir=* ]] && replay_dir_given=yes
+    args+=("$arg")
+done
+if [[ $replay_given == yes && $replay_dir_given == no ]]; then
+    args+=(--replay-dir "$start_dir/replay")
 fi
 
-netstat -tulpen | grep -e 'tcp' -e 'udp' > netstat.txt
-ip link > ip_link.txt
-ip addr > ip_addr.txt
-ip route | sed -e 's/scope link //g' -e 's/proto //g' -e 's/ linkdown//g' -e 's/ kernel//g' -e 's/ static//g' > network_routes_all.txt
-
-lsblk -a -P -p -o NAME,FSTYPE,MOUNTPOINT,SIZE,TYPE | grep -iv loop | sed 's/\"//g'> volumes.txt
-
-if test -f "/usr/local/bin/MegaCli"; then
-    megacli="/usr/local/bin/MegaCli";
-    $megacli -AdpAllInfo -aALL -NoLog | grep -i -e "Product Name" -e "Serial No" > megacli-controllers.txt;
-    $megacli -PDList -aAll -NoLog | grep -i -e "wwn" -e "inquiry" -e "Raw Size" > megacli-disks.txt;
-elif test -f "/opt/MegaRAID/storcli/storcli64"; then
-    storcli="/opt/MegaRAID/storcli/storcli64";
-    $storcli \/call show all nolog | grep -i -e "model = " -e "serial number = " -e "pci address" | grep -iv support | sed 's/ = /=/g' > storcli-controllers.txt;
-    $storcli \/call \/eall \/sall show all J nolog > storcli-disks.json;
-elif test -f "/opt/MegaRAID/storcli/storcli"; then
-    storcli="/opt/MegaRAID/storcli/storcli";
-    $storcli \/call show all nolog | grep -i -e "model = " -e "serial number = " -e "pci address" | grep -iv support | sed 's/ = /=/g' > storcli-controllers.txt;
-    $storcli \/call \/eall \/sall show all J nolog > storcli-disks.json;
+if command -v python3 &>>$logfile; then
+    python_bin=python3
+else
+    python_bin=python
 fi
 
-if command -v apt &>>$logfile; then
-    apt --installed list > packages_apt.txt 2>>$logfile
-elif command -v yum &>>$logfile; then
-    yum list installed > packages_yum.txt 2>>$logfile
+# The result is only spooled by the run. It is sent at the end, after the lock
+# is released, so the push jitter does not hold up the next run.
+push_later=()
+if [[ $push_given == yes ]]; then
+    push_later=(--push-later)
 fi
 
-if command -v python3 &>>$logfile; then
-    python3 $inventory_script_file_path &>>$logfile
-else
-    python $inventory_script_file_path &>>$logfile
-fi
+$python_bin $inventory_script_file_path --collect "${args[@]}" "${push_later[@]}" &>>$logfile
 
 for file in $(ls -la $full_work_path | awk '{print $NF}' | grep -i result); do
     cp -f $file $start_dir
 done
 
-cat $start_dir/result.json | jq --indent 4
+# result.json is already indented, other formats are not printed.
+if [[ -f $start_dir/result.json ]]; then
+    cat $start_dir/result.json
+fi
 
 cd $start_dir
-rm -rf $full_work_path
\ No newline at end of file
+rm -rf $full_work_path
+
+if [[ $push_given == yes ]]; then
+    flock -u 200
+    exec 200>&-
+    $python_bin $start_dir/$inventory_script_file --flush-spool "${args[@]}" &>>$logfile
+fi
\ No newline at end of file
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - rtnetlink
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Minimal rtnetlink client: link, address and route dumps are read straight
+# from the kernel instead of scraping the text output of `ip`.
+
+import os
+import socket
+import struct
+
+NETLINK_ROUTE = 0
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+NLM_F_REQUEST = 0x01
+NLM_F_MULTI = 0x02
+NLM_F_DUMP = 0x300
+
+RTM_NEWLINK = 16
+RTM_GETLINK = 18
+RTM_NEWADDR = 20
+RTM_GETADDR = 22
+RTM_NEWROUTE = 24
+RTM_GETROUTE = 26
+
+IFLA_ADDRESS = 1
+IFLA_IFNAME = 3
+IFLA_LINK = 5
+IFLA_MASTER = 10
+IFLA_LINK_NETNSID = 37
+IFLA_PROP_LIST = 52
+IFLA_ALT_IFNAME = 53
+
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+RTA_DST = 1
+RTA_OIF = 4
+RTA_GATEWAY = 5
+RTA_PREFSRC = 7
+RTA_MULTIPATH = 9
+RTA_TABLE = 15
+
+RT_TABLE_MAIN = 254
+
+RTN_UNICAST = 1
+
+ARPHRD_ETHER = 1
+
+NLMSGHDR = struct.Struct('=IHHII')
+NLATTR = struct.Struct('=HH')
+IFINFOMSG = struct.Struct('=BxHiII')
+IFADDRMSG = struct.Struct('=BBBBi')
+RTMSG = struct.Struct('=BBBBBBBBI')
+RTNEXTHOP = struct.Struct('=HBBi')
+
+RECV_BUFFER = 1 << 20
+
+# ----------------------------------------------------------------------
+
+def align(length):
+    return (length + 3) & ~3
+
+# ----------------------------------------------------------------------
+
+def parse_attrs(data, offset=0, end=None):
+    end = len(data) if end is None else end
+    attrs = []
+    while offset + NLATTR.size <= end:
+        length, attr_type = NLATTR.unpack_from(data, offset)
+        if length < NLATTR.size:
+            break
+        attrs.append((attr_type & 0x3fff, data[offset + NLATTR.size:offset + length]))
+        offset += align(length)
+    return attrs
+
+# ----------------------------------------------------------------------
+
+def format_address(family, value):
+    return socket.inet_ntop(family, value)
+
+# ----------------------------------------------------------------------
+
+def format_mac(value):
+    return ':'.join('{:02x}'.format(b) for b in bytearray(value))
+
+# ----------------------------------------------------------------------
+
+def open_socket():
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER)
+    sock.bind((0, 0))
+    return sock
+
+# ----------------------------------------------------------------------
+
+def dump(msg_type, request, sock=None):
+    own_sock = sock is None
+    if own_sock:
+        sock = open_socket()
+    try:
+        seq = 1
+        sock.send(NLMSGHDR.pack(NLMSGHDR.size + len(request), msg_type,
+                                NLM_F_REQUEST | NLM_F_DUMP, seq, 0) + request)
+        while True:
+            data = sock.recv(RECV_BUFFER)
+            offset = 0
+            while offset + NLMSGHDR.size <= len(data):
+                length, nl_type, flags, nl_seq, pid = NLMSGHDR.unpack_from(data, offset)
+                if length < NLMSGHDR.size:
+                    return
+                if nl_type == NLMSG_DONE:
+                    return
+                if nl_type == NLMSG_ERROR:
+                    error = struct.unpack_from('=i', data, offset + NLMSGHDR.size)[0]
+                    if error != 0:
+                        raise OSError(-error, os.strerror(-error))
+                    return
+                yield nl_type, data[offset + NLMSGHDR.size:offset + length]
+                offset += align(length)
+    finally:
+        if own_sock:
+            sock.close()
+
+# ----------------------------------------------------------------------
+
+def get_links(sock=None):
+    links = []
+    request = IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+    for nl_type, payload in dump(RTM_GETLINK, request, sock):
+        if nl_type != RTM_NEWLINK:
+            continue
+        family, if_type, index, flags, change = IFINFOMSG.unpack_from(payload)
+        link = {'index': index, 'type': if_type, 'name': None, 'address': None,
+                'link': None, 'master': None, 'link_netnsid': None, 'altnames': []}
+        for attr_type, value in parse_attrs(payload, IFINFOMSG.size):
+            if attr_type == IFLA_IFNAME:
+                link['name'] = value.rstrip(b'\0').decode()
+            elif attr_type == IFLA_ADDRESS:
+                link['address'] = format_mac(value)
+            elif attr_type == IFLA_LINK:
+                link['link'] = struct.unpack('=i', value)[0]
+            elif attr_type == IFLA_MASTER:
+                link['master'] = struct.unpack('=i', value)[0]
+            elif attr_type == IFLA_LINK_NETNSID:
+                link['link_netnsid'] = struct.unpack('=i', value)[0]
+            elif attr_type == IFLA_PROP_LIST:
+                for prop_type, prop in parse_attrs(value):
+                    if prop_type == IFLA_ALT_IFNAME:
+                        link['altnames'].append(prop.rstrip(b'\0').decode())
+        links.append(link)
+    return links
+
+# ----------------------------------------------------------------------
+
+def get_addresses(family=socket.AF_UNSPEC, sock=None):
+    addresses = []
+    request = IFADDRMSG.pack(family, 0, 0, 0, 0)
+    for nl_type, payload in dump(RTM_GETADDR, request, sock):
+        if nl_type != RTM_NEWADDR:
+            continue
+        ifa_family, prefixlen, flags, scope, index = IFADDRMSG.unpack_from(payload)
+        attrs = dict(parse_attrs(payload, IFADDRMSG.size))
+        value = attrs.get(IFA_LOCAL, attrs.get(IFA_ADDRESS))
+        if value is None:
+            continue
+        addresses.append({'index': index, 'family': ifa_family, 'prefixlen': prefixlen,
+                          'address': format_address(ifa_family, value)})
+    return addresses
+
+# ----------------------------------------------------------------------
+
+def iter_routes(family=socket.AF_INET, table=RT_TABLE_MAIN, sock=None):
+    request = RTMSG.pack(family, 0, 0, 0, 0, 0, 0, 0, 0)
+    for nl_type, payload in dump(RTM_GETROUTE, request, sock):
+        if nl_type != RTM_NEWROUTE:
+            continue
+        (rtm_family, dst_len, src_len, tos, rtm_table,
+         protocol, scope, rtm_type, flags) = RTMSG.unpack_from(payload)
+        attrs = parse_attrs(payload, RTMSG.size)
+        route = {'family': rtm_family, 'dst_len': dst_len, 'type': rtm_type, 'dst': None,
+                 'gateway': None, 'prefsrc': None, 'oif': None, 'nexthops': []}
+        route_table = rtm_table
+        for attr_type, value in attrs:
+            if attr_type == RTA_TABLE:
+                route_table = struct.unpack('=I', value)[0]
+            elif attr_type == RTA_DST:
+                route['dst'] = format_address(rtm_family, value)
+            elif attr_type == RTA_GATEWAY:
+                route['gateway'] = format_address(rtm_family, value)
+            elif attr_type == RTA_PREFSRC:
+                route['prefsrc'] = format_address(rtm_family, value)
+            elif attr_type == RTA_OIF:
+                route['oif'] = struct.unpack('=i', value)[0]
+            elif attr_type == RTA_MULTIPATH:
+                offset = 0
+                while offset + RTNEXTHOP.size <= len(value):
+                    length, nh_flags, hops, nh_index = RTNEXTHOP.unpack_from(value, offset)
+                    if length < RTNEXTHOP.size:
+                        break
+                    nexthop = {'oif': nh_index, 'gateway': None}
+                    for nh_type, nh_value in parse_attrs(value, offset + RTNEXTHOP.size, offset + length):
+                        if nh_type == RTA_GATEWAY:
+                            nexthop['gateway'] = format_address(rtm_family, nh_value)
+                    route['nexthops'].append(nexthop)
+                    offset += align(length)
+        if table is not None and route_table != table:
+            continue
+        yield route
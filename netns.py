@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - netns
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Interfaces, addresses, routes and listening sockets of every network
+# namespace besides our own, for container hosts where most of them live in
+# pod and container namespaces. The namespaces are the ones bound in
+# /var/run/netns and the distinct ones of /proc/*/ns/net, told apart by inode.
+#
+# Nothing is run with `ip netns exec`. A worker thread enters a namespace with
+# setns(), which only moves the calling thread, opens an rtnetlink socket and
+# reads the socket tables of /proc/thread-self/net there, and goes back. The
+# socket stays in the namespace it was opened in, so the dumps are read after
+# the thread is back. Namespaces are done on a bounded pool of threads, the
+# owners of all listening sockets are found in one pass over /proc at the end.
+
+import os
+import time
+import queue
+import threading
+
+import netlink
+import network
+
+NETNS_DIR = '/var/run/netns'
+THREAD_PROC = '/proc/thread-self'
+CLONE_NEWNET = 0x40000000
+
+DEFAULT_NETNS_WORKERS = 8
+
+# ----------------------------------------------------------------------
+
+def setns(fd):
+    if hasattr(os, 'setns'):
+        os.setns(fd, CLONE_NEWNET)
+        return
+    import ctypes
+    libc = ctypes.CDLL(None, use_errno=True)
+    if libc.setns(fd, CLONE_NEWNET) != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+# ----------------------------------------------------------------------
+
+def find_namespaces(proc='/proc', netns_dir=NETNS_DIR):
+    # Returns [{'inode', 'name', 'paths', 'pids'}], named ones first. Our
+    # own namespace is left out, the network collectors already read it.
+    own = os.stat('{}/self/ns/net'.format(proc))
+    namespaces = {}
+    try:
+        names = sorted(os.listdir(netns_dir))
+    except OSError:
+        names = []
+    for name in names:
+        path = os.path.join(netns_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        # A file left behind by a deleted namespace is not a bind mount
+        # of nsfs.
+        if st.st_dev != own.st_dev or st.st_ino == own.st_ino:
+            continue
+        namespaces.setdefault(st.st_ino, {'inode': st.st_ino, 'name': name, 'paths': [path], 'pids': []})
+    for pid in sorted(int(name) for name in os.listdir(proc) if name.isdigit()):
+        path = '{}/{}/ns/net'.format(proc, pid)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if st.st_ino == own.st_ino:
+            continue
+        namespace = namespaces.setdefault(st.st_ino, {'inode': st.st_ino, 'name': None, 'paths': [], 'pids': []})
+        namespace['paths'].append(path)
+        namespace['pids'].append(pid)
+    return sorted(namespaces.values(), key=lambda namespace: (namespace['name'] is None,
+                                                              namespace['name'] or '', namespace['inode']))
+
+# ----------------------------------------------------------------------
+
+def open_namespace(namespace):
+    # Any of its processes will do, the first one may have exited since.
+    error = None
+    for path in namespace['paths']:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError as e:
+            error = e
+            continue
+        if os.fstat(fd).st_ino == namespace['inode']:
+            return fd
+        os.close(fd)
+    raise error or OSError('namespace net:[{}] is gone'.format(namespace['inode']))
+
+# ----------------------------------------------------------------------
+
+def collect_namespace(namespace, root_fd, routes_output='full'):
+    # Returns (network, listening sockets).
+    fd = open_namespace(namespace)
+    sock = None
+    try:
+        setns(fd)
+        try:
+            sock = netlink.open_socket()
+            sockets = network.read_listen_sockets(THREAD_PROC)
+        finally:
+            setns(root_fd)
+    except Exception:
+        if sock is not None:
+            sock.close()
+        raise
+    finally:
+        os.close(fd)
+    try:
+        return network.collect_network(routes_output, sock), sockets
+    finally:
+        sock.close()
+
+# ----------------------------------------------------------------------
+
+def namespace_container(namespace, proc='/proc'):
+    # The container the first process of the namespace runs in, on
+    # Kubernetes the pause container of the pod.
+    for pid in namespace['pids']:
+        process = network.read_process(pid, proc)
+        if process['comm'] is None:
+            continue
+        container = network.cgroup_container(process['cgroup'])
+        return dict((key.replace('listen_', '', 1), value) for key, value in container.items())
+    return {}
+
+# ----------------------------------------------------------------------
+
+def collect_namespaces(routes_output='full', workers=DEFAULT_NETNS_WORKERS, deadline=None,
+                       proc='/proc', netns_dir=NETNS_DIR):
+    # Namespaces that are not done by the deadline are reported with status
+    # timeout.
+    namespaces = find_namespaces(proc, netns_dir)
+    root_fd = os.open('{}/ns/net'.format(THREAD_PROC), os.O_RDONLY)
+    root_inode = os.fstat(root_fd).st_ino
+    results = [None] * len(namespaces)
+    tasks = queue.Queue()
+    for index, namespace in enumerate(namespaces):
+        tasks.put((index, namespace))
+
+    def worker():
+        while deadline is None or time.time() < deadline:
+            try:
+                index, namespace = tasks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                results[index] = (collect_namespace(namespace, root_fd, routes_output), None)
+            except Exception as e:
+                results[index] = (None, '{}: {}'.format(type(e).__name__, e))
+            # A thread that could not go back must not collect anything
+            # else.
+            if os.stat('{}/ns/net'.format(THREAD_PROC)).st_ino != root_inode:
+                return
+
+    threads = []
+    for i in range(min(max(workers, 1), len(namespaces))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join(None if deadline is None else max(deadline - time.time(), 0))
+    # A thread still in a namespace needs the descriptor to go back.
+    if not any(thread.is_alive() for thread in threads):
+        os.close(root_fd)
+
+    inodes = set()
+    for result in results:
+        if result is not None and result[0] is not None:
+            inodes.update(s['inode'] for s in result[0][1])
+    owners = network.socket_owners(inodes, proc)
+    processes = dict((pid, network.read_process(pid, proc)) for pid in set(owners.values()))
+
+    temp_namespaces = {}
+    for namespace, result in zip(namespaces, results):
+        id = namespace['name'] or 'net:[{}]'.format(namespace['inode'])
+        temp_namespace = {'netns_inode': namespace['inode'], 'processes_count': len(namespace['pids'])}
+        temp_namespace.update(namespace_container(namespace, proc))
+        if result is None:
+            temp_namespace['status'] = 'timeout'
+        elif result[1] is not None:
+            temp_namespace['status'] = 'error'
+            temp_namespace['error'] = result[1]
+        else:
+            data, sockets = result[0]
+            data['network_interfaces'].pop('lo', None)
+            temp_namespace['status'] = 'ok'
+            temp_namespace['interfaces'] = data['network_interfaces']
+            temp_namespace['ip_addresses'] = sorted(data['network_all_ip_addresses'])
+            temp_namespace['routes_all'] = data['network_routes_all']
+            if 'network_routes_summary' in data:
+                temp_namespace['routes_summary'] = data['network_routes_summary']
+            temp_namespace['listen_ports'] = network.listen_ports_to_inventory(
+                sockets, owners, processes)['network_listen_ports']
+        temp_namespaces[id] = temp_namespace
+
+    return {'network_namespaces': temp_namespaces}
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - network
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+import os
+import re
+import socket
+import struct
+
+import netlink
+import routes
+
+PROC_NET_LISTEN = [
+    ('tcp', '/proc/net/tcp', socket.AF_INET, '0A'),
+    ('tcp6', '/proc/net/tcp6', socket.AF_INET6, '0A'),
+    ('udp', '/proc/net/udp', socket.AF_INET, '07'),
+    ('udp6', '/proc/net/udp6', socket.AF_INET6, '07'),
+]
+
+CGROUP_CONTAINER_PATTERNS = [
+    ('docker', re.compile(r'(?:docker-|/docker/)([0-9a-f]{64})')),
+    ('podman', re.compile(r'(?:libpod-|/libpod/)([0-9a-f]{64})')),
+    ('containerd', re.compile(r'(?:cri-containerd-|/containerd/)([0-9a-f]{64})')),
+    ('cri-o', re.compile(r'crio-([0-9a-f]{64})')),
+    ('kubernetes', re.compile(r'/kubepods[^ ]*/([0-9a-f]{64})(?:/|$)')),
+    ('lxc', re.compile(r'/lxc(?:\.payload)?[./]([^/]+)')),
+]
+
+POD_UID_PATTERN = re.compile(r'pod([0-9a-f]{8}[-_][0-9a-f]{4}[-_][0-9a-f]{4}[-_][0-9a-f]{4}[-_][0-9a-f]{12})')
+
+# ----------------------------------------------------------------------
+
+def route_destination(route):
+    if route['dst_len'] == 0:
+        return 'default'
+    if route['dst_len'] == 32:
+        return route['dst']
+    return '{}/{}'.format(route['dst'], route['dst_len'])
+
+# ----------------------------------------------------------------------
+
+def collect_route_table(names=None, sock=None, routes_output='full'):
+    if names is None:
+        names = dict((link['index'], link['name']) for link in netlink.get_links(sock))
+
+    table = routes.RouteTable(routes_output)
+    for route in netlink.iter_routes(sock=sock):
+        destination = route_destination(route)
+        nexthops = route['nexthops'] or [{'oif': route['oif'], 'gateway': route['gateway']}]
+        added = False
+        for nexthop in nexthops:
+            t_route = {}
+            if route['prefsrc'] is not None and len(route['nexthops']) == 0:
+                t_route['src'] = route['prefsrc']
+            if nexthop['gateway'] is not None:
+                t_route['gw'] = nexthop['gateway']
+            if nexthop['oif'] in names:
+                t_route['dev'] = names[nexthop['oif']]
+            if len(t_route) > 0:
+                table.add(destination, t_route)
+                added = True
+        if not added:
+            table.add(destination)
+
+    return table
+
+# ----------------------------------------------------------------------
+
+def collect_network(routes_output='full', sock=None):
+    # With sock, the network namespace the socket was opened in.
+    network = {}
+    network['network_interfaces'] = {}
+    network['network_all_ip_addresses'] = []
+    network['network_routes_all'] = {}
+
+    interfaces = network['network_interfaces']
+    own_sock = sock is None
+    if own_sock:
+        sock = netlink.open_socket()
+    try:
+        links = netlink.get_links(sock)
+        names = dict((link['index'], link['name']) for link in links)
+
+        for link in links:
+            temp_interface = {}
+            if (link['link'] and link['link_netnsid'] is None and
+                names.get(link['link']) in interfaces):
+                temp_interface['link'] = names[link['link']]
+            if link['master'] in names:
+                temp_interface['master'] = names[link['master']]
+            if link['type'] == netlink.ARPHRD_ETHER and link['address'] is not None:
+                temp_interface['mac'] = link['address']
+            if len(link['altnames']) > 0:
+                temp_interface['altnames'] = link['altnames']
+            interfaces[link['name']] = temp_interface
+
+        for address in netlink.get_addresses(sock=sock):
+            id = names.get(address['index'])
+            if id is None:
+                continue
+            temp_ip = '{}/{}'.format(address['address'], address['prefixlen'])
+            interfaces[id].setdefault('ips', []).append(temp_ip)
+            if id != 'lo':
+                network['network_all_ip_addresses'].append(temp_ip)
+
+        table = collect_route_table(names, sock, routes_output)
+        routes.routes_to_inventory(table, network, routes_output)
+    finally:
+        if own_sock:
+            sock.close()
+
+    return network
+
+# ----------------------------------------------------------------------
+
+def parse_proc_net_address(family, value):
+    address, port = value.split(':')
+    raw = bytes.fromhex(address)
+    # The kernel prints the address as 32 bit words in host byte order.
+    raw = b''.join(struct.pack('=I', struct.unpack('>I', raw[i:i + 4])[0]) for i in range(0, len(raw), 4))
+    return socket.inet_ntop(family, raw), int(port, 16)
+
+# ----------------------------------------------------------------------
+
+def read_listen_sockets(proc='/proc'):
+    sockets = []
+    for proto, filename, family, state in PROC_NET_LISTEN:
+        filename = filename.replace('/proc', proc, 1)
+        if not os.path.exists(filename):
+            continue
+        with open(filename) as f:
+            next(f)
+            for line in f:
+                fields = line.split()
+                if fields[3] != state:
+                    continue
+                ip, port = parse_proc_net_address(family, fields[1])
+                sockets.append({'proto': proto, 'ip': ip, 'port': port, 'inode': int(fields[9])})
+    return sockets
+
+# ----------------------------------------------------------------------
+
+def socket_owners(inodes, proc='/proc'):
+    # One pass over /proc/*/fd, only the inodes we are interested in are kept.
+    owners = {}
+    for pid in sorted(int(name) for name in os.listdir(proc) if name.isdigit()):
+        fd_dir = '{}/{}/fd'.format(proc, pid)
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                link = os.readlink('{}/{}'.format(fd_dir, fd))
+            except OSError:
+                continue
+            if not link.startswith('socket:['):
+                continue
+            inode = int(link[8:-1])
+            if inode in inodes and inode not in owners:
+                owners[inode] = pid
+    return owners
+
+# ----------------------------------------------------------------------
+
+def read_process(pid, proc='/proc'):
+    process = {'pid': pid, 'comm': None, 'cgroup': None}
+    try:
+        with open('{}/{}/comm'.format(proc, pid)) as f:
+            process['comm'] = f.read().strip()
+        with open('{}/{}/cgroup'.format(proc, pid)) as f:
+            cgroups = dict(line.rstrip('\n').split(':', 2)[1:] for line in f if line.count(':') >= 2)
+    except OSError:
+        return process
+    for controller in ['', 'name=systemd', 'memory', 'pids']:
+        if cgroups.get(controller, '/') != '/':
+            process['cgroup'] = cgroups[controller]
+            break
+    return process
+
+# ----------------------------------------------------------------------
+
+def cgroup_container(cgroup):
+    container = {}
+    if cgroup is None:
+        return container
+    for runtime, pattern in CGROUP_CONTAINER_PATTERNS:
+        match = pattern.search(cgroup)
+        if match:
+            container['listen_container_runtime'] = runtime
+            container['listen_container_id'] = match.group(1)
+            break
+    match = POD_UID_PATTERN.search(cgroup)
+    if match:
+        container['listen_pod_uid'] = match.group(1).replace('_', '-')
+    return container
+
+# ----------------------------------------------------------------------
+
+def collect_listen_ports(proc='/proc'):
+    sockets = read_listen_sockets(proc)
+    owners = socket_owners(set(s['inode'] for s in sockets), proc)
+    processes = dict((pid, read_process(pid, proc)) for pid in set(owners.values()))
+    return listen_ports_to_inventory(sockets, owners, processes)
+
+# ----------------------------------------------------------------------
+
+def listen_ports_to_inventory(sockets, owners, processes):
+    listen_ports = {}
+    listen_ports['network_listen_ports_list'] = []
+    listen_ports['network_listen_ports'] = {}
+
+    sockets.sort(key=lambda s: (s['port'], s['ip'] + ':'))
+    ports_seen = set()
+    for rec in sockets:
+        id = 'port {}/{} on {}'.format(rec['proto'], rec['port'], rec['ip'])
+        temp_port = {}
+        temp_port['listen_proto'] = rec['proto']
+        temp_port['listen_port'] = str(rec['port'])
+        temp_port['listen_ip'] = rec['ip']
+        process = processes.get(owners.get(rec['inode']))
+        if process is None:
+            temp_port['listen_pid_program'] = '-'
+        else:
+            temp_port['listen_pid_program'] = '{}/{}'.format(process['pid'], process['comm'])
+            if process['cgroup'] is not None:
+                temp_port['listen_cgroup'] = process['cgroup']
+                temp_port.update(cgroup_container(process['cgroup']))
+        listen_ports['network_listen_ports'][id] = temp_port
+        if temp_port['listen_port'] not in ports_seen:
+            ports_seen.add(temp_port['listen_port'])
+            listen_ports['network_listen_ports_list'].append(temp_port['listen_port'])
+
+    return listen_ports
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - osinfo
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# OS identity without running hostname, uname, awk, grep, openssl or ssh. The
+# release, the users, the sudo and wheel groups and the effective sshd settings
+# are read from their files, each in one pass. sshd_config is followed through
+# Include like sshd does. The versions of OpenSSH and OpenSSL are the version
+# strings compiled into the ssh binary and into libcrypto.
+#
+# Users come from /etc/passwd, or with users_source='nss' from getpwent(), so
+# LDAP/SSSD users are listed too. getpwent() hands out one entry at a time and
+# the enumeration stops at users_limit, so a huge directory is not pulled in.
+
+import os
+import re
+import glob
+import shlex
+import shutil
+
+OS_RELEASE = ['/etc/os-release', '/usr/lib/os-release']
+PASSWD = '/etc/passwd'
+GROUP = '/etc/group'
+SSHD_CONFIG = '/etc/ssh/sshd_config'
+SSHD_CONFIG_DIR = '/etc/ssh'
+LIBCRYPTO = ['/usr/lib/*-linux-gnu/libcrypto.so.*', '/lib/*-linux-gnu/libcrypto.so.*',
+             '/usr/lib64/libcrypto.so.*', '/lib64/libcrypto.so.*', '/usr/lib/libcrypto.so.*']
+
+DEFAULT_SSH_PORT = 22
+DEFAULT_USERS_LIMIT = 10000
+MAX_INCLUDE_DEPTH = 16
+
+SUDO_GROUP = 'sudo'
+WHEEL_GROUP = 'wheel'
+
+# Keyword and arguments, separated by whitespace or by '='.
+SSHD_LINE = re.compile(r'([A-Za-z]+)(?:\s*=\s*|\s+|$)(.*)')
+
+# The release string of ssh -V, without the compatibility patterns
+# like 'OpenSSH_2*,OpenSSH_3*' that are also in the binary.
+SSH_RELEASE = re.compile(rb'\x00(OpenSSH_\d[\w.]*(?: [\w.+~-]+)?)\x00')
+OPENSSL_RELEASE = re.compile(rb'\x00(OpenSSL \d[\w.]* +\d+ \w+ \d{4})\x00')
+
+# ----------------------------------------------------------------------
+
+def read_lines(filename):
+    try:
+        with open(filename, 'rb') as f:
+            return f.read().decode('UTF-8', 'replace').splitlines()
+    except (IOError, OSError):
+        return None
+
+# ----------------------------------------------------------------------
+
+def read_os_release(root=''):
+    for filename in OS_RELEASE:
+        lines = read_lines(root + filename)
+        if lines is None:
+            continue
+        release = {}
+        for line in lines:
+            key, _, value = line.strip().partition('=')
+            if key and not key.startswith('#'):
+                try:
+                    release[key] = ' '.join(shlex.split(value))
+                except ValueError:
+                    release[key] = value.strip('"\'')
+        return release
+    return {}
+
+# ----------------------------------------------------------------------
+
+def passwd_users(root='', limit=DEFAULT_USERS_LIMIT):
+    # Returns (names, truncated).
+    users = []
+    for line in read_lines(root + PASSWD) or []:
+        name = line.split(':', 1)[0].strip()
+        if not name or name.startswith(('#', '+', '-')):
+            continue
+        if len(users) >= limit:
+            return users, True
+        users.append(name)
+    return users, False
+
+# ----------------------------------------------------------------------
+
+def nss_users(limit=DEFAULT_USERS_LIMIT):
+    # getpwent() through libc, so every NSS source (files, sss, ldap) is
+    # listed. pwd.getpwall() would build the whole list before the cap.
+    import ctypes
+
+    class Passwd(ctypes.Structure):
+        _fields_ = [('pw_name', ctypes.c_char_p), ('pw_passwd', ctypes.c_char_p),
+                    ('pw_uid', ctypes.c_uint), ('pw_gid', ctypes.c_uint),
+                    ('pw_gecos', ctypes.c_char_p), ('pw_dir', ctypes.c_char_p),
+                    ('pw_shell', ctypes.c_char_p)]
+
+    libc = ctypes.CDLL(None)
+    libc.getpwent.restype = ctypes.POINTER(Passwd)
+    users = []
+    seen = set()
+    truncated = False
+    libc.setpwent()
+    try:
+        while True:
+            entry = libc.getpwent()
+            if not entry:
+                break
+            name = entry.contents.pw_name.decode('UTF-8', 'replace')
+            # A user kept in several sources is returned by each of them.
+            if name in seen:
+                continue
+            if len(users) >= limit:
+                truncated = True
+                break
+            seen.add(name)
+            users.append(name)
+    finally:
+        libc.endpwent()
+    return users, truncated
+
+# ----------------------------------------------------------------------
+
+def group_members(root='', names=(SUDO_GROUP, WHEEL_GROUP), source='files'):
+    # Members of the groups with exactly these names.
+    members = dict((name, []) for name in names)
+    if source == 'nss':
+        import grp
+        for name in names:
+            try:
+                members[name] = list(grp.getgrnam(name).gr_mem)
+            except KeyError:
+                pass
+        return members
+    for line in read_lines(root + GROUP) or []:
+        fields = line.split(':')
+        if len(fields) >= 4 and fields[0] in members:
+            members[fields[0]] = [user for user in fields[3].split(',') if user]
+    return members
+
+# ----------------------------------------------------------------------
+
+def read_sshd_config(filename, settings, root='', depth=0):
+    # Only the global part is read: the lines after a Match apply to some
+    # connections only, up to the end of the file they are in.
+    if depth > MAX_INCLUDE_DEPTH:
+        return
+    for line in read_lines(root + filename) or []:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = SSHD_LINE.match(line)
+        if match is None:
+            continue
+        keyword, value = match.group(1).lower(), match.group(2)
+        try:
+            arguments = shlex.split(value, comments=True)
+        except ValueError:
+            arguments = value.split()
+        if keyword == 'match':
+            return
+        elif keyword == 'include':
+            for pattern in arguments:
+                if not pattern.startswith('/'):
+                    pattern = os.path.join(SSHD_CONFIG_DIR, pattern)
+                for path in sorted(glob.glob(root + pattern)):
+                    read_sshd_config(path[len(root):], settings, root, depth + 1)
+        elif keyword == 'port':
+            settings['ports'].extend(int(port) for port in arguments if port.isdigit())
+        elif keyword == 'allowusers':
+            settings['allow_users'].extend(arguments)
+
+# ----------------------------------------------------------------------
+
+def find_release(filename, pattern):
+    # The longest matching string, a release with its distribution suffix
+    # is also in the binary without it.
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+    except (IOError, OSError):
+        return None
+    found = [match.decode('UTF-8', 'replace') for match in pattern.findall(data)]
+    return max(found, key=len) if found else None
+
+# ----------------------------------------------------------------------
+
+def ssl_version(root=''):
+    for pattern in LIBCRYPTO:
+        for filename in sorted(glob.glob(root + pattern), reverse=True):
+            version = find_release(filename, OPENSSL_RELEASE)
+            if version is not None:
+                return version
+    return None
+
+# ----------------------------------------------------------------------
+
+def ssh_version(root='', ssl=None):
+    ssh = shutil.which('ssh', path=os.pathsep.join(root + path for path in ['/usr/bin', '/bin', '/usr/local/bin']))
+    if ssh is None:
+        return None
+    release = find_release(ssh, SSH_RELEASE)
+    if release is None or ssl is None:
+        return release
+    return '{}, {}'.format(release, ssl)
+
+# ----------------------------------------------------------------------
+
+def collect_os(root='', users_source='files', users_limit=DEFAULT_USERS_LIMIT):
+    uname = os.uname()
+    if users_source == 'nss':
+        users, truncated = nss_users(users_limit)
+    else:
+        users, truncated = passwd_users(root, users_limit)
+    groups = group_members(root, source=users_source)
+    sshd = {'ports': [], 'allow_users': []}
+    read_sshd_config(SSHD_CONFIG, sshd, root)
+    ssl = ssl_version(root)
+    return {
+        'os_hostname': uname.nodename,
+        'os_version': read_os_release(root).get('PRETTY_NAME'),
+        'os_core': uname.release,
+        'os_users': users,
+        'os_users_truncated': truncated,
+        'os_users_sudo': groups[SUDO_GROUP],
+        'os_users_wheel': groups[WHEEL_GROUP],
+        'os_users_ssh': sshd['allow_users'],
+        'os_ssh_ports': sshd['ports'] or [DEFAULT_SSH_PORT],
+        'os_ssl_version': ssl,
+        'os_ssh_version': ssh_version(root, ssl),
+    }
+
+# ----------------------------------------------------------------------
+
+def os_to_inventory(data, inventory):
+    inventory['os_hostname'] = data['os_hostname']
+    inventory['os_version'] = data['os_version']
+    inventory['os_core'] = data['os_core']
+    inventory['os_users'] = sorted(user for user in data['os_users'] if 'nobody' not in user.lower())
+    if data['os_users_truncated']:
+        inventory['os_users_truncated'] = True
+    if len(data['os_users_sudo']) > 0:
+        inventory['os_users_sudo'] = sorted(data['os_users_sudo'])
+    if len(data['os_users_wheel']) > 0:
+        inventory['os_users_wheel'] = sorted(data['os_users_wheel'])
+    inventory['os_users_ssh'] = sorted(data['os_users_ssh'])
+    inventory['os_ssh_port'] = data['os_ssh_ports'][0]
+    if len(data['os_ssh_ports']) > 1:
+        inventory['os_ssh_ports'] = data['os_ssh_ports']
+    inventory['os_ssl_version'] = data['os_ssl_version']
+    inventory['os_ssh_version'] = data['os_ssh_version']
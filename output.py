@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - output
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Output encodings of the result. The document is written section by section
+# to the (optionally compressed) file, so it is never held as one string:
+#
+#   json     indented like before, byte for byte
+#   compact  JSON without whitespace
+#   ndjson   one {"<section>": value} object per line
+#   msgpack  MessagePack map
+#   cbor     CBOR map (RFC 8949)
+#
+# MessagePack and CBOR are encoded here, they only need the JSON types.
+#
+# With --state the encoded value of every section is also kept in
+# <state>.fragments, and a section that has the same hash in the next run is
+# copied from there instead of being encoded again.
+
+import io
+import os
+import json
+import gzip
+import struct
+
+import records
+
+FORMATS = ['json', 'compact', 'ndjson', 'msgpack', 'cbor']
+COMPRESSIONS = ['gzip', 'zstd']
+
+EXTENSIONS = {'json': 'json', 'compact': 'json', 'ndjson': 'ndjson', 'msgpack': 'msgpack', 'cbor': 'cbor'}
+COMPRESSION_EXTENSIONS = {'gzip': 'gz', 'zstd': 'zst'}
+
+JSON_INDENT = 4
+
+# ----------------------------------------------------------------------
+
+def output_filename(filename, format='json', compression=None):
+    filename = '{}.{}'.format(filename, EXTENSIONS[format])
+    if compression is not None:
+        filename = '{}.{}'.format(filename, COMPRESSION_EXTENSIONS[compression])
+    return filename
+
+# ----------------------------------------------------------------------
+
+def zstd_module():
+    # compression.zstd is in the standard library since Python 3.14.
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError('zstd output needs Python 3.14 or the zstandard module')
+    return zstandard
+
+# ----------------------------------------------------------------------
+
+def check_compression(compression):
+    # Raises RuntimeError when the compression can not be written here, so
+    # it is found out before anything is collected.
+    if compression == 'zstd':
+        zstd_module()
+
+# ----------------------------------------------------------------------
+
+def zstd_writer(f):
+    zstd = zstd_module()
+    if zstd.__name__ == 'zstandard':
+        return zstd.ZstdCompressor().stream_writer(f, closefd=False)
+    return zstd.ZstdFile(f, 'wb')
+
+# ----------------------------------------------------------------------
+
+def open_compressed(f, compression):
+    if compression is None:
+        return f
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6)
+    if compression == 'zstd':
+        return zstd_writer(f)
+    raise ValueError('unknown compression {}'.format(compression))
+
+# ----------------------------------------------------------------------
+
+def write_json(f, inventory, indent):
+    write_document(f, inventory, 'json' if indent is not None else 'compact')
+
+# ----------------------------------------------------------------------
+
+def write_ndjson(f, inventory):
+    write_document(f, inventory, 'ndjson')
+
+# ----------------------------------------------------------------------
+
+def encode_value(value, format, write):
+    # One section value, as it is written inside the document.
+    if format == 'json':
+        # Every line of a section is one level deeper than at the top.
+        pad = '\n' + ' ' * JSON_INDENT
+        for chunk in json.JSONEncoder(ensure_ascii=False, indent=JSON_INDENT,
+                                       default=records.json_default).iterencode(value):
+            write(chunk.replace('\n', pad).encode('UTF-8'))
+    elif format in ('compact', 'ndjson'):
+        for chunk in json.JSONEncoder(ensure_ascii=False, separators=(',', ':'),
+                                       default=records.json_default).iterencode(value):
+            write(chunk.encode('UTF-8'))
+    elif format == 'msgpack':
+        msgpack_pack(value, write)
+    elif format == 'cbor':
+        cbor_pack(value, write)
+    else:
+        raise ValueError('unknown output format {}'.format(format))
+
+# ----------------------------------------------------------------------
+
+def write_document(f, inventory, format, fragments=None):
+    # The document around the section values. With fragments the values
+    # go through it, to be copied from the previous result or kept for the
+    # next one.
+    def write_value(section, value):
+        if fragments is None:
+            encode_value(value, format, f.write)
+        else:
+            fragments.write_value(f, section, value)
+
+    if format in ('json', 'compact'):
+        if len(inventory) == 0:
+            f.write(b'{}')
+            return
+        separator, colon, end = ('{\n' + ' ' * JSON_INDENT, ': ', '\n}') if format == 'json' else ('{', ':', '}')
+        for section, value in inventory.items():
+            f.write((separator + json.dumps(section, ensure_ascii=False) + colon).encode('UTF-8'))
+            write_value(section, value)
+            separator = ',\n' + ' ' * JSON_INDENT if format == 'json' else ','
+        f.write(end.encode('UTF-8'))
+    elif format == 'ndjson':
+        for section, value in inventory.items():
+            f.write(('{' + json.dumps(section, ensure_ascii=False) + ':').encode('UTF-8'))
+            write_value(section, value)
+            f.write(b'}\n')
+    elif format == 'msgpack':
+        f.write(msgpack_header(len(inventory), 0x80, 16, [None, 0xde, 0xdf]))
+        for section, value in inventory.items():
+            msgpack_pack(str(section), f.write)
+            write_value(section, value)
+    elif format == 'cbor':
+        f.write(cbor_header(5, len(inventory)))
+        for section, value in inventory.items():
+            cbor_pack(str(section), f.write)
+            write_value(section, value)
+    else:
+        raise ValueError('unknown output format {}'.format(format))
+
+# ----------------------------------------------------------------------
+
+class Fragments(object):
+    # <state>.fragments holds the encoded section values one after the
+    # other, then a JSON index {'format', 'sections': {section: [hash,
+    # offset, length]}} and the offset of that index as 16 digits. A new
+    # file is written next to it while the result is written, and replaces
+    # it with commit().
+
+    OFFSET_SIZE = 16
+
+    def __init__(self, filename, format, hashes):
+        self.filename = filename
+        self.format = format
+        self.hashes = hashes
+        self.old = None
+        self.index = {}
+        try:
+            self.old = open(filename, 'rb')
+            self.old.seek(-self.OFFSET_SIZE, os.SEEK_END)
+            end = self.old.tell()
+            offset = int(self.old.read(self.OFFSET_SIZE))
+            self.old.seek(offset)
+            header = json.loads(self.old.read(end - offset).decode('UTF-8'))
+            if header['format'] == format:
+                self.index = header['sections']
+        except (IOError, OSError, ValueError, KeyError):
+            self.index = {}
+        self.new = open(filename + '.part', 'wb')
+        self.new_index = {}
+
+    def write_value(self, f, section, value):
+        def write(data):
+            f.write(data)
+            self.new.write(data)
+
+        start = self.new.tell()
+        entry = self.index.get(section)
+        if entry is not None and section in self.hashes and entry[0] == self.hashes[section]:
+            self.old.seek(entry[1])
+            remaining = entry[2]
+            while remaining > 0:
+                data = self.old.read(min(remaining, 2 ** 20))
+                if len(data) == 0:
+                    raise IOError('{}: truncated'.format(self.filename))
+                write(data)
+                remaining -= len(data)
+        else:
+            encode_value(value, self.format, write)
+        self.new_index[section] = [self.hashes.get(section), start, self.new.tell() - start]
+
+    def close(self):
+        if self.old is not None:
+            self.old.close()
+        self.new.close()
+
+    def commit(self):
+        offset = self.new.tell()
+        self.new.write(json.dumps({'format': self.format, 'sections': self.new_index},
+                                  separators=(',', ':')).encode('UTF-8'))
+        self.new.write('{:016d}'.format(offset).encode('ascii'))
+        self.close()
+        os.rename(self.filename + '.part', self.filename)
+
+    def discard(self):
+        self.close()
+        try:
+            os.remove(self.filename + '.part')
+        except FileNotFoundError:
+            pass
+
+# ----------------------------------------------------------------------
+
+def msgpack_header(size, fix, fix_limit, codes):
+    # codes are the 8, 16 and 32 bit variants, None where there is none.
+    if size < fix_limit:
+        return struct.pack('B', fix | size)
+    for code, format, limit in zip(codes, ['>BB', '>BH', '>BI'], [2 ** 8, 2 ** 16, 2 ** 32]):
+        if code is not None and size < limit:
+            return struct.pack(format, code, size)
+    raise ValueError('msgpack object too large')
+
+# ----------------------------------------------------------------------
+
+def msgpack_pack(value, write):
+    if value is None:
+        write(b'\xc0')
+    elif value is True:
+        write(b'\xc3')
+    elif value is False:
+        write(b'\xc2')
+    elif isinstance(value, int):
+        if 0 <= value < 128:
+            write(struct.pack('B', value))
+        elif -32 <= value < 0:
+            write(struct.pack('b', value))
+        elif 0 <= value < 2 ** 64:
+            write(b'\xcf' + struct.pack('>Q', value) if value >= 2 ** 32 else
+                  b'\xce' + struct.pack('>I', value) if value >= 2 ** 16 else
+                  b'\xcd' + struct.pack('>H', value) if value >= 2 ** 8 else
+                  b'\xcc' + struct.pack('B', value))
+        elif -2 ** 63 <= value < 0:
+            write(b'\xd0' + struct.pack('b', value) if value >= -2 ** 7 else
+                  b'\xd1' + struct.pack('>h', value) if value >= -2 ** 15 else
+                  b'\xd2' + struct.pack('>i', value) if value >= -2 ** 31 else
+                  b'\xd3' + struct.pack('>q', value))
+        else:
+            raise ValueError('integer {} does not fit in msgpack'.format(value))
+    elif isinstance(value, float):
+        write(b'\xcb' + struct.pack('>d', value))
+    elif isinstance(value, str):
+        data = value.encode('UTF-8')
+        write(msgpack_header(len(data), 0xa0, 32, [0xd9, 0xda, 0xdb]) + data)
+    elif isinstance(value, (list, tuple)):
+        write(msgpack_header(len(value), 0x90, 16, [None, 0xdc, 0xdd]))
+        for item in value:
+            msgpack_pack(item, write)
+    elif isinstance(value, dict):
+        write(msgpack_header(len(value), 0x80, 16, [None, 0xde, 0xdf]))
+        for key, item in value.items():
+            msgpack_pack(str(key), write)
+            msgpack_pack(item, write)
+    elif isinstance(value, records.Record):
+        msgpack_pack(value.to_json(), write)
+    else:
+        raise TypeError('can not encode {} as msgpack'.format(type(value).__name__))
+
+# ----------------------------------------------------------------------
+
+def cbor_header(major, size):
+    if size < 24:
+        return struct.pack('B', major << 5 | size)
+    for info, format, limit in [(24, '>BB', 2 ** 8), (25, '>BH', 2 ** 16),
+                                (26, '>BI', 2 ** 32), (27, '>BQ', 2 ** 64)]:
+        if size < limit:
+            return struct.pack(format, major << 5 | info, size)
+    raise ValueError('cbor argument too large')
+
+# ----------------------------------------------------------------------
+
+def cbor_pack(value, write):
+    if value is None:
+        write(b'\xf6')
+    elif value is True:
+        write(b'\xf5')
+    elif value is False:
+        write(b'\xf4')
+    elif isinstance(value, int):
+        if value >= 0:
+            write(cbor_header(0, value))
+        else:
+            write(cbor_header(1, -1 - value))
+    elif isinstance(value, float):
+        write(b'\xfb' + struct.pack('>d', value))
+    elif isinstance(value, str):
+        data = value.encode('UTF-8')
+        write(cbor_header(3, len(data)) + data)
+    elif isinstance(value, (list, tuple)):
+        write(cbor_header(4, len(value)))
+        for item in value:
+            cbor_pack(item, write)
+    elif isinstance(value, dict):
+        write(cbor_header(5, len(value)))
+        for key, item in value.items():
+            cbor_pack(str(key), write)
+            cbor_pack(item, write)
+    elif isinstance(value, records.Record):
+        cbor_pack(value.to_json(), write)
+    else:
+        raise TypeError('can not encode {} as cbor'.format(type(value).__name__))
+
+# ----------------------------------------------------------------------
+
+def write_inventory(filename, inventory, format='json', compression=None, fragments=None):
+    # filename is without extension, returns the name of the written file.
+    # fragments is a Fragments, committed once the result is in place.
+    if format not in FORMATS:
+        raise ValueError('unknown output format {}'.format(format))
+    filename = output_filename(filename, format, compression)
+    try:
+        with open(filename + '.part', 'wb', buffering=0) as raw:
+            # Small writes are gathered before they reach the compressor.
+            compressed = open_compressed(raw, compression)
+            f = io.BufferedWriter(compressed, buffer_size=2 ** 16)
+            write_document(f, inventory, format, fragments)
+            f.flush()
+            f.detach()
+            if compressed is not raw:
+                compressed.close()
+        os.rename(filename + '.part', filename)
+    except BaseException:
+        try:
+            os.remove(filename + '.part')
+        except FileNotFoundError:
+            pass
+        if fragments is not None:
+            fragments.discard()
+        raise
+    if fragments is not None:
+        fragments.commit()
+    return filename
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - packages
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Installed packages are read from the package databases themselves, one
+# record at a time, instead of running apt or yum: /var/lib/dpkg/status on
+# Debian and the rpmdb (sqlite or Berkeley DB hash) on RHEL.
+
+import os
+import struct
+
+DPKG_STATUS = '/var/lib/dpkg/status'
+RPMDB_SQLITE = '/var/lib/rpm/rpmdb.sqlite'
+RPMDB_BDB = '/var/lib/rpm/Packages'
+
+RPMTAG_NAME = 1000
+RPMTAG_VERSION = 1001
+RPMTAG_RELEASE = 1002
+RPMTAG_EPOCH = 1003
+RPMTAG_ARCH = 1022
+
+RPM_INT32_TYPE = 4
+RPM_STRING_TYPE = 6
+
+RPM_HEADER_TAGS = {
+    RPMTAG_NAME: 'name',
+    RPMTAG_VERSION: 'version',
+    RPMTAG_RELEASE: 'release',
+    RPMTAG_EPOCH: 'epoch',
+    RPMTAG_ARCH: 'arch',
+}
+
+BDB_HASH_MAGIC = 0x061561
+BDB_PAGE_HEADER = 26
+BDB_P_HASH_UNSORTED = 2
+BDB_P_HASH = 8
+BDB_H_KEYDATA = 1
+BDB_H_OFFPAGE = 3
+
+# ----------------------------------------------------------------------
+
+def iter_dpkg(filename=DPKG_STATUS):
+    record = {}
+    with open(filename, 'rb') as f:
+        for line in f:
+            line = line.decode('UTF-8', 'replace').rstrip('\n')
+            if len(line) == 0:
+                if len(record) > 0:
+                    package = dpkg_package(record)
+                    if package is not None:
+                        yield package
+                record = {}
+                continue
+            if line[0] in ' \t':
+                continue
+            key, _, value = line.partition(':')
+            if key in ('Package', 'Status', 'Version', 'Architecture'):
+                record[key] = value.strip()
+    if len(record) > 0:
+        package = dpkg_package(record)
+        if package is not None:
+            yield package
+
+# ----------------------------------------------------------------------
+
+def dpkg_package(record):
+    if record.get('Status', '').split()[-1:] != ['installed'] or 'Version' not in record:
+        return None
+    version = record['Version']
+    epoch = None
+    if ':' in version:
+        epoch, version = version.split(':', 1)
+    release = None
+    if '-' in version:
+        version, release = version.rsplit('-', 1)
+    return {'name': record['Package'], 'epoch': epoch, 'version': version,
+            'release': release, 'arch': record.get('Architecture')}
+
+# ----------------------------------------------------------------------
+
+def parse_rpm_header(blob):
+    # Header blobs in the rpmdb have no lead and no magic: index length,
+    # data length, index entries, then the data store. Always big endian.
+    count, size = struct.unpack_from('>ii', blob, 0)
+    store = 8 + count * 16
+    if count <= 0 or size < 0 or store + size > len(blob):
+        return None
+    header = {}
+    for i in range(count):
+        tag, tag_type, offset, tag_count = struct.unpack_from('>iiii', blob, 8 + i * 16)
+        if tag not in RPM_HEADER_TAGS or offset < 0 or offset >= size:
+            continue
+        if tag_type == RPM_STRING_TYPE:
+            end = blob.index(b'\0', store + offset)
+            header[RPM_HEADER_TAGS[tag]] = blob[store + offset:end].decode('UTF-8', 'replace')
+        elif tag_type == RPM_INT32_TYPE:
+            header[RPM_HEADER_TAGS[tag]] = str(struct.unpack_from('>i', blob, store + offset)[0])
+    if 'name' not in header or 'version' not in header:
+        return None
+    return {'name': header['name'], 'epoch': header.get('epoch'), 'version': header['version'],
+            'release': header.get('release'), 'arch': header.get('arch')}
+
+# ----------------------------------------------------------------------
+
+def iter_rpm_sqlite(filename=RPMDB_SQLITE):
+    import sqlite3
+    db = sqlite3.connect('file:{}?mode=ro&immutable=1'.format(filename), uri=True)
+    try:
+        for (blob,) in db.execute('SELECT blob FROM Packages'):
+            package = parse_rpm_header(bytes(blob))
+            if package is not None:
+                yield package
+    finally:
+        db.close()
+
+# ----------------------------------------------------------------------
+
+def iter_bdb_values(filename):
+    # Reads the data items of a Berkeley DB hash file page by page. Values
+    # larger than a page are chained through overflow pages.
+    with open(filename, 'rb') as f:
+        meta = f.read(512)
+        for endian in '<>':
+            if struct.unpack_from(endian + 'I', meta, 12)[0] == BDB_HASH_MAGIC:
+                break
+        else:
+            raise ValueError('{} is not a Berkeley DB hash file'.format(filename))
+        page_size = struct.unpack_from(endian + 'I', meta, 20)[0]
+        page_header = struct.Struct(endian + 'QIIIHHBB')
+        offpage = struct.Struct(endian + 'xxxxII')
+
+        def read_page(pgno):
+            f.seek(pgno * page_size)
+            return f.read(page_size)
+
+        def read_overflow(pgno, length):
+            chunks = []
+            while pgno != 0 and length > 0:
+                page = read_page(pgno)
+                lsn, pgno, prev_pgno, next_pgno, entries, hf_offset, level, page_type = page_header.unpack_from(page)
+                chunks.append(page[BDB_PAGE_HEADER:BDB_PAGE_HEADER + hf_offset])
+                length -= hf_offset
+                pgno = next_pgno
+            return b''.join(chunks)
+
+        pages = os.fstat(f.fileno()).st_size // page_size
+        for pgno in range(1, pages):
+            page = read_page(pgno)
+            if len(page) < BDB_PAGE_HEADER:
+                break
+            lsn, number, prev_pgno, next_pgno, entries, hf_offset, level, page_type = page_header.unpack_from(page)
+            if page_type not in (BDB_P_HASH, BDB_P_HASH_UNSORTED):
+                continue
+            offsets = struct.unpack_from(endian + '{}H'.format(entries), page, BDB_PAGE_HEADER)
+            # Items alternate key and data, the data ends where the
+            # previous item starts.
+            for i in range(1, entries, 2):
+                start = offsets[i]
+                end = offsets[i - 1]
+                if page[start] == BDB_H_KEYDATA:
+                    yield page[start + 1:end]
+                elif page[start] == BDB_H_OFFPAGE:
+                    overflow_pgno, length = offpage.unpack_from(page, start)
+                    yield read_overflow(overflow_pgno, length)[:length]
+
+# ----------------------------------------------------------------------
+
+def iter_rpm_bdb(filename=RPMDB_BDB):
+    for blob in iter_bdb_values(filename):
+        if len(blob) < 8:
+            continue
+        package = parse_rpm_header(blob)
+        if package is not None:
+            yield package
+
+# ----------------------------------------------------------------------
+
+def find_package_database():
+    if os.path.exists(DPKG_STATUS):
+        return 'dpkg', DPKG_STATUS
+    if os.path.exists(RPMDB_SQLITE):
+        return 'rpm', RPMDB_SQLITE
+    if os.path.exists(RPMDB_BDB):
+        return 'rpm', RPMDB_BDB
+    return None, None
+
+# ----------------------------------------------------------------------
+
+def iter_packages(database, filename):
+    if database == 'dpkg':
+        return iter_dpkg(filename)
+    if filename == RPMDB_SQLITE:
+        return iter_rpm_sqlite(filename)
+    if filename == RPMDB_BDB:
+        return iter_rpm_bdb(filename)
+    raise IOError('no dpkg or rpm database found')
+
+# ----------------------------------------------------------------------
+
+def collect_packages():
+    database, filename = find_package_database()
+    records = []
+    for package in iter_packages(database, filename):
+        records.append([package['name'], package['epoch'], package['version'],
+                        package['release'], package['arch']])
+    return {'packages_database': database, 'packages': records}
+
+# ----------------------------------------------------------------------
+
+def package_id(database, name, arch):
+    # Same keys as the apt and yum listings: yum lists name.arch.
+    if database == 'rpm' and arch is not None:
+        return '{}.{}'.format(name, arch)
+    return name
+
+# ----------------------------------------------------------------------
+
+def packages_to_inventory(packages, inventory, packages_output='version'):
+    database = packages['packages_database']
+    inventory['packages_version'] = {}
+    if packages_output == 'full':
+        inventory['packages'] = {}
+    for name, epoch, version, release, arch in packages['packages']:
+        if database == 'rpm' and arch is None:
+            continue
+        id = package_id(database, name, arch)
+        inventory['packages_version'][id] = version.split('-')[0]
+        if packages_output == 'full':
+            inventory['packages'][id] = {'epoch': epoch, 'version': version,
+                                         'release': release, 'arch': arch}
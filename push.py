@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - push
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Pushes results to a collection endpoint. Every result is first written to a
+# spool directory as one gzip compressed JSON line, then the spool is sent
+# oldest first, in batches, over one keep-alive connection. A batch is the
+# spool files joined together: gzip members can be concatenated, so the body
+# is a gzip stream of one JSON document per line (NDJSON).
+#
+# A result stays in the spool until the endpoint has accepted it. Failures
+# back off exponentially with jitter, and the failure count and the time of
+# the next attempt are kept in the spool, so a restart or the next cron run
+# picks up where the last one stopped. The first push is delayed by a random
+# part of the jitter window, so a fleet started by the same cron minute does
+# not hit the endpoint at once.
+
+import os
+import io
+import json
+import gzip
+import time
+import fcntl
+import random
+import http.client
+import urllib.parse
+
+import output
+
+DEFAULT_SPOOL_DIR = '/var/spool/inventory2'
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_JITTER = 60
+DEFAULT_TIMEOUT = 30
+# Results kept at most, the oldest are dropped beyond that.
+DEFAULT_SPOOL_MAX = 200
+
+BACKOFF_BASE = 60
+BACKOFF_MAX = 6 * 60 * 60
+
+SPOOL_SUFFIX = '.json.gz'
+STATE_FILE = 'state.json'
+LOCK_FILE = 'spool.lock'
+
+# Statuses that say the results themselves are bad, sending them again would
+# not help. Everything else, an expired token or an endpoint being deployed
+# included, is tried again later. A batch that is too large is split.
+REJECT_STATUSES = [400, 422]
+TOO_LARGE_STATUS = 413
+
+# ----------------------------------------------------------------------
+
+def spool_files(spool_dir):
+    return sorted(name for name in os.listdir(spool_dir) if name.endswith(SPOOL_SUFFIX))
+
+# ----------------------------------------------------------------------
+
+def spool_inventory(spool_dir, inventory, spool_max=DEFAULT_SPOOL_MAX):
+    # Returns the name of the spooled file.
+    if not os.path.isdir(spool_dir):
+        os.makedirs(spool_dir, 0o700)
+    name = '{:020d}.{}{}'.format(time.time_ns(), os.getpid(), SPOOL_SUFFIX)
+    path = os.path.join(spool_dir, name)
+    with open(path + '.part', 'wb') as raw:
+        compressed = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6)
+        f = io.BufferedWriter(compressed, buffer_size=2 ** 16)
+        output.write_json(f, inventory, None)
+        f.write(b'\n')
+        f.flush()
+        f.detach()
+        compressed.close()
+    os.rename(path + '.part', path)
+    for old in spool_files(spool_dir)[:-spool_max]:
+        os.remove(os.path.join(spool_dir, old))
+    return name
+
+# ----------------------------------------------------------------------
+
+def read_state(spool_dir):
+    try:
+        with open(os.path.join(spool_dir, STATE_FILE), encoding='UTF-8') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {'failures': 0, 'next_attempt': 0}
+
+# ----------------------------------------------------------------------
+
+def write_state(spool_dir, state):
+    filename = os.path.join(spool_dir, STATE_FILE)
+    with open(filename + '.part', 'w', encoding='UTF-8') as f:
+        json.dump(state, f)
+    os.rename(filename + '.part', filename)
+
+# ----------------------------------------------------------------------
+
+def backoff(failures, retry_after=None):
+    # Full jitter: anywhere between zero and the exponential limit.
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1)))
+
+# ----------------------------------------------------------------------
+
+def parse_retry_after(value):
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+# ----------------------------------------------------------------------
+
+class Endpoint(object):
+
+    # One connection to the collection endpoint, kept open between the
+    # batches. A connection the server has closed while idle is opened
+    # again once before the batch counts as failed.
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT, headers=None):
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ('http', 'https'):
+            raise ValueError('push URL must be http:// or https://, not {}'.format(url))
+        self.path = parsed.path or '/'
+        if parsed.query:
+            self.path += '?' + parsed.query
+        self.headers = dict(headers or {})
+        if parsed.scheme == 'https':
+            self.connection = http.client.HTTPSConnection(parsed.hostname, parsed.port, timeout=timeout)
+        else:
+            self.connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+
+    def post(self, body, count):
+        headers = dict(self.headers)
+        headers['Content-Type'] = 'application/x-ndjson'
+        headers['Content-Encoding'] = 'gzip'
+        headers['X-Inventory-Count'] = str(count)
+        for attempt in range(2):
+            try:
+                self.connection.request('POST', self.path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self.connection.close()
+                return response.status, response.getheader('Retry-After')
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.connection.close()
+                if attempt == 1:
+                    raise
+
+    def close(self):
+        self.connection.close()
+
+# ----------------------------------------------------------------------
+
+def flush_spool(url, spool_dir, batch_size=DEFAULT_BATCH_SIZE, timeout=DEFAULT_TIMEOUT, headers=None):
+    # Sends what is in the spool, returns the number of results sent. Only
+    # one process sends from a spool at a time, the others return at once.
+    if not os.path.isdir(spool_dir):
+        return 0
+    lock = open(os.path.join(spool_dir, LOCK_FILE), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return 0
+    sent = 0
+    endpoint = None
+    try:
+        state = read_state(spool_dir)
+        if time.time() < state['next_attempt']:
+            return 0
+        names = spool_files(spool_dir)
+        if len(names) == 0:
+            return 0
+        endpoint = Endpoint(url, timeout, headers)
+        error = None
+        rejected = 0
+        retry_after = None
+        batches = [names[start:start + batch_size] for start in range(0, len(names), batch_size)]
+        while len(batches) > 0:
+            batch = batches.pop(0)
+            body = b''
+            for name in batch:
+                with open(os.path.join(spool_dir, name), 'rb') as f:
+                    body += f.read()
+            try:
+                status, retry_after = endpoint.post(body, len(batch))
+            except (OSError, http.client.HTTPException) as e:
+                error = '{}: {}'.format(type(e).__name__, e)
+                break
+            if 200 <= status < 300:
+                sent += len(batch)
+            elif status == TOO_LARGE_STATUS and len(batch) > 1:
+                half = len(batch) // 2
+                batches[0:0] = [batch[:half], batch[half:]]
+                continue
+            elif status in REJECT_STATUSES or status == TOO_LARGE_STATUS:
+                # Sending a rejected batch again would not help, it is
+                # dropped. So is a single result too large to take.
+                rejected += len(batch)
+            else:
+                error = 'endpoint returned HTTP {}'.format(status)
+                retry_after = parse_retry_after(retry_after)
+                break
+            for name in batch:
+                os.remove(os.path.join(spool_dir, name))
+
+        if error is None:
+            state = {'failures': 0, 'next_attempt': 0}
+        else:
+            state['failures'] += 1
+            state['next_attempt'] = time.time() + backoff(state['failures'], retry_after)
+            state['error'] = error
+        write_state(spool_dir, state)
+        if error is not None:
+            raise IOError('push to {} failed, {} left in the spool: {}'.format(
+                url, len(names) - sent - rejected, error))
+        if rejected > 0:
+            raise IOError('push to {}: the endpoint rejected {} results'.format(url, rejected))
+        return sent
+    finally:
+        if endpoint is not None:
+            endpoint.close()
+        lock.close()
+
+# ----------------------------------------------------------------------
+
+def push_spool(url, spool_dir=DEFAULT_SPOOL_DIR, batch_size=DEFAULT_BATCH_SIZE,
+               jitter=DEFAULT_JITTER, timeout=DEFAULT_TIMEOUT, headers=None):
+    # Nothing is waited for while the spool backs off, it would not be sent
+    # anyway.
+    if jitter > 0 and time.time() >= read_state(spool_dir)['next_attempt']:
+        time.sleep(random.uniform(0, jitter))
+    return flush_spool(url, spool_dir, batch_size, timeout, headers)
+
+# ----------------------------------------------------------------------
+
+def push_inventory(url, inventory, spool_dir=DEFAULT_SPOOL_DIR, batch_size=DEFAULT_BATCH_SIZE,
+                   jitter=DEFAULT_JITTER, timeout=DEFAULT_TIMEOUT, headers=None):
+    spool_inventory(spool_dir, inventory)
+    return push_spool(url, spool_dir, batch_size, jitter, timeout, headers)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - records
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Compact records for the entities of an inventory, for services that keep
+# many result.json files in memory. A record stores its fields in __slots__
+# instead of a dict. The keys it was loaded with, in their order, are kept
+# as a layout tuple shared by all records of the same shape, so to_json()
+# gives back the same dict and the same JSON bytes. Keys a record class does
+# not know are kept in a small extra dict. All strings are interned, so the
+# package names, versions and models repeated across hosts are stored once.
+
+import gc
+import sys
+import json
+
+intern = sys.intern
+
+# Key tuples of all record shapes seen, so records of one shape share one.
+LAYOUTS = {}
+
+# ----------------------------------------------------------------------
+
+def intern_value(value):
+    if type(value) is str:
+        return intern(value)
+    if type(value) is list:
+        return [intern_value(item) for item in value]
+    if type(value) is dict:
+        return dict((intern(key), intern_value(item)) for key, item in value.items())
+    return value
+
+# ----------------------------------------------------------------------
+
+class Record(object):
+
+    __slots__ = ('_layout', '_extra')
+
+    FIELDS = ()
+
+    @classmethod
+    def from_json(cls, data):
+        record = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            # Most values are plain strings, they are interned inline.
+            if type(value) is str:
+                value = intern(value)
+            elif type(value) in (list, dict):
+                value = intern_value(value)
+            if key in cls.FIELDS:
+                setattr(record, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[intern(key)] = value
+        layout = tuple(data)
+        record._layout = LAYOUTS.setdefault(layout, layout)
+        record._extra = extra
+        return record
+
+    def to_json(self):
+        data = {}
+        for key in self._layout:
+            data[key] = self[key]
+        return data
+
+    def __getitem__(self, key):
+        if key not in self._layout:
+            raise KeyError(key)
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self._layout
+
+    def get(self, key, default=None):
+        return self[key] if key in self._layout else default
+
+    def keys(self):
+        return list(self._layout)
+
+    def items(self):
+        return [(key, self[key]) for key in self._layout]
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_json()
+        return self.to_json() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.to_json())
+
+# ----------------------------------------------------------------------
+
+class Disk(Record):
+    FIELDS = ('model', 'size_in_gb', 'size_raw', 'serial', 'wwn', 'fw_version', 'logicalname', 'smart')
+    __slots__ = FIELDS
+
+class MemoryModule(Record):
+    FIELDS = ('slot', 'vendor', 'model', 'type', 'frequency_in_mhz', 'serial', 'size_in_gb')
+    __slots__ = FIELDS
+
+class Psu(Record):
+    FIELDS = ('vendor', 'model', 'serial', 'units', 'capacity')
+    __slots__ = FIELDS
+
+class Vga(Record):
+    FIELDS = ('vga_vendor', 'vga_model')
+    __slots__ = FIELDS
+
+class Storage(Record):
+    FIELDS = ('vendor', 'model', 'description', 'serial', 'model_by_storcli')
+    __slots__ = FIELDS
+
+class Volume(Record):
+    FIELDS = ('name', 'fstype', 'mountpoint', 'size', 'type', 'size_in_gb', 'size_bytes', 'mountpoints',
+              'parents', 'holders')
+    __slots__ = FIELDS
+
+class Interface(Record):
+    FIELDS = ('mac', 'altnames', 'master', 'link', 'ips', 'routes_to', 'vendor', 'product')
+    __slots__ = FIELDS
+
+class Route(Record):
+    FIELDS = ('src', 'gw', 'dev')
+    __slots__ = FIELDS
+
+class ListenPort(Record):
+    FIELDS = ('listen_proto', 'listen_port', 'listen_ip', 'listen_pid_program', 'listen_cgroup',
+              'listen_container_name', 'listen_container_image', 'listen_container_id')
+    __slots__ = FIELDS
+
+class Container(Record):
+    FIELDS = ('name', 'id', 'image', 'runtime', 'ports')
+    __slots__ = FIELDS
+
+# Section -> (shape, record class). 'list' is a list of records, 'dict' a
+# dict of records, 'dict_list' a dict of lists of records.
+SECTIONS = {
+    'disks': ('list', Disk),
+    'memory_modules': ('list', MemoryModule),
+    'psu': ('list', Psu),
+    'vga': ('list', Vga),
+    'storages': ('list', Storage),
+    'volumes': ('list', Volume),
+    'docker_containers': ('list', Container),
+    'network_interfaces': ('dict', Interface),
+    'network_listen_ports': ('dict', ListenPort),
+    'network_routes_all': ('dict_list', Route),
+}
+
+# ----------------------------------------------------------------------
+
+def section_from_json(section, value):
+    if section not in SECTIONS:
+        return intern_value(value)
+    shape, cls = SECTIONS[section]
+    convert = lambda item: cls.from_json(item) if type(item) is dict else intern_value(item)
+    if shape == 'list' and type(value) is list:
+        return [convert(item) for item in value]
+    if shape == 'dict' and type(value) is dict:
+        return dict((intern(key), convert(item)) for key, item in value.items())
+    if shape == 'dict_list' and type(value) is dict:
+        return dict((intern(key), [convert(item) for item in items] if type(items) is list
+                     else intern_value(items)) for key, items in value.items())
+    # A summary instead of the full section (routes_output='summary').
+    return intern_value(value)
+
+# ----------------------------------------------------------------------
+
+def from_json(inventory):
+    return dict((intern(section), section_from_json(section, value)) for section, value in inventory.items())
+
+# ----------------------------------------------------------------------
+
+def json_default(value):
+    # For json.dump(default=...), records are written as their dicts.
+    if isinstance(value, Record):
+        return value.to_json()
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+# ----------------------------------------------------------------------
+
+def to_json(value):
+    # Plain dicts and lists again, for code that needs real dicts.
+    if isinstance(value, Record):
+        value = value.to_json()
+    if isinstance(value, dict):
+        return dict((key, to_json(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [to_json(item) for item in value]
+    return value
+
+# ----------------------------------------------------------------------
+
+def load_inventory(filename):
+    # Records hold no reference cycles, so the collector is paused while
+    # they are created instead of rescanning the growing heap.
+    with open(filename, encoding='UTF-8') as f:
+        data = json.load(f)
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return from_json(data)
+    finally:
+        if enabled:
+            gc.enable()
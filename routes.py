@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - routes
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Route store for hosts with full routing tables. Routes are appended to flat
+# arrays while they are read, and the path-compressed binary (Patricia) trie is
+# built from them in one sorted pass on first use. Every prefix points to an
+# interned set of next hops, so a million prefixes behind a few gateways cost
+# a few arrays of integers instead of a million dicts.
+#
+# A summary does not need the prefixes. With routes_output 'summary' they are
+# only counted as they are read, and with 'auto' they are dropped once there
+# are more than ROUTES_SUMMARY_THRESHOLD of them.
+
+import sys
+import socket
+from array import array
+
+ROUTES_SUMMARY_THRESHOLD = 10000
+
+ROUTE_TYPES = ['unicast', 'local', 'broadcast', 'multicast', 'throw',
+               'unreachable', 'prohibit', 'blackhole', 'nat', 'anycast']
+
+FAMILY_BITS = {socket.AF_INET: 32, socket.AF_INET6: 128}
+
+# ----------------------------------------------------------------------
+
+class WideKeys(object):
+    # 128 bit keys as two arrays of 64 bit halves.
+
+    def __init__(self):
+        self.high = array('Q')
+        self.low = array('Q')
+
+    def __len__(self):
+        return len(self.low)
+
+    def __getitem__(self, index):
+        return (self.high[index] << 64) | self.low[index]
+
+    def append(self, key):
+        self.high.append(key >> 64)
+        self.low.append(key & 0xffffffffffffffff)
+
+# ----------------------------------------------------------------------
+
+def new_key_array(bits):
+    return array('Q') if bits <= 64 else WideKeys()
+
+# ----------------------------------------------------------------------
+
+def is_sorted(keys, lengths):
+    previous = (-1, 0)
+    for i in range(len(lengths)):
+        current = (keys[i], lengths[i])
+        if current < previous:
+            return False
+        previous = current
+    return True
+
+# ----------------------------------------------------------------------
+
+class PrefixTrie(object):
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.keys = new_key_array(bits)
+        self.lengths = array('B')
+        self.left = array('i')
+        self.right = array('i')
+        self.values = array('i')
+        self.path = [0]
+        self.new_node(0, 0)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def new_node(self, key, length):
+        # Nodes are rows in parallel arrays, -1 marks a missing child or value.
+        self.keys.append(key)
+        self.lengths.append(length)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.values.append(-1)
+        return len(self.lengths) - 1
+
+    def set_child(self, node, child):
+        if (self.keys[child] >> (self.bits - 1 - self.lengths[node])) & 1:
+            self.right[node] = child
+        else:
+            self.left[node] = child
+
+    def insert(self, key, length):
+        # Returns the node holding the prefix, creating it when needed. The
+        # path to the previous insert is kept, so prefixes inserted in sorted
+        # order only walk the few nodes below their common ancestor.
+        bits, keys, lengths, path = self.bits, self.keys, self.lengths, self.path
+        while len(path) > 1:
+            top_length = lengths[path[-1]]
+            if top_length <= length and (keys[path[-1]] ^ key) >> (bits - top_length) == 0:
+                break
+            path.pop()
+        node = path[-1]
+        while True:
+            if lengths[node] == length:
+                return node
+            children = self.right if (key >> (bits - 1 - lengths[node])) & 1 else self.left
+            child = children[node]
+            if child == -1:
+                leaf = self.new_node(key, length)
+                children[node] = leaf
+                path.append(leaf)
+                return leaf
+            diff = keys[child] ^ key
+            common = min(lengths[child], length, bits - diff.bit_length())
+            if common == lengths[child]:
+                node = child
+                path.append(node)
+                continue
+            if common == length:
+                leaf = self.new_node(key, length)
+                self.set_child(leaf, child)
+                children[node] = leaf
+                path.append(leaf)
+                return leaf
+            fork = self.new_node(key & (((1 << common) - 1) << (bits - common)), common)
+            leaf = self.new_node(key, length)
+            self.set_child(fork, child)
+            self.set_child(fork, leaf)
+            children[node] = fork
+            path.append(fork)
+            path.append(leaf)
+            return leaf
+
+    def find(self, key, length):
+        bits, keys, lengths = self.bits, self.keys, self.lengths
+        node = 0
+        while lengths[node] < length:
+            children = self.right if (key >> (bits - 1 - lengths[node])) & 1 else self.left
+            node = children[node]
+            if node == -1 or (keys[node] ^ key) >> (bits - lengths[node]) != 0:
+                return -1
+        if lengths[node] == length and keys[node] == key:
+            return node
+        return -1
+
+    def longest_match(self, key):
+        bits, keys, lengths, values = self.bits, self.keys, self.lengths, self.values
+        node = 0
+        best = 0 if values[0] != -1 else -1
+        while lengths[node] < bits:
+            children = self.right if (key >> (bits - 1 - lengths[node])) & 1 else self.left
+            child = children[node]
+            if child == -1 or (keys[child] ^ key) >> (bits - lengths[child]) != 0:
+                break
+            node = child
+            if values[node] != -1:
+                best = node
+        return best
+
+# ----------------------------------------------------------------------
+
+class RouteTable(object):
+
+    def __init__(self, routes_output='full'):
+        self.routes_output = routes_output
+        self.entries = {}
+        self.clear_entries()
+        self.compacted = True
+        self.tries = None
+        self.nexthop_sets = []
+        self.nexthop_index = {}
+        self.routes_by_dev = {}
+        self.routes_by_length = {}
+        self.added = 0
+        # Once only counted, the last destination read and the next hops of
+        # the default route are all that is kept.
+        self.summary_only = routes_output == 'summary'
+        self.last_destination = None
+        self.default_nexthops = None
+
+    def clear_entries(self):
+        for family, bits in FAMILY_BITS.items():
+            self.entries[family] = (new_key_array(bits), array('B'), array('i'))
+
+    def __len__(self):
+        self.compact()
+        return sum(self.routes_by_length.values())
+
+    def intern(self, nexthops):
+        index = self.nexthop_index.get(nexthops)
+        if index is None:
+            index = len(self.nexthop_sets)
+            self.nexthop_sets.append(nexthops)
+            self.nexthop_index[nexthops] = index
+        return index
+
+    def add(self, destination, route=None):
+        if route is not None and 'dev' in route:
+            self.routes_by_dev[route['dev']] = self.routes_by_dev.get(route['dev'], 0) + 1
+        if self.summary_only:
+            self.count(destination, route)
+            return
+        nexthops = () if route is None else (tuple(route.items()),)
+        self.last_destination = destination
+        family, key, length = parse_destination(destination)
+        keys, lengths, values = self.entries[family]
+        if len(keys) > 0 and keys[-1] == key and lengths[-1] == length:
+            values[-1] = self.intern(self.nexthop_sets[values[-1]] + nexthops)
+        else:
+            keys.append(key)
+            lengths.append(length)
+            values.append(self.intern(nexthops))
+            self.compacted = False
+            self.added += 1
+            if self.routes_output == 'auto' and self.added > ROUTES_SUMMARY_THRESHOLD:
+                self.drop_prefixes()
+        self.tries = None
+
+    def count(self, destination, route=None):
+        # The routes of one prefix are dumped one after the other, only the
+        # default route is looked for again.
+        if destination == 'default':
+            nexthops = () if route is None else (tuple(route.items()),)
+            if self.default_nexthops is not None:
+                self.default_nexthops += nexthops
+                return
+            self.default_nexthops = nexthops
+        elif destination == self.last_destination:
+            return
+        self.last_destination = destination
+        if destination == 'default':
+            length = 0
+        else:
+            address, _, length = destination.partition('/')
+            length = int(length) if length else FAMILY_BITS[socket.AF_INET6 if ':' in address else socket.AF_INET]
+        self.routes_by_length[length] = self.routes_by_length.get(length, 0) + 1
+
+    def drop_prefixes(self):
+        # From here on prefixes are only counted.
+        self.compact()
+        keys, lengths, values = self.entries[socket.AF_INET]
+        if len(keys) > 0 and lengths[0] == 0:
+            self.default_nexthops = self.nexthop_sets[values[0]]
+        self.clear_entries()
+        self.tries = None
+        self.summary_only = True
+
+    def compact(self):
+        # Sorts the entries by prefix and merges repeated prefixes. Routes
+        # dumped by the kernel are already sorted, then this is a linear pass
+        # into new arrays, only other input is sorted first.
+        if self.compacted:
+            return
+        self.routes_by_length = {}
+        for family, (keys, lengths, values) in list(self.entries.items()):
+            order = range(len(lengths))
+            if not is_sorted(keys, lengths):
+                order = sorted(order, key=[(keys[i] << 8) | lengths[i] for i in order].__getitem__)
+            new_keys, new_lengths, new_values = new_key_array(FAMILY_BITS[family]), array('B'), array('i')
+            for i in order:
+                if len(new_keys) > 0 and new_keys[-1] == keys[i] and new_lengths[-1] == lengths[i]:
+                    new_values[-1] = self.intern(self.nexthop_sets[new_values[-1]] + self.nexthop_sets[values[i]])
+                    continue
+                new_keys.append(keys[i])
+                new_lengths.append(lengths[i])
+                new_values.append(values[i])
+                self.routes_by_length[lengths[i]] = self.routes_by_length.get(lengths[i], 0) + 1
+            self.entries[family] = (new_keys, new_lengths, new_values)
+        self.compacted = True
+
+    def build(self):
+        # The trie is only needed for lookups, listing and summaries work
+        # on the sorted entries.
+        if self.tries is not None:
+            return
+        self.compact()
+        self.tries = {}
+        for family, (keys, lengths, values) in self.entries.items():
+            trie = PrefixTrie(FAMILY_BITS[family])
+            for i in range(len(keys)):
+                trie.values[trie.insert(keys[i], lengths[i])] = values[i]
+            self.tries[family] = trie
+
+    def get(self, destination):
+        self.build()
+        family, key, length = parse_destination(destination)
+        trie = self.tries[family]
+        node = trie.find(key, length)
+        if node == -1 or trie.values[node] == -1:
+            return None
+        return [dict(nexthop) for nexthop in self.nexthop_sets[trie.values[node]]]
+
+    def default(self):
+        if self.summary_only:
+            if self.default_nexthops is None:
+                return None
+            return [dict(nexthop) for nexthop in self.default_nexthops]
+        self.compact()
+        keys, lengths, values = self.entries[socket.AF_INET]
+        if len(keys) == 0 or lengths[0] != 0:
+            return None
+        return [dict(nexthop) for nexthop in self.nexthop_sets[values[0]]]
+
+    def lookup(self, address):
+        self.build()
+        family = socket.AF_INET6 if ':' in address else socket.AF_INET
+        trie = self.tries[family]
+        node = trie.longest_match(int.from_bytes(socket.inet_pton(family, address), 'big'))
+        if node == -1:
+            return None
+        destination = format_destination(family, trie.keys[node], trie.lengths[node])
+        return destination, [dict(nexthop) for nexthop in self.nexthop_sets[trie.values[node]]]
+
+    def items(self):
+        self.compact()
+        for family in [socket.AF_INET, socket.AF_INET6]:
+            keys, lengths, values = self.entries[family]
+            for i in range(len(keys)):
+                destination = format_destination(family, keys[i], lengths[i])
+                yield destination, [dict(nexthop) for nexthop in self.nexthop_sets[values[i]]]
+
+    def summary(self):
+        return {
+            'routes_count': len(self),
+            'routes_by_dev': dict(sorted(self.routes_by_dev.items())),
+            'routes_by_prefixlen': dict((str(length), count) for length, count in sorted(self.routes_by_length.items())),
+        }
+
+# ----------------------------------------------------------------------
+
+def parse_destination(destination):
+    if destination == 'default':
+        return socket.AF_INET, 0, 0
+    address, _, length = destination.partition('/')
+    family = socket.AF_INET6 if ':' in address else socket.AF_INET
+    bits = FAMILY_BITS[family]
+    length = int(length) if length else bits
+    key = int.from_bytes(socket.inet_pton(family, address), 'big')
+    if length < bits:
+        key &= ((1 << length) - 1) << (bits - length)
+    return family, key, length
+
+# ----------------------------------------------------------------------
+
+def format_destination(family, key, length):
+    bits = FAMILY_BITS[family]
+    if length == 0 and family == socket.AF_INET:
+        return 'default'
+    address = socket.inet_ntop(family, key.to_bytes(bits // 8, 'big'))
+    if length == bits:
+        return address
+    return '{}/{}'.format(address, length)
+
+# ----------------------------------------------------------------------
+
+def summarize(routes_output, table):
+    if table.summary_only:
+        return True
+    if routes_output == 'auto':
+        return len(table) > ROUTES_SUMMARY_THRESHOLD
+    return routes_output == 'summary'
+
+# ----------------------------------------------------------------------
+
+def routes_to_inventory(table, inventory, routes_output='full'):
+    interfaces = inventory['network_interfaces']
+    inventory['network_routes_all'] = {}
+
+    if summarize(routes_output, table):
+        default = table.default()
+        if default is not None:
+            inventory['network_routes_all']['default'] = default
+        inventory['network_routes_summary'] = table.summary()
+        for dev, count in table.routes_by_dev.items():
+            if dev in interfaces:
+                interfaces[dev]['routes_count'] = count
+        return
+
+    for destination, nexthops in table.items():
+        inventory['network_routes_all'][destination] = nexthops
+        for t_route in nexthops:
+            if 'dev' in t_route and t_route['dev'] in interfaces:
+                interfaces[t_route['dev']].setdefault('routes_to', []).append(destination)
+
+# ----------------------------------------------------------------------
+
+def main():
+    import network
+    table = network.collect_route_table()
+    for address in sys.argv[1:]:
+        print('{} {}'.format(address, table.lookup(address)))
+
+if __name__ == '__main__':
+    main()
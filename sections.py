@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - sections
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Sections of the inventory that can be selected on their own, with the
+# inventory keys they fill, the collectors they read and the sections they
+# depend on. A selection is closed over 'requires' before anything runs, and
+# only the collectors and parsers of the closed selection run. The output
+# only has the keys of the sections that were asked for. 'optional' are the
+# collectors that only complete a section, it is still written without them.
+
+# Always collected, whatever is selected.
+BASE_KEYS = ['date_of_inventory', 'script_version']
+BASE_COLLECTORS = ['date_of_inventory']
+
+SECTIONS = {
+    'os': {
+        'keys': ['os_hostname', 'os_version', 'os_core', 'os_users', 'os_users_truncated', 'os_users_sudo',
+                 'os_users_wheel', 'os_users_ssh', 'os_ssh_port', 'os_ssh_ports', 'os_ssl_version',
+                 'os_ssh_version'],
+        'collectors': ['os', 'os_hostname', 'os_version', 'os_core', 'os_users', 'os_users_sudo', 'os_users_wheel',
+                       'os_ssh_port', 'os_users_ssh', 'os_ssl_version', 'os_ssh_version'],
+        'requires': [],
+    },
+    'packages': {
+        'keys': ['packages_version', 'packages'],
+        'collectors': ['packages', 'packages_apt', 'packages_yum'],
+        'requires': [],
+    },
+    'listen_ports': {
+        'keys': ['network_listen_ports', 'network_listen_ports_list'],
+        'collectors': ['listen_ports', 'netstat'],
+        'requires': [],
+    },
+    # Published ports are attributed to containers on the listen ports.
+    'containers': {
+        'keys': ['docker_containers'],
+        'collectors': ['containers', 'docker'],
+        'requires': ['listen_ports'],
+    },
+    # Vendor and product of interfaces come from the hardware section, and
+    # are only filled when it is selected as well.
+    'network': {
+        'keys': ['network_interfaces', 'network_all_ip_addresses', 'network_routes_all', 'network_routes_summary'],
+        'collectors': ['network', 'ip_link', 'ip_addr', 'ip_route'],
+        'requires': [],
+    },
+    # Other network namespaces, only collected with --netns-workers.
+    'netns': {
+        'keys': ['network_namespaces'],
+        'collectors': ['netns'],
+        'requires': [],
+    },
+    # The RAID controllers complete the storages found by lshw.
+    'hardware': {
+        'keys': ['is_vm', 'system_vendor', 'system_platform', 'system_platform_version', 'system_serial',
+                 'cpu_model', 'cpu_count', 'cpu_count_of_all_cores', 'mb_vendor', 'mb_model', 'mb_version',
+                 'mb_serial', 'mb_bios_vendor', 'mb_bios_version', 'mb_bios_date', 'memory_size_in_gb',
+                 'memory_modules_count', 'memory_modules', 'vga', 'storages', 'psu_count', 'psu'],
+        'collectors': ['hardware', 'lshw', 'megacli_controllers', 'storcli_controllers'],
+        'optional': ['megacli_controllers', 'storcli_controllers'],
+        'requires': [],
+    },
+    # Disks are listed by lshw and completed from the RAID tools and SMART.
+    'disks': {
+        'keys': ['disks'],
+        'collectors': ['megacli_disks', 'storcli_disks', 'smart'],
+        'optional': ['megacli_disks', 'storcli_disks', 'smart'],
+        'requires': ['hardware'],
+    },
+    'volumes': {
+        'keys': ['volumes'],
+        'collectors': ['volumes', 'lsblk'],
+        'requires': [],
+    },
+}
+
+# ----------------------------------------------------------------------
+
+def resolve(only=None, skip=None):
+    # Returns (selected, needed): the sections asked for and those plus
+    # everything they require.
+    unknown = sorted(set(only or []).union(skip or []).difference(SECTIONS))
+    if len(unknown) > 0:
+        raise ValueError('unknown section {}, known are {}'.format(', '.join(unknown), ', '.join(sorted(SECTIONS))))
+    selected = set(only) if only else set(SECTIONS)
+    selected.difference_update(skip or [])
+    needed = set()
+    pending = list(selected)
+    while len(pending) > 0:
+        section = pending.pop()
+        if section not in needed:
+            needed.add(section)
+            pending.extend(SECTIONS[section]['requires'])
+    return selected, needed
+
+# ----------------------------------------------------------------------
+
+def section_collectors(needed):
+    names = set(BASE_COLLECTORS)
+    for section in needed:
+        names.update(SECTIONS[section]['collectors'])
+    return names
+
+# ----------------------------------------------------------------------
+
+def section_keys(selected):
+    keys = set(BASE_KEYS)
+    for section in selected:
+        keys.update(SECTIONS[section]['keys'])
+    return keys
+
+# ----------------------------------------------------------------------
+
+def missing_sections(names, needed):
+    # Returns (dropped, partial) for the collectors named that have no
+    # output. A section is dropped when one of the collectors it is read
+    # from is missing, and partial when only a collector that completes it
+    # is, or a section it requires was dropped.
+    dropped = set()
+    partial = set()
+    for section in needed:
+        entry = SECTIONS[section]
+        missing = set(names).intersection(entry['collectors'])
+        if len(missing.difference(entry.get('optional', []))) > 0:
+            dropped.add(section)
+        elif len(missing) > 0:
+            partial.add(section)
+    for section in needed.difference(dropped):
+        if dropped.intersection(SECTIONS[section]['requires']):
+            partial.add(section)
+    return dropped, partial
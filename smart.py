@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - smart
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Disk health from `smartctl -j`. The devices come from `smartctl --scan`, which
+# also lists the physical drives behind a MegaRAID controller as megaraid,N.
+# Every device is read by its own smartctl process on a bounded pool of worker
+# threads, with a timeout per device and a deadline for the whole run. A
+# device that hangs only costs its worker. Drives in standby are not spun up.
+
+import os
+import json
+import time
+import queue
+import signal
+import threading
+import subprocess
+
+SMARTCTL = 'smartctl'
+
+DEFAULT_SMART_WORKERS = 8
+DEFAULT_SMART_TIMEOUT = 30
+
+# smartctl exit status bits 0 and 1: bad command line, device open failed.
+SMARTCTL_FATAL = 0x03
+# ATA attribute ID -> field.
+ATA_ATTRIBUTES = {
+    5: 'reallocated_sectors',
+    197: 'pending_sectors',
+    198: 'offline_uncorrectable',
+}
+# Normalized remaining life of SSDs, by vendor attribute.
+ATA_WEAR_ATTRIBUTES = [177, 231, 233, 202]
+
+# ----------------------------------------------------------------------
+
+def run_smartctl(arguments, timeout):
+    # Returns (exit status, parsed output), exit status is None on timeout.
+    proc = subprocess.Popen([SMARTCTL] + arguments, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+    try:
+        stdout = proc.communicate(timeout=timeout)[0]
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        # A process stuck in the kernel on a dead device can not be
+        # reaped, it is left behind instead of blocking the worker.
+        try:
+            proc.communicate(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        return None, None
+    try:
+        return proc.returncode, json.loads(stdout.decode('UTF-8', 'replace'))
+    except ValueError:
+        return proc.returncode, None
+
+# ----------------------------------------------------------------------
+
+def scan_devices(timeout=DEFAULT_SMART_TIMEOUT):
+    returncode, data = run_smartctl(['--scan', '-j'], timeout)
+    if data is None:
+        raise IOError('smartctl --scan failed')
+    return [(device['name'], device.get('type')) for device in data.get('devices', [])]
+
+# ----------------------------------------------------------------------
+
+def format_wwn(wwn):
+    if not isinstance(wwn, dict) or 'naa' not in wwn:
+        return None
+    return '{:X}'.format(wwn['naa'] << 60 | wwn.get('oui', 0) << 36 | wwn.get('id', 0))
+
+# ----------------------------------------------------------------------
+
+def ata_health(data, record):
+    for attribute in data.get('ata_smart_attributes', {}).get('table', []):
+        if attribute.get('id') in ATA_ATTRIBUTES:
+            record[ATA_ATTRIBUTES[attribute['id']]] = attribute.get('raw', {}).get('value')
+        elif attribute.get('id') in ATA_WEAR_ATTRIBUTES and 'percentage_used' not in record:
+            record['percentage_used'] = 100 - attribute.get('value', 100)
+
+# ----------------------------------------------------------------------
+
+def nvme_health(data, record):
+    log = data.get('nvme_smart_health_information_log', {})
+    record['percentage_used'] = log.get('percentage_used')
+    record['available_spare'] = log.get('available_spare')
+    record['media_errors'] = log.get('media_errors')
+    record['critical_warning'] = log.get('critical_warning')
+
+# ----------------------------------------------------------------------
+
+def scsi_health(data, record):
+    if 'scsi_grown_defect_list' in data:
+        record['reallocated_sectors'] = data['scsi_grown_defect_list']
+    if 'scsi_percentage_used_endurance_indicator' in data:
+        record['percentage_used'] = data['scsi_percentage_used_endurance_indicator']
+
+# ----------------------------------------------------------------------
+
+def smart_record(device, device_type, returncode, data):
+    record = {'device': device, 'type': device_type}
+    if returncode is None:
+        record['status'] = 'timeout'
+        return record
+    if data is None or returncode & SMARTCTL_FATAL:
+        messages = [m.get('string') for m in (data or {}).get('smartctl', {}).get('messages', [])]
+        if any('STANDBY' in (m or '').upper() for m in messages):
+            record['status'] = 'standby'
+        else:
+            record['status'] = 'error'
+            record['error'] = '; '.join(m for m in messages if m) or 'exit status {}'.format(returncode)
+        return record
+
+    record['status'] = 'ok'
+    record['model'] = data.get('model_name') or data.get('scsi_model_name')
+    record['serial'] = data.get('serial_number')
+    record['wwn'] = format_wwn(data.get('wwn'))
+    record['fw_version'] = data.get('firmware_version') or data.get('scsi_revision')
+    record['protocol'] = data.get('device', {}).get('protocol')
+    if 'smart_status' in data:
+        record['health'] = 'PASSED' if data['smart_status'].get('passed') else 'FAILED'
+    record['temperature'] = data.get('temperature', {}).get('current')
+    record['power_on_hours'] = data.get('power_on_time', {}).get('hours')
+    if record['protocol'] == 'NVMe':
+        nvme_health(data, record)
+    elif record['protocol'] == 'SCSI':
+        scsi_health(data, record)
+    else:
+        ata_health(data, record)
+    return record
+
+# ----------------------------------------------------------------------
+
+def collect_smart(devices=None, workers=DEFAULT_SMART_WORKERS, timeout=DEFAULT_SMART_TIMEOUT, deadline=None):
+    # deadline is the time the run has to finish by. Devices that are
+    # not done by then are reported with status timeout.
+    if devices is None:
+        devices = scan_devices(timeout)
+    if deadline is None:
+        deadline = time.time() + timeout * (len(devices) // max(workers, 1) + 1)
+    records = [None] * len(devices)
+    tasks = queue.Queue()
+    for index, device in enumerate(devices):
+        tasks.put((index, device))
+
+    def worker():
+        while time.time() < deadline:
+            try:
+                index, (device, device_type) = tasks.get_nowait()
+            except queue.Empty:
+                return
+            arguments = ['-j', '-a', '-n', 'standby']
+            if device_type:
+                arguments += ['-d', device_type]
+            arguments.append(device)
+            returncode, data = run_smartctl(arguments, min(timeout, max(deadline - time.time(), 1)))
+            records[index] = smart_record(device, device_type, returncode, data)
+
+    threads = []
+    for i in range(min(workers, len(devices))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join(max(deadline - time.time(), 0))
+
+    for index, (device, device_type) in enumerate(devices):
+        if records[index] is None:
+            records[index] = smart_record(device, device_type, None, None)
+    return {'devices': list(records)}
+
+# ----------------------------------------------------------------------
+
+def disk_ids(disk):
+    ids = []
+    for key in ('serial', 'wwn'):
+        if disk.get(key):
+            id = str(disk[key]).strip().upper()
+            if key == 'wwn' and id.startswith('0X'):
+                id = id[2:]
+            ids.append(id)
+    return ids
+
+# ----------------------------------------------------------------------
+
+def smart_to_inventory(smart, inventory):
+    # Health is added to the disk with the same serial or WWN. Drives only
+    # smartctl can see (behind a controller) are added as new disks, and
+    # a drive seen twice (JBOD and megaraid,N) is only counted once.
+    by_id = {}
+    for disk in inventory['disks']:
+        for id in disk_ids(disk):
+            by_id.setdefault(id, disk)
+
+    merged = set()
+    for record in smart['devices']:
+        if record['status'] != 'ok':
+            continue
+        ids = disk_ids(record)
+        if len(ids) == 0 or any(id in merged for id in ids):
+            continue
+        merged.update(ids)
+
+        temp_health = {}
+        for key in ('health', 'temperature', 'power_on_hours', 'percentage_used', 'available_spare',
+                    'reallocated_sectors', 'pending_sectors', 'offline_uncorrectable', 'media_errors',
+                    'critical_warning'):
+            if record.get(key) is not None:
+                temp_health[key] = record[key]
+        temp_health['device'] = record['device'] if not record['type'] else '{} -d {}'.format(
+            record['device'], record['type'])
+
+        disk = next((by_id[id] for id in ids if id in by_id), None)
+        if disk is None:
+            disk = {}
+            disk['model'] = record['model']
+            disk['serial'] = record['serial']
+            disk['wwn'] = record['wwn']
+            disk['fw_version'] = record['fw_version']
+            inventory['disks'].append(disk)
+        elif not disk.get('wwn') and record['wwn']:
+            disk['wwn'] = record['wwn']
+        disk['smart'] = temp_health
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - containers tests
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# The containers collector against a fake Docker Engine API on a unix socket,
+# which answers GET /containers/json with the containers a test gives it.
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import socketserver
+import http.server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import containers
+
+CONTAINER_ID = 'c6024de45d059ceb6ab379d8f81c0940b525d8ce7a156353ffb4385d1c686f8e'
+
+CONTAINERS = [
+    {
+        'Id': CONTAINER_ID,
+        'Names': ['/app-0'],
+        'Image': 'registry.example.com/app-0:1.0',
+        'Ports': [
+            {'PrivatePort': 443, 'Type': 'tcp'},
+            {'IP': '::', 'PrivatePort': 80, 'PublicPort': 8080, 'Type': 'tcp'},
+            {'IP': '0.0.0.0', 'PrivatePort': 80, 'PublicPort': 8080, 'Type': 'tcp'},
+        ],
+    },
+    {
+        'Id': 'f' * 64,
+        'Names': ['/worker'],
+        'Image': 'registry.example.com/worker:2.1',
+        'Ports': [],
+    },
+]
+
+# ----------------------------------------------------------------------
+
+class FakeEngineHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if self.path == '/containers/json' and server.status == 200:
+            status, body = 200, json.dumps(server.containers).encode('UTF-8')
+        else:
+            status, body = server.status if server.status != 200 else 404, b'{"message":"page not found"}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        return 'unix'
+
+    def log_message(self, format, *args):
+        pass
+
+# ----------------------------------------------------------------------
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, path, containers):
+        socketserver.UnixStreamServer.__init__(self, path, FakeEngineHandler)
+        self.containers = containers
+        self.status = 200
+        self.requests = []
+
+    def get_request(self):
+        # Unix socket clients have no address, the handler expects one.
+        request, client_address = socketserver.UnixStreamServer.get_request(self)
+        return request, ('unix', 0)
+
+# ----------------------------------------------------------------------
+
+class ContainersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='inventory-containers-test-')
+        self.path = os.path.join(self.directory, 'docker.sock')
+        self.engine = FakeEngine(self.path, CONTAINERS)
+        self.thread = threading.Thread(target=self.engine.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.engine.shutdown()
+        self.engine.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_collect_containers(self):
+        data = containers.collect_containers([('docker', self.path)])
+        self.assertEqual(self.engine.requests, ['/containers/json'])
+        self.assertEqual([container['name'] for container in data['containers']], ['app-0', 'worker'])
+        app = data['containers'][0]
+        self.assertEqual(app['runtime'], 'docker')
+        self.assertEqual(app['id'], CONTAINER_ID)
+        self.assertEqual(app['image'], 'registry.example.com/app-0:1.0')
+        self.assertEqual([containers.format_port(port) for port in app['ports']],
+                         ['0.0.0.0:8080->80/tcp', ':::8080->80/tcp', '443/tcp'])
+
+    def test_containers_to_inventory(self):
+        inventory = {'docker_containers': [], 'network_listen_ports': {
+            'port tcp/8080 on 0.0.0.0': {'listen_proto': 'tcp', 'listen_port': '8080', 'listen_ip': '0.0.0.0'},
+            'port tcp6/8080 on ::': {'listen_proto': 'tcp6', 'listen_port': '8080', 'listen_ip': '::'},
+            'port tcp/9000 on 127.0.0.1': {'listen_proto': 'tcp', 'listen_port': '9000', 'listen_ip': '127.0.0.1',
+                                           'listen_container_id': 'f' * 64},
+            'port tcp/22 on 0.0.0.0': {'listen_proto': 'tcp', 'listen_port': '22', 'listen_ip': '0.0.0.0'},
+        }}
+        containers.containers_to_inventory(containers.collect_containers([('docker', self.path)]), inventory)
+        self.assertEqual([container['name'] for container in inventory['docker_containers']], ['app-0', 'worker'])
+        ports = inventory['network_listen_ports']
+        # Published ports are joined by address and port, the others by
+        # the container ID found in the cgroup of their process.
+        self.assertEqual(ports['port tcp/8080 on 0.0.0.0']['listen_container_name'], 'app-0')
+        self.assertEqual(ports['port tcp6/8080 on ::']['listen_container_id'], CONTAINER_ID)
+        self.assertEqual(ports['port tcp/9000 on 127.0.0.1']['listen_container_name'], 'worker')
+        self.assertNotIn('listen_container_name', ports['port tcp/22 on 0.0.0.0'])
+
+    def test_engine_error(self):
+        self.engine.status = 500
+        with self.assertRaises(IOError):
+            containers.collect_containers([('docker', self.path)])
+
+    def test_no_socket(self):
+        with self.assertRaises(IOError):
+            containers.collect_containers([])
+
+    def test_docker_host(self):
+        saved = os.environ.get('DOCKER_HOST')
+        os.environ['DOCKER_HOST'] = 'unix://' + self.path
+        try:
+            self.assertEqual(containers.find_container_sockets()[0], ('docker', self.path))
+        finally:
+            if saved is None:
+                os.environ.pop('DOCKER_HOST')
+            else:
+                os.environ['DOCKER_HOST'] = saved
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - fleet tests
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Ingest of result files holding one or more results of the same host, like
+# the spool files and batches of push.py.
+
+import os
+import sys
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fleet
+
+# ----------------------------------------------------------------------
+
+def result(hostname, os_version, openssl):
+    return {'os_hostname': hostname, 'os_version': os_version,
+            'packages_version': {'openssl': openssl}, '_meta': {'elapsed': 1.0}}
+
+# ----------------------------------------------------------------------
+
+class FleetTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='inventory-fleet-test-')
+        self.database = os.path.join(self.directory, 'fleet.db')
+        self.results = os.path.join(self.directory, 'results')
+        os.mkdir(self.results)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_batch(self, name, inventories):
+        # One gzip member per result, like a push batch.
+        with open(os.path.join(self.results, name), 'wb') as f:
+            for inventory in inventories:
+                f.write(gzip.compress((json.dumps(inventory) + '\n').encode('UTF-8')))
+
+    def ingest(self):
+        return fleet.ingest(self.database, [self.results], workers=1)
+
+    def host(self, hostname):
+        db = fleet.connect(self.database)
+        try:
+            os_version = db.execute('SELECT os_version FROM hosts WHERE hostname = ?', (hostname,)).fetchone()[0]
+            packages = fleet.hosts_by_package(db, 'openssl')
+        finally:
+            db.close()
+        return os_version, [row['version'] for row in packages if row['hostname'] == hostname]
+
+    def test_later_result_in_one_batch_is_kept(self):
+        self.write_batch('batch.json.gz', [result('h1', 'old', '1.1.1'), result('h1', 'new', '3.0.13')])
+        self.assertEqual(self.ingest(), (2, 0, 0))
+        self.assertEqual(self.host('h1'), ('new', ['3.0.13']))
+
+    def test_same_result_twice_is_unchanged(self):
+        self.write_batch('batch.json.gz', [result('h1', 'old', '1.1.1'), result('h1', 'old', '1.1.1')])
+        self.assertEqual(self.ingest(), (1, 1, 0))
+
+    def test_unchanged_file_is_not_decoded(self):
+        self.write_batch('batch.json.gz', [result('h1', 'old', '1.1.1'), result('h2', 'old', '1.1.1')])
+        self.assertEqual(self.ingest(), (2, 0, 0))
+        self.assertEqual(self.ingest(), (0, 1, 0))
+        self.write_batch('batch.json.gz', [result('h1', 'new', '3.0.13'), result('h2', 'old', '1.1.1')])
+        self.assertEqual(self.ingest(), (1, 1, 0))
+        self.assertEqual(self.host('h1'), ('new', ['3.0.13']))
+
+if __name__ == '__main__':
+    unittest.main()
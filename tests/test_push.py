@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - push tests
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# The spool against a stand-in collection endpoint on the loopback address,
+# which answers with the statuses a test gives it and keeps what it received.
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+import http.server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import push
+
+# ----------------------------------------------------------------------
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        documents = [json.loads(line) for line in gzip.decompress(body).decode('UTF-8').splitlines()]
+        server.connections.add(self.client_address)
+        status, headers = server.responses.pop(0) if server.responses else (200, {})
+        # A batch too large for the endpoint is one of more than
+        # server.max_batch results.
+        if server.max_batch is not None and len(documents) > server.max_batch:
+            status, headers = 413, {}
+        server.requests.append((status, documents))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+# ----------------------------------------------------------------------
+
+class PushTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.responses = []
+        self.server.requests = []
+        self.server.connections = set()
+        self.server.max_batch = None
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{}/inventory'.format(self.server.server_port)
+        self.spool_dir = tempfile.mkdtemp(prefix='inventory-push-test-')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.spool_dir)
+
+    def spool(self, count):
+        for i in range(count):
+            push.spool_inventory(self.spool_dir, {'os_hostname': 'host{}'.format(i)})
+
+    def sent_hostnames(self):
+        return [document['os_hostname'] for status, documents in self.server.requests
+                if 200 <= status < 300 for document in documents]
+
+    def test_accepted(self):
+        self.spool(5)
+        self.assertEqual(push.flush_spool(self.url, self.spool_dir, batch_size=2), 5)
+        self.assertEqual(self.sent_hostnames(), ['host0', 'host1', 'host2', 'host3', 'host4'])
+        self.assertEqual([len(documents) for status, documents in self.server.requests], [2, 2, 1])
+        # One keep-alive connection for all the batches.
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual(push.spool_files(self.spool_dir), [])
+        self.assertEqual(push.read_state(self.spool_dir)['failures'], 0)
+
+    def test_retryable_status_keeps_the_spool(self):
+        self.spool(2)
+        self.server.responses = [(503, {'Retry-After': '120'})]
+        start = time.time()
+        with self.assertRaises(IOError):
+            push.flush_spool(self.url, self.spool_dir)
+        self.assertEqual(len(push.spool_files(self.spool_dir)), 2)
+        state = push.read_state(self.spool_dir)
+        self.assertEqual(state['failures'], 1)
+        self.assertGreaterEqual(state['next_attempt'], start + 120)
+        # Backing off: nothing is sent before the next attempt.
+        self.assertEqual(push.flush_spool(self.url, self.spool_dir), 0)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_auth_and_not_found_keep_the_spool(self):
+        for status in [401, 403, 404]:
+            self.spool(2)
+            self.server.responses = [(status, {})]
+            with self.assertRaises(IOError):
+                push.flush_spool(self.url, self.spool_dir)
+            self.assertEqual(len(push.spool_files(self.spool_dir)), 2, status)
+            push.write_state(self.spool_dir, {'failures': 0, 'next_attempt': 0})
+            self.assertEqual(push.flush_spool(self.url, self.spool_dir), 2)
+
+    def test_rejected_batch_is_dropped(self):
+        self.spool(3)
+        self.server.responses = [(400, {})]
+        with self.assertRaises(IOError) as raised:
+            push.flush_spool(self.url, self.spool_dir, batch_size=2)
+        self.assertIn('rejected 2 results', str(raised.exception))
+        self.assertEqual(push.spool_files(self.spool_dir), [])
+        self.assertEqual(self.sent_hostnames(), ['host2'])
+        self.assertEqual(push.read_state(self.spool_dir)['failures'], 0)
+
+    def test_too_large_batch_is_split(self):
+        self.spool(5)
+        self.server.max_batch = 1
+        self.assertEqual(push.flush_spool(self.url, self.spool_dir, batch_size=4), 5)
+        self.assertEqual(sorted(self.sent_hostnames()), ['host0', 'host1', 'host2', 'host3', 'host4'])
+        self.assertEqual(push.spool_files(self.spool_dir), [])
+
+    def test_no_jitter_while_backing_off(self):
+        self.spool(1)
+        push.write_state(self.spool_dir, {'failures': 1, 'next_attempt': time.time() + 600})
+        start = time.time()
+        self.assertEqual(push.push_spool(self.url, self.spool_dir, jitter=60), 0)
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(len(self.server.requests), 0)
+
+    def test_push_inventory(self):
+        self.assertEqual(push.push_inventory(self.url, {'os_hostname': 'pushed'}, self.spool_dir, jitter=0), 1)
+        self.assertEqual(self.sent_hostnames(), ['pushed'])
+
+if __name__ == '__main__':
+    unittest.main()
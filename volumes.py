@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+#-------------------------------------------------------------------------------
+# Name:        Linux Inventory Tool - volumes
+#
+# Author:      Nikolay Sisyukin
+# URL:         https://nikolay.sisyukin.ru/
+#
+# Created:     18.10.2026
+# Copyright:   (c) Nikolay Sisyukin 2024
+# Licence:     MIT License
+#-------------------------------------------------------------------------------
+
+# Block devices and volumes without lsblk. /sys/block, the partitions and the
+# slaves/holders links are walked once and /proc/self/mountinfo is read once,
+# so the cost grows linearly with the number of devices, also on SAN hosts
+# with thousands of multipath and device-mapper devices. Sizes are exact
+# byte counts. Filesystem types come from the udev database, like in lsblk.
+
+import os
+import re
+
+from hardware import read_sysfs, list_dir
+
+SECTOR = 512
+
+SIZE_LETTERS = 'BKMGTPE'
+
+# Prefix of dm/uuid -> device type, as lsblk names them.
+DM_TYPES = [('LVM-', 'lvm'), ('CRYPT-', 'crypt'), ('mpath-', 'mpath'), ('part', 'part')]
+
+SKIP_PREFIXES = ('loop',)
+
+# ----------------------------------------------------------------------
+
+def natural_key(name):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+# ----------------------------------------------------------------------
+
+def unescape_mount(path):
+    # mountinfo escapes space, tab, newline and backslash as \ooo.
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), path)
+
+# ----------------------------------------------------------------------
+
+def read_mountinfo(root=''):
+    # Returns {'major:minor': [(mountpoint, fstype)]} and the same by source.
+    by_dev = {}
+    by_source = {}
+    try:
+        with open(root + '/proc/self/mountinfo', 'rb') as f:
+            lines = f.read().decode('UTF-8', 'replace').splitlines()
+    except (IOError, OSError):
+        return by_dev, by_source
+    for line in lines:
+        fields, _, tail = line.partition(' - ')
+        fields = fields.split()
+        tail = tail.split()
+        if len(fields) < 5 or len(tail) < 2:
+            continue
+        mount = (unescape_mount(fields[4]), tail[0])
+        by_dev.setdefault(fields[2], []).append(mount)
+        if tail[1].startswith('/dev/'):
+            by_source.setdefault(unescape_mount(tail[1]), []).append(mount)
+    return by_dev, by_source
+
+# ----------------------------------------------------------------------
+
+def udev_properties(root, dev):
+    properties = {}
+    try:
+        with open('{}/run/udev/data/b{}'.format(root, dev), 'rb') as f:
+            for line in f.read().decode('UTF-8', 'replace').splitlines():
+                if line.startswith('E:'):
+                    key, _, value = line[2:].partition('=')
+                    properties[key] = value
+    except (IOError, OSError):
+        pass
+    return properties
+
+# ----------------------------------------------------------------------
+
+def format_size(size):
+    # The SIZE column of lsblk: binary units, one rounded decimal.
+    if size < 1024:
+        return '{}B'.format(size)
+    exp = 10
+    while exp < 60 and size >= 1 << (exp + 10):
+        exp += 10
+    whole = size >> exp
+    frac = ((size & ((1 << exp) - 1)) * 1000 >> exp) + 50
+    frac //= 100
+    if frac == 10:
+        whole += 1
+        frac = 0
+    letter = SIZE_LETTERS[exp // 10]
+    if frac:
+        return '{}.{}{}'.format(whole, frac, letter)
+    return '{}{}'.format(whole, letter)
+
+# ----------------------------------------------------------------------
+
+def device_type(base, kname):
+    if os.path.exists(base + '/partition'):
+        return 'part'
+    if kname.startswith('dm-'):
+        uuid = read_sysfs(base + '/dm/uuid', '')
+        for prefix, name in DM_TYPES:
+            if uuid.startswith(prefix):
+                return name
+        return 'dm'
+    if kname.startswith('md'):
+        return read_sysfs(base + '/md/level', 'md')
+    if read_sysfs(base + '/device/type') == '5':
+        return 'rom'
+    return 'disk'
+
+# ----------------------------------------------------------------------
+
+def device_name(base, kname):
+    if kname.startswith('dm-'):
+        name = read_sysfs(base + '/dm/name')
+        if name is not None:
+            return '/dev/mapper/' + name
+    return '/dev/' + kname
+
+# ----------------------------------------------------------------------
+
+def read_device(root, base, kname):
+    dev = read_sysfs(base + '/dev')
+    device = {
+        'kname': kname,
+        'name': device_name(base, kname),
+        'type': device_type(base, kname),
+        'dev': dev,
+        'size_bytes': int(read_sysfs(base + '/size', '0')) * SECTOR,
+        'ro': read_sysfs(base + '/ro') == '1',
+        'fstype': None,
+        'uuid': None,
+        'label': None,
+        'parents': [name for name in list_dir(base + '/slaves')],
+        'holders': [name for name in list_dir(base + '/holders')],
+    }
+    if dev is not None:
+        properties = udev_properties(root, dev)
+        device['fstype'] = properties.get('ID_FS_TYPE') or None
+        device['uuid'] = properties.get('ID_FS_UUID') or None
+        device['label'] = properties.get('ID_FS_LABEL') or None
+    return device
+
+# ----------------------------------------------------------------------
+
+def collect_volumes(root=''):
+    by_dev, by_source = read_mountinfo(root)
+    devices = []
+    for kname in sorted(list_dir(root + '/sys/block'), key=natural_key):
+        if kname.startswith(SKIP_PREFIXES):
+            continue
+        base = '{}/sys/block/{}'.format(root, kname)
+        devices.append(read_device(root, base, kname))
+        # Partitions are the subdirectories with a partition file.
+        for name in sorted(list_dir(base), key=natural_key):
+            if name.startswith(kname) and os.path.exists('{}/{}/partition'.format(base, name)):
+                partition = read_device(root, '{}/{}'.format(base, name), name)
+                partition['parents'] = [kname]
+                devices.append(partition)
+
+    for device in devices:
+        mounts = by_dev.get(device['dev'], [])
+        if len(mounts) == 0:
+            # btrfs and other filesystems with anonymous device numbers.
+            mounts = by_source.get(device['name'], []) or by_source.get('/dev/' + device['kname'], [])
+        device['mountpoints'] = [mountpoint for mountpoint, fstype in mounts]
+        if device['fstype'] is None and len(mounts) > 0:
+            device['fstype'] = mounts[0][1]
+    return {'volumes': devices}
+
+# ----------------------------------------------------------------------
+
+def volumes_to_inventory(volumes, inventory):
+    names = dict((device['kname'], device['name']) for device in volumes['volumes'])
+    for device in volumes['volumes']:
+        temp_volume = {}
+        temp_volume['name'] = device['name']
+        temp_volume['fstype'] = device['fstype']
+        temp_volume['mountpoint'] = device['mountpoints'][0] if len(device['mountpoints']) > 0 else None
+        temp_volume['size'] = format_size(device['size_bytes'])
+        temp_volume['type'] = device['type']
+        temp_volume['size_in_gb'] = device['size_bytes'] // 2 ** 30
+        temp_volume['size_bytes'] = device['size_bytes']
+        if len(device['mountpoints']) > 1:
+            temp_volume['mountpoints'] = device['mountpoints']
+        if len(device['parents']) > 0:
+            temp_volume['parents'] = [names.get(name, '/dev/' + name) for name in device['parents']]
+        if len(device['holders']) > 0:
+            temp_volume['holders'] = [names.get(name, '/dev/' + name) for name in device['holders']]
+        inventory['volumes'].append(temp_volume)